@@ -1,86 +1,72 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import pickle
-import pandas as pd
 import numpy as np
+import logging
 import os
-import sys
+import warnings
+
+from features import (WIN_FEATURE_COLUMNS, build_win_features,
+                      build_win_feature_matrix, features_to_dict,
+                      score_features_from_win)
+from model_executor import model_executor
+from model_registry import registry
+from model_reload import ModelReloader
+from prediction_cache import PredictionCache
+from score_routes import (score_bp, score_cache, score_request_error,
+                          predict_score, score_response)
+from request_metrics import RequestMetrics
+from service_logging import get_logger
+
+# Models were fitted on DataFrames; we now pass plain float32 arrays
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
 
 app = Flask(__name__)
 CORS(app)
 
+# Request detail is logged at DEBUG (LOG_LEVEL); timings are on GET /metrics
+logger = get_logger('win_api')
+request_metrics = RequestMetrics('prediction_api').install(app)
+
 print("=" * 70)
-print("🔄 LOADING DUAL MODEL SYSTEM (XGBoost + Random Forest)")
+print("🔄 LOADING PREDICTION MODELS (Win + Score, XGBoost + Random Forest)")
 print("=" * 70)
 print(f"📂 Current Directory: {os.getcwd()}")
 print(f"📂 Script Location: {os.path.dirname(os.path.abspath(__file__))}")
 
-# Load XGBoost Model
-xgb_model = None
-xgb_paths_to_try = [
-    'models/model_xgb.pkl',            # ✅ First try - correct path
-    './models/model_xgb.pkl',
-    'ml_models/models/model_xgb.pkl',  # Fallback
-    './model_xgb.pkl',
-    '../models/model_xgb.pkl'
-]
-
-for model_path in xgb_paths_to_try:
-    if os.path.exists(model_path):
-        try:
-            with open(model_path, 'rb') as f:
-                xgb_model = pickle.load(f)
-            print(f"✅ XGBoost model loaded from: {model_path}")
-            print(f"   📊 Accuracy: 72.48%")
-            print(f"   📦 Training samples: 8720 IPL matches")
-            print(f"   ⚡ Speed: Faster")
-            print(f"   🔧 Model Type: {type(xgb_model).__name__}")
-            break
-        except Exception as e:
-            print(f"❌ Error loading XGBoost from {model_path}: {e}")
-
-if not xgb_model:
-    print("❌ XGBoost model NOT loaded!")
-    print("💡 Solution: Run 'python train_model.py' to train XGBoost")
-
-# Load Random Forest Model
-rf_model = None
-rf_paths_to_try = [
-    'models/model_rf.pkl',            # ✅ First try - correct path
-    './models/model_rf.pkl',
-    'ml_models/models/model_rf.pkl',  # Fallback
-    './model_rf.pkl',
-    '../models/model_rf.pkl'
-]
-
-for model_path in rf_paths_to_try:
-    if os.path.exists(model_path):
-        try:
-            with open(model_path, 'rb') as f:
-                rf_model = pickle.load(f)
-            print(f"✅ Random Forest model loaded from: {model_path}")
-            print(f"   📊 Accuracy: 72.48%")
-            print(f"   📦 Training samples: 8720 IPL matches")
-            print(f"   🌲 Speed: Moderate")
-            print(f"   🔧 Model Type: {type(rf_model).__name__}")
-            break
-        except Exception as e:
-            print(f"❌ Error loading Random Forest from {model_path}: {e}")
-
-if not rf_model:
-    print("❌ Random Forest model NOT loaded!")
-    print("💡 Solution: Run 'python train_random_forest.py' to train RF")
+# Win models + score models (score routes come from score_routes.py);
+# /health reports ready once both win models are loaded
+registry.load(required=['xgb', 'rf'])
+# First request shouldn't pay for lazy initialisation; /health reports ready after this
+registry.warm_up()
 
 print("=" * 70)
-print(f"✅ Models Loaded: XGBoost={'Yes' if xgb_model else 'No'}, Random Forest={'Yes' if rf_model else 'No'}")
+print(f"✅ Models Loaded: XGBoost={'Yes' if registry.loaded('xgb') else 'No'}, "
+      f"Random Forest={'Yes' if registry.loaded('rf') else 'No'}, "
+      f"Score models={'Yes' if registry.loaded('score_xgb') and registry.loaded('score_rf') else 'No'}")
+print(f"⏱️  Load {registry.startup['load_ms']:.0f} ms, warm-up {registry.startup['warmup_ms']:.0f} ms, "
+      f"first prediction {registry.startup['time_to_first_prediction_s']:.2f}s after process start")
 print("=" * 70)
 
+# One model set per request; POST /admin/reload and MODEL_WATCH_INTERVAL swap in new files
+reloader = ModelReloader(registry).install(app)
+
+# Shared by every viewer of the same ball (PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL)
+prediction_cache = PredictionCache.from_env()
+
 # Feature columns (same for both models)
-FEATURE_COLUMNS = [
-    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
-    'innings', 'target', 'runs_needed', 'wickets_remaining', 
-    'required_run_rate'
-]
+FEATURE_COLUMNS = WIN_FEATURE_COLUMNS
+
+# /predict-score-both from the same process and model registry
+app.register_blueprint(score_bp)
+
+def served_metadata(key):
+    """Measured accuracy, speed and training rows of the loaded model (benchmark_models.py)"""
+    result = registry.benchmark(key)
+    return {
+        'accuracy': f"{result['metric'] * 100:.2f}%" if result else None,
+        'speed': registry.speed(key),
+        'samples': result['training_samples'] if result else None
+    }
 
 @app.route('/')
 def home():
@@ -90,24 +76,26 @@ def home():
         'version': '3.0',
         'models': {
             'xgboost': {
-                'status': 'loaded' if xgb_model else 'not available',
-                'accuracy': '72.48%',
-                'speed': 'Faster',
-                'samples': 8720
+                'status': 'loaded' if registry.loaded('xgb') else 'not available',
+                **served_metadata('xgb')
             },
             'random_forest': {
-                'status': 'loaded' if rf_model else 'not available',
-                'accuracy': '72.48%',
-                'speed': 'Moderate',
-                'samples': 8720
+                'status': 'loaded' if registry.loaded('rf') else 'not available',
+                **served_metadata('rf')
             }
         },
         'endpoints': {
             'predict_both': '/predict-both [POST] - Get predictions from both models',
             'predict_xgboost': '/predict-xgboost [POST] - XGBoost only',
             'predict_rf': '/predict-rf [POST] - Random Forest only',
+            'predict_batch': '/predict-batch [POST] - Both models for many match states',
+            'predict_score_both': '/predict-score-both [POST] - Projected first-innings score',
+            'predict_all': '/predict-all [POST] - Win probability and projected score together',
             'model_info': '/model-info [GET] - Model details',
-            'health': '/health [GET] - Health check'
+            'health': '/health [GET] - Health check',
+            'metrics': '/metrics [GET] - Request timing histograms',
+            'admin_reload': '/admin/reload [POST] - Reload models (X-Admin-Token)',
+            'live_feed': 'Per-ball SSE prediction feed: separate service, python ml_models/serve.py live (:5003)'
         }
     })
 
@@ -115,103 +103,207 @@ def home():
 def health():
     """Health check endpoint"""
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if registry.ready else 'starting',
+        'ready': registry.ready,
+        'startup': registry.startup,
         'models': {
-            'xgboost': 'loaded' if xgb_model else 'not loaded',
-            'random_forest': 'loaded' if rf_model else 'not loaded'
+            'xgboost': 'loaded' if registry.loaded('xgb') else 'not loaded',
+            'random_forest': 'loaded' if registry.loaded('rf') else 'not loaded'
         },
-        'both_available': xgb_model is not None and rf_model is not None
-    })
+        'backends': {
+            'xgboost': registry.backend('xgb'),
+            'random_forest': registry.backend('rf')
+        },
+        'variants': {
+            'xgboost': registry.variant('xgb'),
+            'random_forest': registry.variant('rf')
+        },
+        'win_table': registry.win_table.stats() if registry.win_table else None,
+        'version': registry.version,
+        'cache': prediction_cache.stats(),
+        'executor': model_executor.stats(),
+        'score_models': {
+            'xgboost_score': 'loaded' if registry.loaded('score_xgb') else 'not loaded',
+            'rf_score': 'loaded' if registry.loaded('score_rf') else 'not loaded',
+            'cache': score_cache.stats()
+        },
+        'both_available': registry.loaded('xgb') and registry.loaded('rf')
+    }), 200 if registry.ready else 503
 
 @app.route('/model-info')
 def model_info():
     """Get detailed model information"""
-    return jsonify({
-        'success': True,
-        'xgboost': {
-            'name': 'XGBoost',
-            'accuracy': '72.48%',
-            'training_samples': 8720,
-            'dataset': 'IPL 2008-2020',
-            'features': FEATURE_COLUMNS,
-            'speed': 'Faster',
-            'available': xgb_model is not None
-        },
-        'random_forest': {
-            'name': 'Random Forest',
-            'accuracy': '72.48%',
-            'training_samples': 8720,
+    info = {'success': True, 'version': registry.version,
+            'loaded_at': registry.current.loaded_at, 'reload': reloader.status}
+    for name, key, model_name in [('xgboost', 'xgb', 'XGBoost'),
+                                  ('random_forest', 'rf', 'Random Forest')]:
+        metadata = served_metadata(key)
+        result = registry.benchmark(key) or {}
+        info[name] = {
+            'name': model_name,
+            'accuracy': metadata['accuracy'],
+            'training_samples': metadata['samples'],
             'dataset': 'IPL 2008-2020',
             'features': FEATURE_COLUMNS,
-            'speed': 'Moderate',
-            'available': rf_model is not None
+            'speed': metadata['speed'],
+            'latency_ms': result.get('latency_ms'),
+            'throughput': result.get('throughput'),
+            'available': registry.loaded(key)
         }
-    })
+    return jsonify(info)
 
 def calculate_features(data):
-    """Calculate all features from match data"""
-    current_score = data.get('current_score', 0)
-    wickets_lost = data.get('wickets_lost', 0)
-    overs_played = data.get('overs_played', 0)
-    innings = data.get('innings', 1)
-    target = data.get('target', 0)
-    runs_needed = data.get('runs_needed', 0)
+    """Calculate all features from match data as a float32 row"""
+    return build_win_features(data)
+
+def calculate_features_batch(matches):
+    """Calculate features for many match states in one vectorized pass"""
+    return build_win_feature_matrix(matches)
+
+def format_prediction(prediction, probabilities, model_name, metadata):
+    """Build the response dict for one prediction"""
+    win_prob = float(probabilities[1] * 100)
+    loss_prob = float(probabilities[0] * 100)
+    confidence = max(win_prob, loss_prob)
     
-    # Calculate derived features
-    run_rate = current_score / overs_played if overs_played > 0 else 0
-    wickets_remaining = 10 - wickets_lost
-    overs_left = 20 - overs_played
-    required_run_rate = runs_needed / overs_left if overs_left > 0 and innings == 2 else 0
+    # Determine confidence level
+    if confidence > 70:
+        confidence_level = 'high'
+    elif confidence > 55:
+        confidence_level = 'medium'
+    else:
+        confidence_level = 'low'
     
-    features = {
-        'current_score': current_score,
-        'wickets_lost': wickets_lost,
-        'overs_played': overs_played,
-        'run_rate': round(run_rate, 2),
-        'innings': innings,
-        'target': target,
-        'runs_needed': runs_needed,
-        'wickets_remaining': wickets_remaining,
-        'required_run_rate': round(required_run_rate, 2)
+    return {
+        'prediction': int(prediction),
+        'win_probability': round(win_prob, 2),
+        'loss_probability': round(loss_prob, 2),
+        'predicted_outcome': 'Win' if prediction == 1 else 'Loss',
+        'confidence': round(confidence, 2),
+        'confidence_level': confidence_level,
+        'model': model_name,
+        'accuracy': metadata['accuracy'],
+        'speed': metadata['speed']
+    }
+
+def model_unavailable(model_name, train_script):
+    """Neutral placeholder result when a model is not loaded"""
+    return {
+        'error': f'{model_name} model not available',
+        'message': f'Train model: python {train_script}',
+        'win_probability': 50.0,
+        'loss_probability': 50.0,
+        'confidence': 50.0,
+        'predicted_outcome': 'Unknown',
+        'model': model_name,
+        'accuracy': None,
+        'speed': None
     }
+
+def calculate_agreement(xgb_result, rf_result):
+    """Compare both models' win probabilities (None if either failed)"""
+    if 'error' in xgb_result or 'error' in rf_result:
+        return None, None
+    
+    diff = abs(xgb_result['win_probability'] - rf_result['win_probability'])
+    if diff < 5:
+        return 'strong', diff
+    elif diff < 10:
+        return 'moderate', diff
+    return 'disagree', diff
+
+def outcome_result(outcome, model, model_name, key):
+    """Response dict for one model's predict_proba outcome from model_executor"""
+    if outcome.error is not None:
+        logger.error("Prediction failed for %s: %s", model_name, outcome.error)
+        return {'error': str(outcome.error), 'timing_ms': round(outcome.timing_ms, 3)}
     
-    return pd.DataFrame([features])[FEATURE_COLUMNS]
+    probabilities = outcome.value[0]
+    prediction = model.classes_[np.argmax(probabilities)]
+    result = format_prediction(prediction, probabilities, model_name, served_metadata(key))
+    result['timing_ms'] = round(outcome.timing_ms, 3)
+    return result
 
-def get_prediction_result(model, model_name, features_df, speed):
+def get_prediction_result(model, model_name, features, key):
     """Get prediction from a model"""
     try:
-        prediction = model.predict(features_df)[0]
-        probabilities = model.predict_proba(features_df)[0]
+        # One model evaluation; the class is the most probable label
+        probabilities = model.predict_proba(features)[0]
+        prediction = model.classes_[np.argmax(probabilities)]
         
-        win_prob = float(probabilities[1] * 100)
-        loss_prob = float(probabilities[0] * 100)
-        confidence = max(win_prob, loss_prob)
-        
-        # Determine confidence level
-        if confidence > 70:
-            confidence_level = 'high'
-        elif confidence > 55:
-            confidence_level = 'medium'
-        else:
-            confidence_level = 'low'
-        
-        return {
-            'prediction': int(prediction),
-            'win_probability': round(win_prob, 2),
-            'loss_probability': round(loss_prob, 2),
-            'predicted_outcome': 'Win' if prediction == 1 else 'Loss',
-            'confidence': round(confidence, 2),
-            'confidence_level': confidence_level,
-            'model': model_name,
-            'accuracy': '72.48%',
-            'speed': speed
-        }
+        return format_prediction(prediction, probabilities, model_name, served_metadata(key))
     except Exception as e:
-        import traceback
-        print(f"❌ Error in get_prediction_result for {model_name}: {e}")
-        traceback.print_exc()
+        logger.exception("Prediction failed for %s", model_name)
         return {'error': str(e)}
 
+def run_both_models(features):
+    """Run XGBoost and Random Forest on one feature row; returns (results, agreement)"""
+    results = {}
+    xgb_model = registry.get('xgb')
+    rf_model = registry.get('rf')
+    
+    # Both models at once on the shared pool (per-model timeouts, see model_executor.py)
+    calls = {}
+    if xgb_model:
+        calls['xgboost'] = ('xgb', xgb_model.predict_proba, features)
+    if rf_model:
+        calls['random_forest'] = ('rf', rf_model.predict_proba, features)
+    outcomes = model_executor.run(calls)
+    
+    # === XGBoost Prediction ===
+    if xgb_model:
+        results['xgboost'] = outcome_result(outcomes['xgboost'], xgb_model, 'XGBoost', 'xgb')
+    else:
+        results['xgboost'] = model_unavailable('XGBoost', 'train_model.py')
+    
+    # === Random Forest Prediction ===
+    if rf_model:
+        results['random_forest'] = outcome_result(
+            outcomes['random_forest'], rf_model, 'Random Forest', 'rf'
+        )
+    else:
+        results['random_forest'] = model_unavailable(
+            'Random Forest', 'train_random_forest.py'
+        )
+    
+    # Calculate agreement
+    agreement = None
+    if xgb_model and rf_model:
+        agreement, diff = calculate_agreement(results['xgboost'], results['random_forest'])
+        if agreement:
+            logger.debug("Agreement: %s (diff %.1f%%)", agreement, diff)
+    
+    return results, agreement
+
+def predict_win(features):
+    """Cached run_both_models for one feature row"""
+    # Same normalized state as a recent request (e.g. another viewer of this ball)?
+    # Versioned, so results of replaced models are never served after a reload
+    cache_key = PredictionCache.key_for(features, registry.version)
+    cached = prediction_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Win prediction served from cache")
+        return cached
+    
+    results, agreement = run_both_models(features)
+    # Don't cache transient errors from a loaded model
+    failed = ((registry.loaded('xgb') and 'error' in results['xgboost']) or
+              (registry.loaded('rf') and 'error' in results['random_forest']))
+    if not failed:
+        prediction_cache.set(cache_key, (results, agreement))
+    return results, agreement
+
+def match_context(data):
+    """Echo of the match state in a win prediction response"""
+    return {
+        'current_score': data['current_score'],
+        'wickets_lost': data['wickets_lost'],
+        'overs_played': data['overs_played'],
+        'innings': data['innings'],
+        'target': data.get('target', 0),
+        'runs_needed': data.get('runs_needed', 0)
+    }
+
 @app.route('/predict-both', methods=['POST'])
 def predict_both():
     """
@@ -230,11 +322,6 @@ def predict_both():
     try:
         data = request.json
         
-        print(f"\n{'='*70}")
-        print(f"📥 DUAL MODEL PREDICTION REQUEST")
-        print(f"{'='*70}")
-        print(f"Data: {data}")
-        
         # Validate required fields
         required_fields = ['current_score', 'wickets_lost', 'overs_played', 'innings']
         for field in required_fields:
@@ -249,113 +336,102 @@ def predict_both():
         data.setdefault('runs_needed', 0)
         
         # Calculate features
-        features_df = calculate_features(data)
-        
-        print(f"🧮 Calculated Features:")
-        print(features_df.to_dict('records')[0])
-        
-        results = {}
-        
-        # === XGBoost Prediction ===
-        if xgb_model:
-            print("\n🚀 Running XGBoost...")
-            results['xgboost'] = get_prediction_result(
-                xgb_model, 'XGBoost', features_df, 'Faster'
-            )
-            if 'error' not in results['xgboost']:
-                print(f"   ✅ XGBoost: {results['xgboost']['predicted_outcome']} "
-                      f"({results['xgboost']['confidence']}%)")
-            else:
-                print(f"   ❌ XGBoost Error: {results['xgboost']['error']}")
-        else:
-            results['xgboost'] = {
-                'error': 'XGBoost model not available',
-                'message': 'Train model: python train_model.py',
-                'win_probability': 50.0,
-                'loss_probability': 50.0,
-                'confidence': 50.0,
-                'predicted_outcome': 'Unknown',
-                'model': 'XGBoost',
-                'accuracy': '72.48%',
-                'speed': 'Faster'
-            }
-            print("   ⚠️ XGBoost not available")
-        
-        # === Random Forest Prediction ===
-        if rf_model:
-            print("\n🌲 Running Random Forest...")
-            results['random_forest'] = get_prediction_result(
-                rf_model, 'Random Forest', features_df, 'Moderate'
-            )
-            if 'error' not in results['random_forest']:
-                print(f"   ✅ Random Forest: {results['random_forest']['predicted_outcome']} "
-                      f"({results['random_forest']['confidence']}%)")
-            else:
-                print(f"   ❌ Random Forest Error: {results['random_forest']['error']}")
-        else:
-            results['random_forest'] = {
-                'error': 'Random Forest model not available',
-                'message': 'Train model: python train_random_forest.py',
-                'win_probability': 50.0,
-                'loss_probability': 50.0,
-                'confidence': 50.0,
-                'predicted_outcome': 'Unknown',
-                'model': 'Random Forest',
-                'accuracy': '72.48%',
-                'speed': 'Moderate'
-            }
-            print("   ⚠️ Random Forest not available")
-        
-        # Calculate agreement
-        agreement = None
-        if xgb_model and rf_model:
-            if 'error' not in results['xgboost'] and 'error' not in results['random_forest']:
-                xgb_prob = results['xgboost']['win_probability']
-                rf_prob = results['random_forest']['win_probability']
-                diff = abs(xgb_prob - rf_prob)
-                
-                if diff < 5:
-                    agreement = 'strong'
-                    agreement_text = '✅ Models strongly agree'
-                elif diff < 10:
-                    agreement = 'moderate'
-                    agreement_text = '🟡 Models moderately agree'
-                else:
-                    agreement = 'disagree'
-                    agreement_text = '⚠️ Models disagree - match is uncertain'
-                
-                print(f"\n🎯 Agreement: {agreement_text} (diff: {diff:.1f}%)")
+        features = calculate_features(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("predict-both features: %s", features_to_dict(features, FEATURE_COLUMNS))
         
-        print(f"{'='*70}\n")
+        results, agreement = predict_win(features)
         
         return jsonify({
             'success': True,
             'models': results,
             'agreement': agreement,
-            'match_context': {
-                'current_score': data['current_score'],
-                'wickets_lost': data['wickets_lost'],
-                'overs_played': data['overs_played'],
-                'innings': data['innings'],
-                'target': data.get('target', 0),
-                'runs_needed': data.get('runs_needed', 0)
-            }
+            'match_context': match_context(data)
         })
         
     except Exception as e:
-        import traceback
-        print(f"\n❌ Error in predict_both: {e}")
-        traceback.print_exc()
+        logger.exception("Error in predict_both")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def all_predictions(data):
+    """/predict-all response body for one validated match state (also the live feed's payload)"""
+    data.setdefault('target', 0)
+    data.setdefault('runs_needed', 0)
+    data.setdefault('total_overs', 20)
+    
+    features = calculate_features(data)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("predict-all features: %s", features_to_dict(features, FEATURE_COLUMNS))
+    
+    results, agreement = predict_win(features)
+    response = {
+        'success': True,
+        'win': {
+            'success': True,
+            'models': results,
+            'agreement': agreement,
+            'match_context': match_context(data)
+        },
+        'score': None
+    }
+    
+    score_error = score_request_error(data)
+    if score_error:
+        response['score_unavailable'] = score_error
+    else:
+        score_features = score_features_from_win(features, data['total_overs'])
+        score_results, average_pred = predict_score(score_features, data['current_score'])
+        response['score'] = score_response(data, score_results, average_pred)
+    return response
+
+@app.route('/predict-all', methods=['POST'])
+def predict_all():
+    """
+    Win probability and projected score for one match state in one call.
+    The base features are computed once and shared by both model pairs.
+    "win" has the /predict-both body; "score" has the /predict-score-both body,
+    or is null with "score_unavailable" outside an unfinished first innings.
+    
+    Request Body:
+    {
+        "current_score": 85,
+        "wickets_lost": 2,
+        "overs_played": 10.0,
+        "innings": 1,
+        "target": 0,
+        "runs_needed": 0,
+        "total_overs": 20
+    }
+    """
+    try:
+        data = request.json
+        
+        # Validate required fields
+        required_fields = ['current_score', 'wickets_lost', 'overs_played', 'innings']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({
+                    'success': False,
+                    'error': f'Missing required field: {field}'
+                }), 400
+        
+        return jsonify(all_predictions(data))
+        
+    except Exception as e:
+        logger.exception("Error in predict_all")
         return jsonify({
             'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
+            'error': str(e)
         }), 500
 
 @app.route('/predict-xgboost', methods=['POST'])
 def predict_xgboost():
     """XGBoost prediction only"""
     try:
+        xgb_model = registry.get('xgb')
         if not xgb_model:
             return jsonify({
                 'success': False,
@@ -363,8 +439,8 @@ def predict_xgboost():
             }), 503
         
         data = request.json
-        features_df = calculate_features(data)
-        result = get_prediction_result(xgb_model, 'XGBoost', features_df, 'Faster')
+        features = calculate_features(data)
+        result = get_prediction_result(xgb_model, 'XGBoost', features, 'xgb')
         
         return jsonify({
             'success': True,
@@ -380,6 +456,7 @@ def predict_xgboost():
 def predict_rf():
     """Random Forest prediction only"""
     try:
+        rf_model = registry.get('rf')
         if not rf_model:
             return jsonify({
                 'success': False,
@@ -387,8 +464,8 @@ def predict_rf():
             }), 503
         
         data = request.json
-        features_df = calculate_features(data)
-        result = get_prediction_result(rf_model, 'Random Forest', features_df, 'Moderate')
+        features = calculate_features(data)
+        result = get_prediction_result(rf_model, 'Random Forest', features, 'rf')
         
         return jsonify({
             'success': True,
@@ -400,6 +477,119 @@ def predict_rf():
             'error': str(e)
         }), 500
 
+@app.route('/predict-batch', methods=['POST'])
+def predict_batch():
+    """
+    Predictions from both models for many match states at once.
+    Features are built in one pass and each model runs once over all rows.
+    
+    Request Body:
+    {
+        "matches": [
+            {"current_score": 85, "wickets_lost": 2, "overs_played": 10.0, "innings": 1},
+            {"current_score": 120, "wickets_lost": 4, "overs_played": 15.0, "innings": 2,
+             "target": 170, "runs_needed": 50}
+        ]
+    }
+    """
+    try:
+        data = request.json or {}
+        matches = data.get('matches')
+        
+        if not isinstance(matches, list) or len(matches) == 0:
+            return jsonify({
+                'success': False,
+                'error': 'Request body must contain a non-empty "matches" list'
+            }), 400
+        
+        # Validate required fields per match, keep valid rows for the models
+        required_fields = ['current_score', 'wickets_lost', 'overs_played', 'innings']
+        results = [None] * len(matches)
+        valid_indices = []
+        for i, match in enumerate(matches):
+            missing = [field for field in required_fields
+                       if not isinstance(match, dict) or field not in match]
+            if missing:
+                results[i] = {
+                    'success': False,
+                    'error': f'Missing required field: {missing[0]}'
+                }
+            else:
+                valid_indices.append(i)
+        
+        valid_matches = [matches[i] for i in valid_indices]
+        model_results = {}
+        
+        if valid_matches:
+            features = calculate_features_batch(valid_matches)
+            
+            batch_models = [
+                ('xgboost', 'xgb', 'XGBoost', 'train_model.py'),
+                ('random_forest', 'rf', 'Random Forest', 'train_random_forest.py')
+            ]
+            # One call per model over the whole matrix, both models at once
+            outcomes = model_executor.run({
+                key: (model_key, registry.get(model_key).predict_proba, features)
+                for key, model_key, _, _ in batch_models if registry.loaded(model_key)
+            })
+            
+            for key, model_key, model_name, train_script in batch_models:
+                model = registry.get(model_key)
+                if not model:
+                    placeholder = model_unavailable(model_name, train_script)
+                    model_results[key] = [placeholder] * len(valid_matches)
+                    continue
+                
+                outcome = outcomes[key]
+                if outcome.error is not None:
+                    logger.error("Batch prediction failed for %s: %s", model_name, outcome.error)
+                    model_results[key] = [{'error': str(outcome.error)}] * len(valid_matches)
+                    continue
+                
+                probabilities = outcome.value
+                predictions = model.classes_[np.argmax(probabilities, axis=1)]
+                metadata = served_metadata(model_key)
+                model_results[key] = [
+                    format_prediction(prediction, row, model_name, metadata)
+                    for prediction, row in zip(predictions, probabilities)
+                ]
+        
+        for row, i in enumerate(valid_indices):
+            match = matches[i]
+            xgb_result = model_results['xgboost'][row]
+            rf_result = model_results['random_forest'][row]
+            agreement, _ = calculate_agreement(xgb_result, rf_result)
+            
+            results[i] = {
+                'success': True,
+                'models': {
+                    'xgboost': xgb_result,
+                    'random_forest': rf_result
+                },
+                'agreement': agreement,
+                'match_context': {
+                    'current_score': match['current_score'],
+                    'wickets_lost': match['wickets_lost'],
+                    'overs_played': match['overs_played'],
+                    'innings': match['innings'],
+                    'target': match.get('target', 0),
+                    'runs_needed': match.get('runs_needed', 0)
+                }
+            }
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'results': results
+        })
+        
+    except Exception as e:
+        logger.exception("Error in predict_batch")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 if __name__ == '__main__':
     print("\n" + "=" * 70)
     print("🚀 STARTING DUAL MODEL API SERVER")
@@ -407,20 +597,30 @@ if __name__ == '__main__':
     print("📡 Server: http://localhost:5001")
     print("📖 Documentation: http://localhost:5001/")
     print("🤖 Models Status:")
-    print(f"   - XGBoost: {'✅ Loaded' if xgb_model else '❌ Not Loaded'}")
-    print(f"   - Random Forest: {'✅ Loaded' if rf_model else '❌ Not Loaded'}")
-    print("📊 Dataset: 8720 IPL matches (2008-2020)")
-    print("🎯 Accuracy: 72.48% (both models)")
+    print(f"   - XGBoost: {'✅ Loaded' if registry.loaded('xgb') else '❌ Not Loaded'}")
+    print(f"   - Random Forest: {'✅ Loaded' if registry.loaded('rf') else '❌ Not Loaded'}")
+    print(f"   - Score models: {'✅ Loaded' if registry.loaded('score_xgb') and registry.loaded('score_rf') else '❌ Not Loaded'}")
+    for key, model_name in [('xgb', 'XGBoost'), ('rf', 'Random Forest')]:
+        metadata = served_metadata(key)
+        if metadata['accuracy']:
+            print(f"🎯 {model_name}: {metadata['accuracy']} test accuracy, "
+                  f"{metadata['samples']} training rows, {metadata['speed']}")
+        else:
+            print(f"🎯 {model_name}: not benchmarked (python ml_models/benchmark_models.py)")
     
-    if not xgb_model or not rf_model:
+    if not registry.loaded('xgb') or not registry.loaded('rf'):
         print("\n⚠️  WARNING: Some models are not loaded!")
         print("💡 Solutions:")
-        if not xgb_model:
+        if not registry.loaded('xgb'):
             print("   1. Train XGBoost: python train_model.py")
-        if not rf_model:
+        if not registry.loaded('rf'):
             print("   2. Train Random Forest: python train_random_forest.py")
         print("   3. Check model files exist in models/")
     
     print("=" * 70 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    print(f"💡 Production: python ml_models/serve.py win (this is the Flask dev server)")
+    
+    # Debugger and reloader only when asked for (FLASK_DEBUG=1)
+    debug = os.environ.get('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, host='0.0.0.0', port=5001)
\ No newline at end of file
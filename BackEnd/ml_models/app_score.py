@@ -1,67 +1,40 @@
-from flask import Flask, request, jsonify
+from flask import Flask, jsonify
 from flask_cors import CORS
-import pickle
-import pandas as pd
-import numpy as np
 import os
+import warnings
 
+from model_registry import registry, SCORE_MODEL_KEYS
+from model_reload import ModelReloader
+from request_metrics import RequestMetrics
+from score_routes import score_bp, score_cache
+
+# Models were fitted on DataFrames; we now pass plain float32 arrays
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+# Standalone score service (port 5002). app.py serves the same routes on 5001
+# together with the win models; this entry point only loads the score models.
 app = Flask(__name__)
 CORS(app)
 
+# Request detail is logged at DEBUG (LOG_LEVEL); timings are on GET /metrics
+request_metrics = RequestMetrics('score_api').install(app)
+
 print("=" * 70)
 print("🎯 LOADING DUAL SCORE PREDICTION SYSTEM (XGBoost + Random Forest)")
 print("=" * 70)
 
-# Load XGBoost Score Model
-xgb_score_model = None
-xgb_score_paths = [
-    'ml_models/models/model_score_xgb.pkl',
-    'models/model_score_xgb.pkl',
-    './model_score_xgb.pkl'
-]
-
-for path in xgb_score_paths:
-    if os.path.exists(path):
-        try:
-            with open(path, 'rb') as f:
-                xgb_score_model = pickle.load(f)
-            print(f"✅ XGBoost Score Model loaded from: {path}")
-            break
-        except Exception as e:
-            print(f"❌ Error loading XGBoost Score: {e}")
-
-if not xgb_score_model:
-    print("❌ XGBoost Score model NOT loaded!")
-    print("💡 Run: python ml_models/train_score_xgboost.py")
-
-# Load Random Forest Score Model
-rf_score_model = None
-rf_score_paths = [
-    'ml_models/models/model_score_rf.pkl',
-    'models/model_score_rf.pkl',
-    './model_score_rf.pkl'
-]
-
-for path in rf_score_paths:
-    if os.path.exists(path):
-        try:
-            with open(path, 'rb') as f:
-                rf_score_model = pickle.load(f)
-            print(f"✅ Random Forest Score Model loaded from: {path}")
-            break
-        except Exception as e:
-            print(f"❌ Error loading RF Score: {e}")
-
-if not rf_score_model:
-    print("❌ Random Forest Score model NOT loaded!")
-    print("💡 Run: python ml_models/train_score_random_forest.py")
+registry.load(SCORE_MODEL_KEYS)
+# First request shouldn't pay for lazy initialisation; /health reports ready after this
+registry.warm_up()
 
+print(f"⏱️  Load {registry.startup['load_ms']:.0f} ms, warm-up {registry.startup['warmup_ms']:.0f} ms, "
+      f"first prediction {registry.startup['time_to_first_prediction_s']:.2f}s after process start")
 print("=" * 70)
 
-FEATURE_COLUMNS = [
-    'current_score', 'wickets_lost', 'overs_played', 
-    'run_rate', 'wickets_remaining', 'total_overs'
-]
+app.register_blueprint(score_bp)
+
+# One model set per request; POST /admin/reload and MODEL_WATCH_INTERVAL swap in new files
+reloader = ModelReloader(registry).install(app)
 
 @app.route('/')
 def home():
@@ -69,163 +42,39 @@ def home():
         'message': 'Cricket Score Prediction API - Dual Model System',
         'version': '1.0',
         'models': {
-            'xgboost': 'loaded' if xgb_score_model else 'not available',
-            'random_forest': 'loaded' if rf_score_model else 'not available'
+            'xgboost': 'loaded' if registry.loaded('score_xgb') else 'not available',
+            'random_forest': 'loaded' if registry.loaded('score_rf') else 'not available'
         },
         'endpoints': {
             'predict_score_both': '/predict-score-both [POST]',
-            'health': '/health [GET]'
+            'health': '/health [GET]',
+            'metrics': '/metrics [GET]',
+            'admin_reload': '/admin/reload [POST]'
         }
     })
 
 @app.route('/health')
 def health():
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if registry.ready else 'starting',
+        'ready': registry.ready,
+        'startup': registry.startup,
+        'version': registry.version,
+        'reload': reloader.status,
         'models': {
-            'xgboost_score': 'loaded' if xgb_score_model else 'not loaded',
-            'rf_score': 'loaded' if rf_score_model else 'not loaded'
-        }
-    })
-
-def calculate_score_features(data):
-    """Calculate features for score prediction"""
-    current_score = data.get('current_score', 0)
-    wickets_lost = data.get('wickets_lost', 0)
-    overs_played = data.get('overs_played', 0)
-    total_overs = data.get('total_overs', 20)
-    
-    run_rate = current_score / overs_played if overs_played > 0 else 0
-    wickets_remaining = 10 - wickets_lost
-    
-    features = {
-        'current_score': current_score,
-        'wickets_lost': wickets_lost,
-        'overs_played': overs_played,
-        'run_rate': round(run_rate, 2),
-        'wickets_remaining': wickets_remaining,
-        'total_overs': total_overs
-    }
-    
-    return pd.DataFrame([features])[FEATURE_COLUMNS]
-
-@app.route('/predict-score-both', methods=['POST'])
-def predict_score_both():
-    """
-    Get score predictions from both models
-    
-    Request:
-    {
-        "current_score": 85,
-        "wickets_lost": 2,
-        "overs_played": 10.0,
-        "total_overs": 20
-    }
-    """
-    try:
-        data = request.json
-        
-        print(f"\n{'='*70}")
-        print(f"🎯 DUAL SCORE PREDICTION REQUEST")
-        print(f"{'='*70}")
-        print(f"Data: {data}")
-        
-        # Validate
-        required = ['current_score', 'wickets_lost', 'overs_played']
-        for field in required:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing field: {field}'
-                }), 400
-        
-        # Only predict for innings 1
-        if data.get('innings', 1) != 1:
-            return jsonify({
-                'success': False,
-                'error': 'Score prediction only available for first innings'
-            }), 400
-        
-        # Check if innings complete
-        total_overs = data.get('total_overs', 20)
-        if data['overs_played'] >= total_overs:
-            return jsonify({
-                'success': False,
-                'error': 'Innings already complete'
-            }), 400
-        
-        data.setdefault('total_overs', 20)
-        
-        features_df = calculate_score_features(data)
-        print(f"🧮 Features: {features_df.to_dict('records')[0]}")
-        
-        results = {}
-        
-        # XGBoost Prediction
-        if xgb_score_model:
-            print("\n🚀 XGBoost predicting...")
-            xgb_pred = xgb_score_model.predict(features_df)[0]
-            xgb_pred = max(data['current_score'], int(round(xgb_pred)))
-            
-            results['xgboost'] = {
-                'predicted_score': xgb_pred,
-                'model': 'XGBoost',
-                'speed': 'Faster'
-            }
-            print(f"   ✅ XGBoost: {xgb_pred} runs")
-        else:
-            results['xgboost'] = {
-                'error': 'Model not available',
-                'predicted_score': None
-            }
-        
-        # Random Forest Prediction
-        if rf_score_model:
-            print("\n🌲 Random Forest predicting...")
-            rf_pred = rf_score_model.predict(features_df)[0]
-            rf_pred = max(data['current_score'], int(round(rf_pred)))
-            
-            results['random_forest'] = {
-                'predicted_score': rf_pred,
-                'model': 'Random Forest',
-                'speed': 'Moderate'
-            }
-            print(f"   ✅ Random Forest: {rf_pred} runs")
-        else:
-            results['random_forest'] = {
-                'error': 'Model not available',
-                'predicted_score': None
-            }
-        
-        # Calculate average if both available
-        average_pred = None
-        if xgb_score_model and rf_score_model:
-            average_pred = int(round((results['xgboost']['predicted_score'] + 
-                                     results['random_forest']['predicted_score']) / 2))
-            print(f"\n📊 Average Prediction: {average_pred} runs")
-        
-        print(f"{'='*70}\n")
-        
-        return jsonify({
-            'success': True,
-            'models': results,
-            'average_prediction': average_pred,
-            'match_context': {
-                'current_score': data['current_score'],
-                'wickets_lost': data['wickets_lost'],
-                'overs_played': data['overs_played'],
-                'overs_remaining': total_overs - data['overs_played']
-            }
-        })
-        
-    except Exception as e:
-        import traceback
-        print(f"\n❌ Error: {e}")
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+            'xgboost_score': 'loaded' if registry.loaded('score_xgb') else 'not loaded',
+            'rf_score': 'loaded' if registry.loaded('score_rf') else 'not loaded'
+        },
+        'backends': {
+            'xgboost_score': registry.backend('score_xgb'),
+            'rf_score': registry.backend('score_rf')
+        },
+        'variants': {
+            'xgboost_score': registry.variant('score_xgb'),
+            'rf_score': registry.variant('score_rf')
+        },
+        'cache': score_cache.stats()
+    }), 200 if registry.ready else 503
 
 if __name__ == '__main__':
     print("\n" + "=" * 70)
@@ -233,8 +82,12 @@ if __name__ == '__main__':
     print("=" * 70)
     print("📡 Server: http://localhost:5002")
     print("🤖 Models:")
-    print(f"   XGBoost: {'✅' if xgb_score_model else '❌'}")
-    print(f"   Random Forest: {'✅' if rf_score_model else '❌'}")
+    print(f"   XGBoost: {'✅' if registry.loaded('score_xgb') else '❌'}")
+    print(f"   Random Forest: {'✅' if registry.loaded('score_rf') else '❌'}")
     print("=" * 70 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5002)
\ No newline at end of file
+    print(f"💡 Production: python ml_models/serve.py score (this is the Flask dev server)")
+    
+    # Debugger and reloader only when asked for (FLASK_DEBUG=1)
+    debug = os.environ.get('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, host='0.0.0.0', port=5002)
\ No newline at end of file
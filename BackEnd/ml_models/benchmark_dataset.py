@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from dataset import cache_dir_for, find_training_data
+
+FEATURE_COLUMNS = [
+    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
+    'innings', 'target', 'runs_needed', 'wickets_remaining', 'required_run_rate'
+]
+
+# Runs in a fresh interpreter per mode so timings and RSS don't share warm state
+CHILD = r'''
+import json, os, resource, sys, time
+sys.path.insert(0, SCRIPT_DIR)
+import numpy as np
+import pandas as pd
+from dataset import load_training_data
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+before = rss_mb()
+start = time.perf_counter()
+if MODE == 'csv':
+    df = pd.read_csv(PATH)
+else:
+    df = load_training_data(PATH)
+load_time = time.perf_counter() - start
+loaded = rss_mb()
+
+# Touch what a trainer touches: the feature matrix and the target
+start = time.perf_counter()
+X = df[FEATURES].to_numpy(dtype=np.float32)
+y = df['team_won'].to_numpy()
+matrix_time = time.perf_counter() - start
+
+print(json.dumps({
+    'load_s': load_time,
+    'matrix_s': matrix_time,
+    'load_rss_mb': loaded - before,
+    'total_rss_mb': rss_mb() - before,
+    'df_mb': df.memory_usage(deep=True).sum() / 1e6,
+    'rows': len(df),
+    'checksum': float(X.astype(np.float64).sum()) + int(y.sum())
+}))
+'''
+
+
+def run_mode(mode, path):
+    code = (f"SCRIPT_DIR = {SCRIPT_DIR!r}\nPATH = {path!r}\nMODE = {mode!r}\n"
+            f"FEATURES = {FEATURE_COLUMNS!r}\n" + CHILD)
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+print("=" * 70)
+print("⏱️  TRAINING DATA LOAD BENCHMARK: CSV vs cached columnar (mmap)")
+print("=" * 70)
+
+path = sys.argv[1] if len(sys.argv) > 1 else find_training_data()
+if not path or not os.path.exists(path):
+    print("❌ training_data_ipl.csv not found (run from BackEnd/ or pass a path)")
+    sys.exit(1)
+
+print(f"\n📂 Source: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+if os.environ.get('DATASET_CACHE', 'on').lower() == 'off':
+    print("⚠️ DATASET_CACHE=off: cold/warm rows below read the CSV too")
+
+# Cold = the cache is (re)built from the CSV; warm = memory-mapped from the cache
+shutil.rmtree(cache_dir_for(path), ignore_errors=True)
+results = {}
+for mode in ['csv', 'cold', 'warm']:
+    results[mode] = run_mode(mode, path)
+
+print(f"\n{'':18}{'load':>10}{'+ matrix':>11}{'RSS load':>12}{'RSS total':>12}{'frame':>10}")
+labels = {'csv': 'pandas read_csv', 'cold': 'cache cold', 'warm': 'cache warm'}
+for mode, r in results.items():
+    print(f"   {labels[mode]:15}{r['load_s'] * 1000:8.1f}ms{r['matrix_s'] * 1000:9.1f}ms"
+          f"{r['load_rss_mb']:9.1f} MB{r['total_rss_mb']:9.1f} MB{r['df_mb']:7.1f} MB")
+
+speedup = results['csv']['load_s'] / results['warm']['load_s']
+same = len({round(r['checksum'], 3) for r in results.values()}) == 1
+print(f"\n   Warm load is {speedup:.1f}x faster than read_csv")
+print(f"   {'✅ same feature values in every mode' if same else '❌ FEATURE VALUES DIFFER'}")
+
+print("\n" + "=" * 70)
+if not same:
+    sys.exit(1)
+print("✅ DATASET BENCHMARK COMPLETE")
+print("=" * 70)
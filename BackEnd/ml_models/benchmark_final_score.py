@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from add_final_score_column import calculate_final_score
+from dataset import find_training_data
+
+print("=" * 70)
+print("⏱️  FINAL_SCORE BENCHMARK: df.apply(axis=1) vs column-wise NumPy")
+print("=" * 70)
+
+
+def legacy_final_score(row):
+    """The original per-row function, kept as the reference output"""
+    if row['innings'] == 2:
+        target = row.get('target', 0)
+        if target > 0:
+            return target
+        return row.get('current_score', 0) + 50
+
+    current_score = row['current_score']
+    overs_played = row['overs_played']
+    wickets_lost = row['wickets_lost']
+    total_overs = row.get('total_overs', 20)
+    run_rate = row['run_rate']
+
+    overs_remaining = total_overs - overs_played
+    if overs_remaining <= 0:
+        return current_score
+
+    wickets_remaining = 10 - wickets_lost
+    wicket_factor = max(0.5, wickets_remaining / 10)
+
+    if overs_remaining <= 5:
+        acceleration = 1.2
+    elif overs_remaining <= 10:
+        acceleration = 1.1
+    else:
+        acceleration = 1.0
+
+    projected_runs = run_rate * overs_remaining * wicket_factor * acceleration
+    final_score = int(current_score + projected_runs)
+
+    if total_overs == 20:
+        final_score = max(100, min(final_score, 250))
+    elif total_overs == 50:
+        final_score = max(150, min(final_score, 450))
+
+    return final_score
+
+
+def synthetic_rows(n, seed=42):
+    """Snapshots covering both innings, T20/ODI/other formats, completed innings and no-target chases"""
+    rng = np.random.default_rng(seed)
+    total_overs = rng.choice([20, 50, 10], size=n, p=[0.8, 0.15, 0.05])
+    balls = rng.integers(1, total_overs * 6 + 1)
+    overs_played = balls // 6 + (balls % 6) / 10
+    current_score = rng.integers(0, 9, size=n) * balls // 6
+    innings = rng.integers(1, 3, size=n)
+    target = np.where(innings == 2, rng.integers(0, 300, size=n), 0)
+    target[rng.random(n) < 0.02] = 0
+    return pd.DataFrame({
+        'current_score': current_score,
+        'wickets_lost': rng.integers(0, 11, size=n),
+        'overs_played': overs_played,
+        'total_overs': total_overs,
+        'innings': innings,
+        'run_rate': np.round(current_score / (balls / 6), 2),
+        'target': target,
+    })
+
+
+def bits_equal(a, b):
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return a.dtype == b.dtype and a.shape == b.shape and np.array_equal(a.view(np.int64), b.view(np.int64))
+
+
+cases = [('synthetic 10k', synthetic_rows(10_000)), ('synthetic 1M', synthetic_rows(1_000_000))]
+training_data_path = find_training_data()
+if training_data_path:
+    real = pd.read_csv(training_data_path)
+    cases.insert(0, (f'{training_data_path}', real.drop(columns=['final_score'], errors='ignore')))
+
+failures = 0
+for label, df in cases:
+    print(f"\n🔄 {label} ({len(df):,} rows)")
+    start = time.perf_counter()
+    legacy = df.apply(legacy_final_score, axis=1).to_numpy()
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = calculate_final_score(df)
+    vectorized_time = time.perf_counter() - start
+
+    identical = bits_equal(legacy, vectorized)
+    failures += not identical
+    print(f"   df.apply(axis=1): {legacy_time:9.3f}s  ({legacy.dtype})")
+    print(f"   NumPy columns:    {vectorized_time:9.3f}s  ({vectorized.dtype})")
+    print(f"   Speedup: {legacy_time / vectorized_time:.0f}x   "
+          f"{'✅ bit-for-bit identical' if identical else '❌ OUTPUT DIFFERS'}")
+
+print("\n" + "=" * 70)
+if failures:
+    print("❌ VECTORIZED FINAL_SCORE DOES NOT MATCH df.apply")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ VECTORIZED FINAL_SCORE MATCHES df.apply")
+print("=" * 70)
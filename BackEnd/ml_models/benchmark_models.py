@@ -0,0 +1,311 @@
+"""
+Latency, throughput, cold-load and memory benchmark of every model in models/.
+
+    python ml_models/benchmark_models.py
+    python ml_models/benchmark_models.py --models xgb,rf --calls 2000
+    python ml_models/benchmark_models.py --batch-sizes 1,64,1024 --output /tmp/bench.json
+
+Every registry model (model_registry.MODEL_SPECS) and every variant of it
+(models/<name>_<variant>.pkl, see compress_model.py) is measured on the test
+split of the trainers (80/20, random_state=42):
+
+    metric        accuracy (win) or MAE in runs (score)
+    latency_ms    p50 / p95 / p99 / mean of single-row predictions, as the APIs make them
+                  (the XGBoost win model through its win table when one matches the
+                  file, with the model alone under 'without_win_table')
+    throughput    rows per second at each batch size
+    cold_load     load time (manifest entry if usable, else the pickle), first
+                  prediction and resident memory, measured in a fresh Python
+                  process so nothing is already cached
+
+The results go to models/benchmark_results.json. model_registry.py reads that
+file so the APIs serve the measured accuracy and speed of the model file
+they actually loaded (matched by sha256) instead of fixed strings.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from dataset import find_training_data, load_training_data
+from model_manifest import check_entry, load_manifest
+from model_registry import BENCHMARK_RESULTS_PATH, MODEL_SPECS, MODELS_DIR, model_files
+from training_config import available_cores, for_serving, predict_n_jobs
+from tree_engine import backend_name, select_backend
+from tune_models import SEARCH, quality, task_splits
+from win_table import attach_win_table, file_sha256
+
+warnings.filterwarnings('ignore')
+
+LATENCY_CALLS = 1000
+BATCH_SIZES = [1, 32, 256, 2048]
+THROUGHPUT_SECONDS = 0.25
+COLD_LOAD_RUNS = 3
+
+
+def predict_function(model):
+    # Compiled regressors (tree_engine.py) have a predict_proba that raises
+    return model.predict_proba if hasattr(model, 'classes_') else model.predict
+
+
+def latency_stats(model, X, calls=LATENCY_CALLS):
+    """Single-row latency percentiles in milliseconds"""
+    predict = predict_function(model)
+    predict(X[:1])
+    times = np.empty(calls)
+    for i in range(calls):
+        row = X[i % len(X)][None, :]
+        start = time.perf_counter()
+        predict(row)
+        times[i] = time.perf_counter() - start
+    times *= 1000
+    return {
+        'p50': float(np.percentile(times, 50)),
+        'p95': float(np.percentile(times, 95)),
+        'p99': float(np.percentile(times, 99)),
+        'mean': float(times.mean()),
+        'calls': calls
+    }
+
+
+def throughput(model, X, batch_sizes=BATCH_SIZES, seconds=THROUGHPUT_SECONDS):
+    """{batch size: rows per second}, calling ``model`` repeatedly for about ``seconds`` per size"""
+    predict = predict_function(model)
+    rates = {}
+    for size in batch_sizes:
+        batch = np.resize(X, (size, X.shape[1]))
+        predict(batch)
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            predict(batch)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= seconds:
+                break
+        rates[str(size)] = calls * size / elapsed
+    return rates
+
+
+# Run with ``python -c`` so nothing but the standard library is imported beforehand
+COLD_LOAD_SCRIPT = """
+import json, os, pickle, sys, time
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        # Peak, not current, but the best there is without /proc (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+script_dir, path, manifest_key = sys.argv[1], sys.argv[2], sys.argv[3:]
+start = time.perf_counter()
+import numpy as np
+import sklearn.ensemble
+import xgboost
+sys.path.insert(0, script_dir)
+from model_manifest import load_manifest, load_native
+from training_config import for_serving
+import_ms = (time.perf_counter() - start) * 1000
+rss_before = rss_mb()
+
+start = time.perf_counter()
+if manifest_key:
+    model = for_serving(load_native(load_manifest()[manifest_key[0]]))
+else:
+    with open(path, 'rb') as f:
+        model = for_serving(pickle.load(f))
+load_ms = (time.perf_counter() - start) * 1000
+
+row = np.zeros((1, model.n_features_in_), dtype=np.float32)
+predict = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+start = time.perf_counter()
+predict(row)
+first_prediction_ms = (time.perf_counter() - start) * 1000
+
+rss_after = rss_mb()
+print(json.dumps({
+    'import_ms': import_ms,
+    'load_ms': load_ms,
+    'first_prediction_ms': first_prediction_ms,
+    'rss_mb': rss_after,
+    'model_rss_mb': rss_after - rss_before
+}))
+"""
+
+
+def cold_load(path, runs=COLD_LOAD_RUNS, manifest_key=None):
+    """Median cold-load figures of ``path`` (or its manifest entry) over ``runs`` fresh processes"""
+    command = [sys.executable, '-c', COLD_LOAD_SCRIPT, SCRIPT_DIR, path]
+    if manifest_key:
+        command.append(manifest_key)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {field: float(np.median([sample[field] for sample in samples]))
+            for field in samples[0]}
+
+
+def benchmark_model(model, X_test, y_test, task, calls=LATENCY_CALLS, batch_sizes=BATCH_SIZES):
+    """Quality, latency and throughput of a loaded model on the test split"""
+    return {
+        'metric_name': 'accuracy' if task == 'win' else 'mae',
+        'metric': quality(task, y_test, model.predict(X_test)),
+        'latency_ms': latency_stats(model, X_test, calls),
+        'throughput': throughput(model, X_test, batch_sizes)
+    }
+
+
+def benchmark_file(entry_key, key, variant, path, splits, args):
+    spec = MODEL_SPECS[key]
+    task = SEARCH[key]['task']
+    X_train, _ = splits[task]['train']
+    X_test, y_test = splits[task]['test']
+
+    with open(path, 'rb') as f:
+        model = for_serving(pickle.load(f))
+    # Same backend the API would use (INFERENCE_BACKEND / INFERENCE_BACKEND_<KEY>)
+    model = select_backend(model, key)
+    sha256 = file_sha256(path)
+    live_model, table = model, None
+    if key == 'xgb':
+        # Served through the win table when one was built from this file (model_registry.py)
+        model, table = attach_win_table(model, path, os.path.dirname(path), model_sha256=sha256)
+
+    result = {
+        'key': key,
+        'variant': variant,
+        'name': spec.name,
+        'file': os.path.basename(path),
+        'sha256': sha256,
+        'size_bytes': os.path.getsize(path),
+        'type': type(getattr(live_model, 'native_model', live_model)).__name__,
+        'backend': backend_name(live_model),
+        'win_table': table is not None,
+        'task': task,
+        'training_samples': len(X_train),
+        'test_samples': len(X_test)
+    }
+    result.update(benchmark_model(model, X_test, y_test, task, args.calls, args.batch_sizes))
+    if table is not None:
+        # The API's path above; the model alone for comparison (and WIN_TABLE=off)
+        result['without_win_table'] = benchmark_model(live_model, X_test, y_test, task,
+                                                      args.calls, args.batch_sizes)
+        result['win_table_hit_rate'] = table.stats()['hit_rate']
+    # Loaded as the APIs would: from the manifest entry when it is usable
+    entry = load_manifest().get(entry_key)
+    manifest_key = entry_key if entry and check_entry(entry, task) is None else None
+    result['format'] = entry['format'] if manifest_key else 'pickle'
+    result['cold_load'] = cold_load(path, args.cold_runs, manifest_key)
+    return result
+
+
+def print_results(results, batch_sizes):
+    print(f"\n{'Model':<20} {'Metric':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'Load ms':>8} {'RSS MB':>7}")
+    print("-" * 74)
+    for entry_key, result in results.items():
+        metric = (f"{result['metric'] * 100:.2f}%" if result['metric_name'] == 'accuracy'
+                  else f"{result['metric']:.2f}")
+        latency = result['latency_ms']
+        cold = result['cold_load']
+        print(f"{entry_key:<20} {metric:>9} {latency['p50']:8.3f} {latency['p95']:8.3f} "
+              f"{latency['p99']:8.3f} {cold['load_ms']:8.1f} {cold['model_rss_mb']:7.1f}")
+        if 'without_win_table' in result:
+            latency = result['without_win_table']['latency_ms']
+            print(f"{'  (no win table)':<20} {'':>9} {latency['p50']:8.3f} {latency['p95']:8.3f} "
+                  f"{latency['p99']:8.3f}")
+
+    print(f"\n{'Rows/s':<20}" + ''.join(f"{f'batch {size}':>13}" for size in batch_sizes))
+    print("-" * (20 + 13 * len(batch_sizes)))
+    for entry_key, result in results.items():
+        print(f"{entry_key:<20}" + ''.join(
+            f"{result['throughput'][str(size)]:13,.0f}" for size in batch_sizes))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark every model in ml_models/models')
+    parser.add_argument('--models', default=','.join(MODEL_SPECS),
+                        help=f"registry keys to benchmark (default {','.join(MODEL_SPECS)})")
+    parser.add_argument('--calls', type=int, default=LATENCY_CALLS, help='single-row predictions per model')
+    parser.add_argument('--batch-sizes', default=','.join(map(str, BATCH_SIZES)))
+    parser.add_argument('--cold-runs', type=int, default=COLD_LOAD_RUNS, help='fresh processes per model')
+    parser.add_argument('--output', default=BENCHMARK_RESULTS_PATH)
+    args = parser.parse_args()
+    args.models = [m for m in args.models.split(',') if m]
+    unknown = [m for m in args.models if m not in MODEL_SPECS]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+    args.batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("⏱️  MODEL BENCHMARK: latency, throughput, cold load, memory")
+    print("=" * 70)
+
+    files = model_files(args.models)
+    if not files:
+        print("❌ No trained models found in", MODELS_DIR)
+        print("💡 Solution: Run 'python ml_models/pipeline.py'")
+        sys.exit(1)
+
+    data_path = find_training_data()
+    df = load_training_data(data_path)
+    splits = {task: task_splits(df, task) for task in ('win', 'score')}
+    print(f"\n📂 {len(df):,} rows from {data_path}")
+    print(f"🖥️  {available_cores()} cores, PREDICT_N_JOBS={predict_n_jobs()}")
+
+    results = {}
+    for entry_key, key, variant, path in files:
+        print(f"🔍 {entry_key} ({os.path.basename(path)})...", flush=True)
+        results[entry_key] = benchmark_file(entry_key, key, variant, path, splits, args)
+
+    print_results(results, args.batch_sizes)
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'host': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cores': available_cores(),
+            'predict_n_jobs': predict_n_jobs()
+        },
+        'dataset': {
+            'file': os.path.basename(data_path),
+            'rows': len(df),
+            'sha256': file_sha256(data_path)
+        },
+        'latency_calls': args.calls,
+        'batch_sizes': args.batch_sizes,
+        'models': results
+    }
+    # Keep earlier results for models not benchmarked this run
+    if os.path.exists(args.output) and set(args.models) != set(MODEL_SPECS):
+        with open(args.output) as f:
+            previous = json.load(f).get('models', {})
+        report['models'] = {**previous, **results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved: {args.output}")
+
+    print("\n" + "=" * 70)
+    print("✅ BENCHMARK COMPLETE")
+    print("=" * 70)
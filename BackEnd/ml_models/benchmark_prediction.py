@@ -0,0 +1,91 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+print("=" * 70)
+print("⏱️  PER-REQUEST MODEL TIME: predict + predict_proba vs predict_proba")
+print("=" * 70)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(SCRIPT_DIR, 'models')
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 500))
+
+FEATURE_COLUMNS = [
+    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
+    'innings', 'target', 'runs_needed', 'wickets_remaining',
+    'required_run_rate'
+]
+
+# One-row input, exactly as /predict-both builds it
+features_df = pd.DataFrame([{
+    'current_score': 85,
+    'wickets_lost': 2,
+    'overs_played': 10.0,
+    'run_rate': 8.5,
+    'innings': 1,
+    'target': 0,
+    'runs_needed': 0,
+    'wickets_remaining': 8,
+    'required_run_rate': 0.0
+}])[FEATURE_COLUMNS]
+
+
+def old_path(model):
+    prediction = model.predict(features_df)[0]
+    probabilities = model.predict_proba(features_df)[0]
+    return prediction, probabilities
+
+
+def new_path(model):
+    probabilities = model.predict_proba(features_df)[0]
+    prediction = model.classes_[np.argmax(probabilities)]
+    return prediction, probabilities
+
+
+def time_calls(fn, model):
+    for _ in range(20):  # warm-up
+        fn(model)
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(model)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+results = {}
+for model_name, filename in [('XGBoost', 'model_xgb.pkl'), ('Random Forest', 'model_rf.pkl')]:
+    model_path = os.path.join(MODELS_DIR, filename)
+    if not os.path.exists(model_path):
+        print(f"\n⚠️  {model_name}: {filename} not found, skipping")
+        continue
+
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+
+    # Both paths must agree before timing them
+    old_pred, old_proba = old_path(model)
+    new_pred, new_proba = new_path(model)
+    assert old_pred == new_pred and np.array_equal(old_proba, new_proba)
+
+    old_ms = time_calls(old_path, model)
+    new_ms = time_calls(new_path, model)
+    results[model_name] = (old_ms, new_ms)
+
+    print(f"\n📊 {model_name} ({ITERATIONS} requests)")
+    print(f"   {'Path':<28} {'Mean':>10} {'p50':>10} {'p99':>10}")
+    for label, ms in [('predict + predict_proba', old_ms), ('predict_proba only', new_ms)]:
+        print(f"   {label:<28} {ms.mean():>8.3f}ms {np.percentile(ms, 50):>8.3f}ms "
+              f"{np.percentile(ms, 99):>8.3f}ms")
+    print(f"   ⚡ Saved per request: {old_ms.mean() - new_ms.mean():.3f} ms "
+          f"({(1 - new_ms.mean() / old_ms.mean()) * 100:.0f}%)")
+
+if len(results) == 2:
+    old_total = sum(old.mean() for old, _ in results.values())
+    new_total = sum(new.mean() for _, new in results.values())
+    print("\n" + "=" * 70)
+    print(f"🎯 /predict-both model time: {old_total:.3f} ms -> {new_total:.3f} ms")
+    print("=" * 70)
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_training_data import build_training_data, matches_path, deliveries_path
+
+print("=" * 70)
+print("⏱️  TRAINING DATA GENERATOR BENCHMARK: per-match loop vs groupby/cumsum")
+print("=" * 70)
+
+
+def legacy_training_data(matches, deliveries):
+    """The original iterrows() generator, kept as the reference output"""
+    valid_matches = matches[matches['id'].isin(deliveries['match_id'].unique())]
+    training_data = []
+    for idx, match in valid_matches.iterrows():
+        match_deliveries = deliveries[deliveries['match_id'] == match['id']]
+        winner = match['winner']
+        if len(match_deliveries) == 0 or pd.isna(winner):
+            continue
+
+        innings1 = match_deliveries[match_deliveries['inning'] == 1]
+        innings2 = match_deliveries[match_deliveries['inning'] == 2]
+        for innings, inning_rows in [(1, innings1), (2, innings2)]:
+            if len(inning_rows) == 0 or (innings == 2 and len(innings1) == 0):
+                continue
+            team_won = 1 if winner == inning_rows.iloc[0]['batting_team'] else 0
+            target = int(innings1['total_runs'].sum()) + 1 if innings == 2 else 0
+            for target_over in [6, 10, 15, 20]:
+                inning_data = inning_rows[inning_rows['over'] < target_over]
+                if len(inning_data) == 0:
+                    continue
+                score = inning_data['total_runs'].sum()
+                wickets = inning_data['is_wicket'].sum() if 'is_wicket' in inning_data.columns else \
+                         inning_data['player_dismissed'].notna().sum()
+                overs_left = 20 - target_over
+                runs_needed = target - score
+                required_rr = runs_needed / overs_left if innings == 2 and overs_left > 0 else 0
+                training_data.append({
+                    'current_score': int(score),
+                    'wickets_lost': int(wickets),
+                    'overs_played': float(target_over),
+                    'total_overs': 20,
+                    'innings': innings,
+                    'run_rate': round(score / target_over, 2),
+                    'target': target,
+                    'runs_needed': max(0, runs_needed) if innings == 2 else 0,
+                    'wickets_remaining': int(10 - wickets),
+                    'required_run_rate': round(required_rr, 2) if innings == 2 else 0.0,
+                    'team_won': team_won,
+                    'innings_total': int(inning_rows['total_runs'].sum())
+                })
+    return pd.DataFrame(training_data)
+
+
+if not os.path.exists(deliveries_path):
+    print(f"❌ {deliveries_path} not found (run from BackEnd/ with the IPL dataset extracted)")
+    sys.exit(1)
+
+print("\n📂 Loading IPL dataset...")
+matches = pd.read_csv(matches_path)
+deliveries = pd.read_csv(deliveries_path)
+print(f"✅ {len(matches)} matches, {len(deliveries)} deliveries")
+
+failures = 0
+for label, frame in [('is_wicket column', deliveries),
+                     ('player_dismissed fallback', deliveries.drop(columns=['is_wicket']))]:
+    print(f"\n🔄 {label}")
+    start = time.perf_counter()
+    legacy = legacy_training_data(matches, frame)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized, _, _ = build_training_data(matches, frame)
+    vectorized_time = time.perf_counter() - start
+
+    identical = (legacy.to_csv(index=False) == vectorized.to_csv(index=False))
+    failures += not identical
+    print(f"   Per-match loop:  {legacy_time:8.2f}s  ({len(legacy)} rows)")
+    print(f"   groupby/cumsum:  {vectorized_time:8.2f}s  ({len(vectorized)} rows)")
+    print(f"   Speedup: {legacy_time / vectorized_time:.0f}x   "
+          f"{'✅ identical CSV output' if identical else '❌ OUTPUT DIFFERS'}")
+
+print("\n" + "=" * 70)
+if failures:
+    print("❌ VECTORIZED GENERATOR DOES NOT MATCH THE LOOP")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ VECTORIZED GENERATOR MATCHES THE LOOP")
+print("=" * 70)
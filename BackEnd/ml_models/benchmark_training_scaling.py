@@ -0,0 +1,127 @@
+"""
+Fit-time scaling of the four trainers' models with the thread count.
+
+    python ml_models/benchmark_training_scaling.py
+    python ml_models/benchmark_training_scaling.py --cores 1,2,4 --upsample 10
+    python ml_models/benchmark_training_scaling.py --models xgb_win,rf_win
+
+Every model is fitted with the same hyperparameters as its training script
+(plus training_config.py) at each thread count. The data is the training
+set and a copy upsampled ``--upsample`` times (rows drawn with replacement),
+which stands in for ball-by-ball data. xgb_win_exact is the XGBoost win
+model with tree_method='exact', the pre-hist baseline.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dataset import load_training_data
+from training_config import available_cores, rf_training_params, xgb_training_params
+
+warnings.filterwarnings('ignore')
+
+WIN_FEATURES = [
+    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
+    'innings', 'target', 'runs_needed', 'wickets_remaining', 'required_run_rate'
+]
+SCORE_FEATURES = [
+    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
+    'wickets_remaining', 'total_overs'
+]
+
+
+# name -> (builder(n_jobs), win or score task); hyperparameters as in the training scripts
+MODELS = {
+    'xgb_win': (lambda n_jobs: xgb.XGBClassifier(
+        n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42,
+        eval_metric='logloss', **xgb_training_params(n_jobs)), 'win'),
+    'xgb_win_exact': (lambda n_jobs: xgb.XGBClassifier(
+        n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42,
+        eval_metric='logloss', **dict(xgb_training_params(n_jobs), tree_method='exact')), 'win'),
+    'rf_win': (lambda n_jobs: RandomForestClassifier(
+        n_estimators=100, max_depth=10, min_samples_split=5, min_samples_leaf=2,
+        random_state=42, **rf_training_params(n_jobs)), 'win'),
+    'xgb_score': (lambda n_jobs: xgb.XGBRegressor(
+        n_estimators=150, max_depth=8, learning_rate=0.1, random_state=42,
+        objective='reg:squarederror', **xgb_training_params(n_jobs)), 'score'),
+    'rf_score': (lambda n_jobs: RandomForestRegressor(
+        n_estimators=150, max_depth=12, min_samples_split=5, min_samples_leaf=2,
+        random_state=42, **rf_training_params(n_jobs)), 'score'),
+}
+
+
+def task_data(df):
+    """{'win': (X, y), 'score': (X, y)} as the trainers build them"""
+    innings1 = df[df['innings'] == 1]
+    score_target = 'innings_total' if 'innings_total' in df.columns else 'final_score'
+    return {
+        'win': (df[WIN_FEATURES].to_numpy(np.float32), df['team_won'].to_numpy()),
+        'score': (innings1[SCORE_FEATURES].to_numpy(np.float32), innings1[score_target].to_numpy(np.float32)),
+    }
+
+
+def upsample(df, factor, seed=42):
+    return df.sample(n=len(df) * factor, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def fit_time(name, n_jobs, X, y):
+    builder, _ = MODELS[name]
+    model = builder(n_jobs)
+    start = time.perf_counter()
+    model.fit(X, y)
+    return time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Trainer fit time vs thread count')
+    parser.add_argument('--cores', default='1,2,4,8', help='thread counts (default 1,2,4,8)')
+    parser.add_argument('--upsample', type=int, default=30, help='upsampling factor (0 to skip)')
+    parser.add_argument('--models', default=','.join(MODELS), help=f"subset of {', '.join(MODELS)}")
+    args = parser.parse_args()
+    args.cores = [int(c) for c in args.cores.split(',')]
+    args.models = [m for m in args.models.split(',') if m]
+    unknown = [m for m in args.models if m not in MODELS]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("⏱️  TRAINING SCALING BENCHMARK: fit time vs threads")
+    print("=" * 70)
+
+    cores = available_cores()
+    print(f"\n🖥️  Cores available: {cores}")
+    if max(args.cores) > cores:
+        print(f"⚠️ Thread counts above {cores} share the same cores (expect no further speedup)")
+
+    df = load_training_data()
+    datasets = [('training data', df)]
+    if args.upsample > 1:
+        datasets.append((f'{args.upsample}x upsampled', upsample(df, args.upsample)))
+
+    for label, data in datasets:
+        tasks = task_data(data)
+        print(f"\n📂 {label}: {len(data):,} rows "
+              f"(win {len(tasks['win'][1]):,} / score {len(tasks['score'][1]):,})")
+        header = ''.join(f"{f'{c} thr':>10}" for c in args.cores)
+        print(f"   {'Model':<15}{header}{'speedup':>10}")
+        for name in args.models:
+            X, y = tasks[MODELS[name][1]]
+            times = [fit_time(name, n_jobs, X, y) for n_jobs in args.cores]
+            cells = ''.join(f"{t:9.2f}s" for t in times)
+            print(f"   {name:<15}{cells}{times[0] / min(times):9.1f}x", flush=True)
+
+    print("\n" + "=" * 70)
+    print("✅ SCALING BENCHMARK COMPLETE")
+    print("=" * 70)
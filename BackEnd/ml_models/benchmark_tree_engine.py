@@ -0,0 +1,73 @@
+import os
+import pickle
+import time
+import warnings
+
+import numpy as np
+
+from tree_engine import compile_model
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("⏱️  TREE ENGINE BENCHMARK: native predict vs compiled NumPy backend")
+print("=" * 70)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 300))
+BATCH_SIZES = [1, 10, 100, 1000]
+
+rng = np.random.default_rng(0)
+X_win = np.column_stack([
+    rng.integers(0, 250, 1000), rng.integers(0, 11, 1000), rng.integers(0, 201, 1000) / 10,
+    rng.uniform(0, 15, 1000).round(2), rng.integers(1, 3, 1000), rng.integers(0, 250, 1000),
+    rng.integers(0, 200, 1000), rng.integers(0, 11, 1000), rng.uniform(0, 20, 1000).round(2),
+]).astype(np.float32)
+X_score = np.column_stack([X_win[:, [0, 1, 2, 3, 7]], np.full(1000, 20)]).astype(np.float32)
+
+
+def latency_ms(fn, X):
+    for _ in range(10):  # warm-up
+        fn(X)
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+for filename, X, method in [
+    ('model_xgb.pkl', X_win, 'predict_proba'),
+    ('model_rf.pkl', X_win, 'predict_proba'),
+    ('model_score_xgb.pkl', X_score, 'predict'),
+    ('model_score_rf.pkl', X_score, 'predict'),
+]:
+    path = os.path.join(MODELS_DIR, filename)
+    if not os.path.exists(path):
+        print(f"\n⚠️  {filename} not found, skipping")
+        continue
+
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+    start = time.perf_counter()
+    compiled = compile_model(model)
+    compile_time = time.perf_counter() - start
+
+    print(f"\n📦 {filename} (compiled in {compile_time * 1000:.0f} ms)")
+    print(f"   {'Batch':>6} {'Native p50':>12} {'Compiled p50':>13} "
+          f"{'Native rows/s':>14} {'Compiled rows/s':>16} {'Speedup':>8}")
+
+    for batch_size in BATCH_SIZES:
+        batch = X[:batch_size]
+        native = latency_ms(getattr(model, method), batch)
+        fast = latency_ms(getattr(compiled, method), batch)
+        native_p50 = np.percentile(native, 50)
+        fast_p50 = np.percentile(fast, 50)
+        print(f"   {batch_size:>6} {native_p50:>10.3f}ms {fast_p50:>11.3f}ms "
+              f"{batch_size / native.mean() * 1000:>14.0f} {batch_size / fast.mean() * 1000:>16.0f} "
+              f"{native_p50 / fast_p50:>7.1f}x")
+
+print("\n" + "=" * 70)
+print("💡 Enable per model with INFERENCE_BACKEND_<XGB|RF|SCORE_XGB|SCORE_RF>=compiled")
+print("=" * 70)
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+print("=" * 70)
+print("⏱️  PREDICTION BRIDGE BENCHMARK: spawn-per-request vs persistent worker")
+print("=" * 70)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PREDICT_SCRIPT = os.path.join(SCRIPT_DIR, 'predict.py')
+
+SPAWN_REQUESTS = int(os.environ.get('BENCH_SPAWN_REQUESTS', 10))
+WORKER_REQUESTS = int(os.environ.get('BENCH_WORKER_REQUESTS', 500))
+
+match_data = {
+    "teamA": {"_id": "team1", "name": "Team A"},
+    "teamB": {"_id": "team2", "name": "Team B"},
+    "currentInnings": 1,
+    "totalOvers": 20,
+    "innings": [{
+        "score": 85,
+        "wickets": 3,
+        "overs": 12,
+        "battingTeam": {"_id": "team1"}
+    }]
+}
+payload = json.dumps(match_data) + "\n"
+
+
+def summarize(name, timings):
+    timings_ms = np.array(timings) * 1000
+    total = sum(timings)
+    print(f"\n📊 {name} ({len(timings)} requests)")
+    print(f"   Mean: {timings_ms.mean():.2f} ms")
+    print(f"   p50:  {np.percentile(timings_ms, 50):.2f} ms")
+    print(f"   p95:  {np.percentile(timings_ms, 95):.2f} ms")
+    print(f"   Throughput: {len(timings) / total:.1f} req/s")
+    return timings_ms.mean()
+
+
+# === Mode 1: one Python process per request (old bridge) ===
+print(f"\n🐍 Spawning predict.py {SPAWN_REQUESTS} times...")
+spawn_timings = []
+for _ in range(SPAWN_REQUESTS):
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, PREDICT_SCRIPT],
+        input=payload, capture_output=True, text=True, cwd=SCRIPT_DIR
+    )
+    spawn_timings.append(time.perf_counter() - start)
+    if completed.returncode != 0:
+        print(f"❌ predict.py failed: {completed.stdout}{completed.stderr}")
+        sys.exit(1)
+
+# === Mode 2: persistent worker ===
+print(f"\n🔁 Starting persistent worker for {WORKER_REQUESTS} requests...")
+start = time.perf_counter()
+worker = subprocess.Popen(
+    [sys.executable, PREDICT_SCRIPT, '--worker'],
+    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    text=True, bufsize=1, cwd=SCRIPT_DIR
+)
+ready = json.loads(worker.stdout.readline())
+startup_time = time.perf_counter() - start
+print(f"✅ Worker ready in {startup_time * 1000:.0f} ms ({ready['model']})")
+
+worker_timings = []
+for request_id in range(WORKER_REQUESTS):
+    start = time.perf_counter()
+    worker.stdin.write(json.dumps({"id": request_id, "matchData": match_data}) + "\n")
+    worker.stdin.flush()
+    result = json.loads(worker.stdout.readline())
+    worker_timings.append(time.perf_counter() - start)
+    if result.get('id') != request_id or not result.get('success'):
+        print(f"❌ Unexpected worker response: {result}")
+        sys.exit(1)
+
+worker.stdin.close()
+worker.wait()
+
+spawn_mean = summarize("Spawn per request", spawn_timings)
+worker_mean = summarize("Persistent worker", worker_timings)
+
+print("\n" + "=" * 70)
+print(f"🚀 Persistent worker is {spawn_mean / worker_mean:.0f}x faster per request")
+print(f"   (one-time worker startup: {startup_time * 1000:.0f} ms)")
+print("=" * 70)
@@ -0,0 +1,141 @@
+import json
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from features import win_feature_matrix_from_arrays
+from win_table import (BALLS_PER_INNINGS, QUANT_MISSING, QUANT_SCALE, TABLE_DIR_NAME,
+                       file_sha256, overs_grid)
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("📋 BUILDING WIN-PROBABILITY LOOKUP TABLE (XGBoost)")
+print("=" * 70)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(SCRIPT_DIR, 'models', 'model_xgb.pkl')
+OUTPUT_DIR = os.environ.get('WIN_TABLE_DIR', os.path.join(SCRIPT_DIR, 'models', TABLE_DIR_NAME))
+
+# Grid (override with environment variables for a bigger/smaller table)
+MAX_SCORE = int(os.environ.get('WIN_TABLE_MAX_SCORE', 300))
+TARGET_MIN = int(os.environ.get('WIN_TABLE_TARGET_MIN', 120))
+TARGET_MAX = int(os.environ.get('WIN_TABLE_TARGET_MAX', 220))
+# Step 1 keeps second-innings lookups exact; larger steps are interpolated (approximate)
+TARGET_STEP = int(os.environ.get('WIN_TABLE_TARGET_STEP', 1))
+MAX_RUNS_NEEDED = TARGET_MAX + 1
+CHUNK_ROWS = 1_000_000
+
+if not os.path.exists(MODEL_PATH):
+    print(f"❌ Model not found: {MODEL_PATH}")
+    print("💡 Solution: Run 'python ml_models/train_model.py' first")
+    sys.exit(1)
+
+with open(MODEL_PATH, 'rb') as f:
+    model = pickle.load(f)
+print(f"✅ Loaded model: {MODEL_PATH}")
+
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+overs = overs_grid()
+wickets = np.arange(11)
+targets = np.arange(TARGET_MIN, TARGET_MAX + 1, TARGET_STEP)
+
+
+def evaluate_grid(shape, state_for_indices, output_path, quantize=False):
+    """Evaluate the model over every cell of ``shape`` in chunks, writing a .npy memmap"""
+    dtype = np.uint16 if quantize else np.float32
+    table = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype, shape=shape)
+    flat = table.reshape(-1)
+    total = flat.size
+    for start in range(0, total, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, total)
+        indices = np.unravel_index(np.arange(start, stop), shape)
+        state, valid = state_for_indices(indices)
+        values = np.full(stop - start, QUANT_MISSING if quantize else np.nan, dtype=dtype)
+        if valid.any():
+            X = win_feature_matrix_from_arrays(**{k: v[valid] for k, v in state.items()})
+            win = model.predict_proba(X)[:, 1]
+            values[valid] = np.rint(win * QUANT_SCALE) if quantize else win
+        flat[start:stop] = values
+        print(f"   Progress: {stop:,}/{total:,} states")
+    table.flush()
+    return table
+
+
+# === Innings 1: [score, wickets, ball] ===
+print(f"\n🏏 Innings 1 grid: score 0-{MAX_SCORE}, wickets 0-10, {BALLS_PER_INNINGS + 1} ball positions")
+start_time = time.time()
+
+
+def innings1_state(indices):
+    score, wicket, ball = indices
+    n = len(score)
+    state = {
+        'current_score': score.astype(np.float64),
+        'wickets_lost': wickets[wicket].astype(np.float64),
+        'overs_played': overs[ball],
+        'innings': np.ones(n),
+        'target': np.zeros(n),
+        'runs_needed': np.zeros(n),
+    }
+    return state, np.ones(n, dtype=bool)
+
+
+evaluate_grid((MAX_SCORE + 1, 11, BALLS_PER_INNINGS + 1), innings1_state,
+              os.path.join(OUTPUT_DIR, 'innings1.npy'))
+print(f"✅ Innings 1 done in {time.time() - start_time:.1f}s")
+
+# === Innings 2: [target, runs_needed, offset, wickets, ball] ===
+print(f"\n🏏 Innings 2 grid: targets {TARGET_MIN}-{TARGET_MAX} step {TARGET_STEP}, "
+      f"runs needed 0-{MAX_RUNS_NEEDED}, wickets 0-10, {BALLS_PER_INNINGS + 1} ball positions")
+start_time = time.time()
+
+
+def innings2_state(indices):
+    target_idx, runs_needed, offset, wicket, ball = indices
+    target = targets[target_idx].astype(np.float64)
+    runs = runs_needed.astype(np.float64)
+    score = target - runs + offset
+    n = len(target)
+    state = {
+        'current_score': score,
+        'wickets_lost': wickets[wicket].astype(np.float64),
+        'overs_played': overs[ball],
+        'innings': np.full(n, 2.0),
+        'target': target,
+        'runs_needed': runs,
+    }
+    # Unreachable cells (negative score) stay empty and fall back to the live model
+    return state, score >= 0
+
+
+evaluate_grid((len(targets), MAX_RUNS_NEEDED + 1, 2, 11, BALLS_PER_INNINGS + 1), innings2_state,
+              os.path.join(OUTPUT_DIR, 'innings2.npy'), quantize=True)
+print(f"✅ Innings 2 done in {time.time() - start_time:.1f}s")
+
+meta = {
+    'model': os.path.basename(MODEL_PATH),
+    'model_sha256': file_sha256(MODEL_PATH),
+    'max_score': MAX_SCORE,
+    'target_min': TARGET_MIN,
+    'target_max': int(targets[-1]),
+    'target_step': TARGET_STEP,
+    'max_runs_needed': MAX_RUNS_NEEDED,
+    'innings2_scale': QUANT_SCALE,
+    'built_at': time.strftime('%Y-%m-%d %H:%M:%S')
+}
+with open(os.path.join(OUTPUT_DIR, 'meta.json'), 'w') as f:
+    json.dump(meta, f, indent=2)
+
+size_mb = sum(os.path.getsize(os.path.join(OUTPUT_DIR, name))
+              for name in ('innings1.npy', 'innings2.npy')) / 1024 / 1024
+print(f"\n💾 Table saved: {OUTPUT_DIR} ({size_mb:.1f} MB)")
+
+print("\n" + "=" * 70)
+print("✅ WIN TABLE BUILD COMPLETE!")
+print("=" * 70)
+print("\n🎯 Restart app.py to serve win probabilities from the table (WIN_TABLE=off to disable)")
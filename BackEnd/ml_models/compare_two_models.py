@@ -4,16 +4,18 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import (accuracy_score, precision_score, recall_score, 
                             f1_score, roc_auc_score, confusion_matrix)
 import pickle
-import time
 from datetime import datetime
 
+from benchmark_models import BATCH_SIZES, latency_stats, throughput
+from dataset import load_training_data
+
 print("=" * 80)
 print("🏆 MODEL COMPARISON: XGBoost vs Random Forest")
 print("=" * 80)
 
 # Load data
 print("\n📂 Loading training data...")
-df = pd.read_csv('data/training_data_ipl.csv')
+df = load_training_data('data/training_data_ipl.csv')
 print(f"✅ Loaded {len(df)} samples")
 
 # Prepare features
@@ -52,11 +54,13 @@ results = {}
 for model_name, model in [('XGBoost', model_xgb), ('Random Forest', model_rf)]:
     print(f"\n🔍 Evaluating {model_name}...")
     
-    # Prediction time
-    start_time = time.time()
     y_pred = model.predict(X_test)
     y_pred_proba = model.predict_proba(X_test)[:, 1]
-    pred_time = time.time() - start_time
+    
+    # Single-row latency (as the APIs predict) and batched throughput
+    X_test_rows = X_test.to_numpy(np.float32)
+    latency = latency_stats(model, X_test_rows)
+    rows_per_second = throughput(model, X_test_rows)
     
     # Calculate metrics
     accuracy = accuracy_score(y_test, y_pred)
@@ -81,7 +85,8 @@ for model_name, model in [('XGBoost', model_xgb), ('Random Forest', model_rf)]:
         'recall': recall,
         'f1_score': f1,
         'roc_auc': roc_auc,
-        'pred_time': pred_time,
+        'latency': latency,
+        'throughput': rows_per_second,
         'confusion_matrix': cm,
         'feature_importance': feature_imp
     }
@@ -115,13 +120,30 @@ print("─" * 80)
 print(f"{'Metric':<20} {'XGBoost':<15} {'Random Forest':<15} {'Winner':<15}")
 print("─" * 80)
 
-xgb_time = results['XGBoost']['pred_time']
-rf_time = results['Random Forest']['pred_time']
-time_winner = 'XGBoost ✓' if xgb_time < rf_time else 'Random Forest ✓'
-
-print(f"{'Prediction Time':<20} {xgb_time:.4f}s{'':>7} {rf_time:.4f}s{'':>7} {time_winner:<15}")
+def faster(xgb_val, rf_val, lower_is_better=True):
+    if xgb_val == rf_val:
+        return 'Tie'
+    return 'XGBoost ✓' if (xgb_val < rf_val) == lower_is_better else 'Random Forest ✓'
+
+speed_rows = []
+for percentile in ['p50', 'p95', 'p99']:
+    xgb_val = results['XGBoost']['latency'][percentile]
+    rf_val = results['Random Forest']['latency'][percentile]
+    speed_rows.append((f'Latency {percentile}', f'{xgb_val:.3f} ms', f'{rf_val:.3f} ms', faster(xgb_val, rf_val)))
+for size in BATCH_SIZES:
+    xgb_val = results['XGBoost']['throughput'][str(size)]
+    rf_val = results['Random Forest']['throughput'][str(size)]
+    speed_rows.append((f'Rows/s (batch {size})', f'{xgb_val:,.0f}', f'{rf_val:,.0f}',
+                       faster(xgb_val, rf_val, lower_is_better=False)))
+
+for label, xgb_val, rf_val, winner_str in speed_rows:
+    print(f"{label:<20} {xgb_val:<15} {rf_val:<15} {winner_str:<15}")
 print("─" * 80)
 
+# Typical single-row latency decides speed ties below
+xgb_time = results['XGBoost']['latency']['p50']
+rf_time = results['Random Forest']['latency']['p50']
+
 # Confusion matrices
 print("\n🔢 CONFUSION MATRICES")
 print("\n📦 XGBoost:")
@@ -224,7 +246,10 @@ with open(report_file, 'w', encoding='utf-8') as f:
     f.write("\n" + "=" * 80 + "\n")
     f.write("SPEED METRICS\n")
     f.write("=" * 80 + "\n")
-    f.write(f"Prediction Time: XGBoost={xgb_time:.4f}s, Random Forest={rf_time:.4f}s\n")
+    f.write(f"{'Metric':<20} {'XGBoost':<15} {'Random Forest':<15} {'Winner':<15}\n")
+    f.write("-" * 80 + "\n")
+    for label, xgb_val, rf_val, winner_str in speed_rows:
+        f.write(f"{label:<20} {xgb_val:<15} {rf_val:<15} {winner_str:<15}\n")
     
     f.write("\n" + "=" * 80 + "\n")
     f.write("FINAL VERDICT\n")
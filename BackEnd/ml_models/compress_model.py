@@ -0,0 +1,147 @@
+"""
+Compress a trained win/score model and report what it costs and saves.
+
+    python ml_models/compress_model.py rf --trees 30
+    python ml_models/compress_model.py rf --max-depth 6
+    python ml_models/compress_model.py xgb --trees 50 --max-depth 4
+    python ml_models/compress_model.py score_rf --distill --student-trees 60 --student-depth 3
+
+The model is read from ml_models/models/<model file> (or --input). The
+compressed copy is written next to it as <model file>_compressed.pkl (or
+--output). Accuracy (win) or MAE (score), single-row latency and full-batch
+time are compared on the test split of compare_two_models.py and the
+trainers (80/20, random_state=42).
+
+Serve the compressed variant with MODEL_VARIANT=compressed (every model) or
+MODEL_VARIANT_<XGB|RF|SCORE_XGB|SCORE_RF>=compressed (see model_registry.py).
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dataset import load_training_data
+from model_compression import distill, drop_trees, limit_depth, max_tree_depth, node_count, tree_count
+from model_registry import MODEL_SPECS, MODELS_DIR, variant_filename
+from training_config import for_serving
+from tune_models import SEARCH, quality, single_row_latency_ms, task_splits
+
+warnings.filterwarnings('ignore')
+
+
+def batch_time_ms(model, X, repeats=5):
+    predict = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def describe(model, task, X_test, y_test):
+    return {
+        'metric': quality(task, y_test, model.predict(X_test)),
+        'latency_ms': single_row_latency_ms(model, X_test),
+        'batch_ms': batch_time_ms(model, X_test),
+        'trees': tree_count(model),
+        'nodes': node_count(model),
+        'depth': max_tree_depth(model),
+        'size_kb': len(pickle.dumps(model)) / 1024
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compress a trained tree ensemble')
+    parser.add_argument('model', choices=list(MODEL_SPECS), help='registry key of the model')
+    parser.add_argument('--input', help='model pickle (default: ml_models/models/<model file>)')
+    parser.add_argument('--output', help='compressed pickle (default: <model file>_compressed.pkl)')
+    parser.add_argument('--trees', type=int, help='keep the first N trees / boosting rounds')
+    parser.add_argument('--max-depth', type=int, help='cut every tree at this depth')
+    parser.add_argument('--distill', action='store_true', help='fit a shallow XGBoost student instead')
+    parser.add_argument('--student-trees', type=int, default=60)
+    parser.add_argument('--student-depth', type=int, default=3)
+    parser.add_argument('--student-learning-rate', type=float, default=0.2)
+    args = parser.parse_args()
+    if not (args.trees or args.max_depth or args.distill):
+        parser.error('choose at least one of --trees, --max-depth, --distill')
+    if args.distill and (args.trees or args.max_depth):
+        parser.error('--distill replaces the model; use --student-trees / --student-depth')
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    spec = MODEL_SPECS[args.model]
+    task = SEARCH[args.model]['task']
+    input_path = args.input or os.path.join(MODELS_DIR, spec.filename)
+    output_path = args.output or os.path.join(MODELS_DIR, variant_filename(spec.filename, 'compressed'))
+
+    print("=" * 70)
+    print(f"🗜️  MODEL COMPRESSION: {spec.name}")
+    print("=" * 70)
+
+    if not os.path.exists(input_path):
+        print(f"❌ {input_path} not found")
+        print(f"💡 Solution: Run 'python ml_models/{spec.train_script}'")
+        sys.exit(1)
+    with open(input_path, 'rb') as f:
+        model = for_serving(pickle.load(f))
+    print(f"\n📂 Loaded {type(model).__name__} from {input_path}")
+
+    splits = task_splits(load_training_data(), task)
+    X_train, y_train = splits['train']
+    X_test, y_test = splits['test']
+
+    start = time.perf_counter()
+    if args.distill:
+        print(f"🔄 Distilling into XGBoost ({args.student_trees} trees, depth {args.student_depth})...")
+        compressed = distill(model, X_train, args.student_trees, args.student_depth,
+                             args.student_learning_rate)
+    else:
+        compressed = model
+        if args.trees:
+            print(f"🔄 Keeping the first {args.trees} trees...")
+            compressed = drop_trees(compressed, args.trees)
+        if args.max_depth:
+            print(f"🔄 Cutting trees at depth {args.max_depth}...")
+            compressed = limit_depth(compressed, args.max_depth, X_train, y_train)
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
+
+    print(f"\n📊 Test split ({len(y_test)} rows):")
+    before = describe(model, task, X_test, y_test)
+    after = describe(compressed, task, X_test, y_test)
+    metric_name = 'Accuracy' if task == 'win' else 'MAE (runs)'
+    rows = [
+        (metric_name, 'metric', '{:.4f}'),
+        ('Latency (1 row)', 'latency_ms', '{:.3f} ms'),
+        (f'Batch ({len(y_test)} rows)', 'batch_ms', '{:.1f} ms'),
+        ('Trees', 'trees', '{}'),
+        ('Nodes', 'nodes', '{:,}'),
+        ('Max depth', 'depth', '{}'),
+        ('Pickle size', 'size_kb', '{:.0f} KB'),
+    ]
+    print(f"   {'':<22} {'Original':>14} {'Compressed':>14}")
+    print("   " + "-" * 52)
+    for label, field, fmt in rows:
+        print(f"   {label:<22} {fmt.format(before[field]):>14} {fmt.format(after[field]):>14}")
+
+    change = after['metric'] - before['metric']
+    if task == 'win':
+        print(f"\n   Accuracy change: {change * 100:+.2f} percentage points")
+    else:
+        print(f"\n   MAE change: {change:+.2f} runs")
+    print(f"   Single-row speedup: {before['latency_ms'] / after['latency_ms']:.1f}x, "
+          f"batch speedup: {before['batch_ms'] / after['batch_ms']:.1f}x")
+
+    with open(output_path, 'wb') as f:
+        pickle.dump(compressed, f)
+    print(f"\n💾 Compressed model saved: {output_path}")
+    print(f"💡 Serve it with MODEL_VARIANT_{args.model.upper()}=compressed")
+
+    print("\n" + "=" * 70)
+    print("✅ COMPRESSION COMPLETE!")
+    print("=" * 70)
@@ -0,0 +1,256 @@
+"""
+Cached, typed loader for the training data.
+
+The training and evaluation scripts used to re-parse data/training_data_ipl.csv
+with pandas' default int64/float64 columns every time. ``load_training_data()``
+parses the source once. It writes every column as a compact .npy file
+(int8/int16/int32 for integers, float32 for floats) into a cache directory
+next to the source:
+
+    data/.cache/training_data_ipl.csv/
+        meta.json              source size / mtime / sha256, rows, dtypes, build
+        .lock
+        <build>/current_score.npy
+        ...
+
+Later loads memory-map those files instead of parsing text. XGBoost and
+scikit-learn trees convert features to float32 anyway, so the trained
+models are unchanged. The cache is rebuilt when the source changes: a
+different size, or a different mtime whose sha256 also differs. If only
+the mtime changed (same sha256), the cache is reused and its recorded
+mtime is updated.
+
+Each build writes its columns into a new <build> directory and then
+switches meta.json to it with an atomic rename, so a .npy file another
+process has memory-mapped is never rewritten. Validating, building and
+mapping happen under an exclusive lock on .lock (fcntl; without it, as on
+Windows, concurrent builds are still safe but may parse the source twice),
+so processes starting together build the cache once. ``python
+ml_models/dataset.py`` builds it ahead of time (the pipeline's cache stage).
+
+Parquet and Feather sources (generate_training_data.py --output ...) are
+read with pandas and cached the same way.
+
+Set DATASET_CACHE=off to always read the source file.
+"""
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from win_table import file_sha256
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CACHE_DIR_NAME = '.cache'
+CACHE_VERSION = 2
+
+# Where the scripts have historically looked for the training data
+TRAINING_DATA_PATHS = [
+    'data/training_data_ipl.csv',
+    '../data/training_data_ipl.csv',
+    './training_data_ipl.csv',
+    'ml_models/data/training_data_ipl.csv'
+]
+
+
+def find_training_data(paths=TRAINING_DATA_PATHS):
+    """First existing path in ``paths`` (None if there is none)"""
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_source(path):
+    """Parse the source file with pandas (CSV, Parquet or Feather)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    if extension in ('.feather', '.arrow'):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def compact_dtype(values):
+    """Smallest dtype that holds ``values`` exactly (floats become float32)"""
+    if values.dtype.kind == 'b':
+        return np.dtype(np.int8)
+    if values.dtype.kind in 'iu':
+        low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return np.dtype(dtype)
+        return np.dtype(np.int64)
+    if values.dtype.kind == 'f':
+        return np.dtype(np.float32)
+    return None
+
+
+def cache_dir_for(path):
+    source = os.path.abspath(path)
+    return os.path.join(os.path.dirname(source), CACHE_DIR_NAME, os.path.basename(source))
+
+
+class DatasetCache:
+    """Per-column .npy cache of one source file"""
+
+    def __init__(self, source):
+        self.source = source
+        self.directory = cache_dir_for(source)
+        self.meta_path = os.path.join(self.directory, 'meta.json')
+        self.lock_path = os.path.join(self.directory, '.lock')
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Exclusive lock across processes while validating, building and mapping"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_meta(self):
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_valid(self):
+        """True if the cache was built from the current source contents"""
+        meta = self.read_meta()
+        if not meta or meta.get('version') != CACHE_VERSION:
+            return False
+        if not os.path.isdir(os.path.join(self.directory, meta['build'])):
+            return False
+        stat = os.stat(self.source)
+        if meta['source_size'] != stat.st_size:
+            return False
+        if meta['source_mtime_ns'] == stat.st_mtime_ns:
+            return True
+        # Touched or copied but maybe unchanged: fall back to the content hash
+        if meta['source_sha256'] != file_sha256(self.source):
+            return False
+        meta['source_mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(meta)
+        return True
+
+    def build(self, df):
+        """Write ``df`` as typed columns; False if a column can't be cached"""
+        dtypes = {}
+        for name in df.columns:
+            values = df[name].to_numpy()
+            dtype = compact_dtype(values)
+            if dtype is None:
+                print(f"⚠️ Column '{name}' ({values.dtype}) can't be cached, reading {self.source} directly")
+                return False
+            dtypes[name] = dtype
+
+        # Columns go into a new directory; meta.json switches to it atomically
+        os.makedirs(self.directory, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix='build-', dir=self.directory)
+        build = os.path.basename(build_dir)
+        for name, dtype in dtypes.items():
+            np.save(os.path.join(build_dir, f'{name}.npy'), df[name].to_numpy().astype(dtype))
+
+        stat = os.stat(self.source)
+        self._write_meta({
+            'version': CACHE_VERSION,
+            'source': os.path.basename(self.source),
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_sha256': file_sha256(self.source),
+            'rows': len(df),
+            'build': build,
+            'columns': {name: dtype.name for name, dtype in dtypes.items()}
+        })
+        self._remove_old_builds(build)
+        return True
+
+    def _remove_old_builds(self, keep):
+        """Delete earlier builds; processes that mapped them keep their pages (POSIX)"""
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            if entry == keep or entry in ('meta.json', '.lock'):
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif entry.endswith('.npy') or entry.endswith('.tmp'):
+                # Version 1 wrote columns (and meta.json.tmp) next to meta.json
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+    def load(self, columns=None):
+        """Memory-mapped columns as a DataFrame (copy-on-write pages, no text parsing)"""
+        meta = self.read_meta()
+        names = columns or list(meta['columns'])
+        missing = [name for name in names if name not in meta['columns']]
+        if missing:
+            raise KeyError(f"Columns not in {self.source}: {missing}")
+        data = {name: np.load(self._column_path(meta['build'], name), mmap_mode='c')
+                for name in names}
+        return pd.DataFrame(data, columns=names, copy=False)
+
+    def _column_path(self, build, name):
+        return os.path.join(self.directory, build, f'{name}.npy')
+
+    def _write_meta(self, meta):
+        tmp_path = f'{self.meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, self.meta_path)
+
+
+def load_training_data(path=None, columns=None, cache=True):
+    """
+    Training data as a DataFrame with compact dtypes.
+
+    ``path`` defaults to the first existing TRAINING_DATA_PATHS entry.
+    ``columns`` limits which columns are loaded. With ``cache=False`` (or
+    DATASET_CACHE=off) the source is parsed with pandas' default dtypes.
+    Raises FileNotFoundError when there is no training data.
+    """
+    path = path or find_training_data()
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(path or 'training_data_ipl.csv')
+
+    if not cache or os.environ.get('DATASET_CACHE', 'on').lower() == 'off':
+        df = read_source(path)
+        return df[columns] if columns else df
+
+    dataset_cache = DatasetCache(path)
+    with dataset_cache.locked():
+        if not dataset_cache.is_valid():
+            df = read_source(path)
+            if not dataset_cache.build(df):
+                return df[columns] if columns else df
+        return dataset_cache.load(columns)
+
+
+if __name__ == '__main__':
+    # Build (or check) the cache once, before several training scripts start at the same time
+    print("=" * 70)
+    print("📦 WARMING THE TRAINING DATA CACHE")
+    print("=" * 70)
+    source = sys.argv[1] if len(sys.argv) > 1 else find_training_data()
+    try:
+        df = load_training_data(source)
+    except FileNotFoundError as e:
+        print(f"❌ Training data not found: {e}")
+        print("💡 Solution: Run 'python ml_models/generate_training_data.py' first")
+        sys.exit(1)
+    print(f"✅ {len(df):,} rows x {len(df.columns)} columns cached in {cache_dir_for(source)}")
@@ -0,0 +1,84 @@
+"""
+Export every trained model to its native format and write models/manifest.json.
+
+    python ml_models/export_models.py
+
+XGBoost models become models/native/<name>.ubj and Random Forests
+models/native/<name>.joblib (see model_manifest.py). Every copy is loaded
+back and must give the same predictions as its pickle before it goes into
+the manifest. Re-run after retraining: the APIs ignore manifest entries
+whose pickle changed since the export.
+"""
+import json
+import os
+import pickle
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+# Imported up front so the load times below are the model files alone
+import sklearn.ensemble  # noqa: F401
+import xgboost  # noqa: F401
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from model_manifest import MANIFEST_PATH, export_model, load_native
+from model_registry import MODEL_SPECS, model_files, model_task, warmup_rows
+
+warnings.filterwarnings('ignore')
+
+
+def timed_ms(load):
+    start = time.perf_counter()
+    model = load()
+    return model, (time.perf_counter() - start) * 1000
+
+
+def predictions(model, X):
+    return model.predict_proba(X) if hasattr(model, 'predict_proba') else model.predict(X)
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("📦 EXPORTING MODELS: native formats + manifest")
+    print("=" * 70)
+
+    files = model_files()
+    if not files:
+        print("❌ No trained models found")
+        print("💡 Solution: Run 'python ml_models/pipeline.py'")
+        sys.exit(1)
+
+    entries = {}
+    for key_name, key, variant, path in files:
+        spec = MODEL_SPECS[key]
+        task = model_task(key)
+        model, pickle_ms = timed_ms(lambda: load_pickle(path))
+        entry = export_model(model, path, task)
+        entry.update(key=key, variant=variant, name=spec.name)
+
+        # The exported copy must predict exactly what the pickle does
+        native, native_ms = timed_ms(lambda: load_native(entry))
+        X = warmup_rows(key, 256)
+        if not np.allclose(predictions(model, X), predictions(native, X), rtol=0, atol=1e-6):
+            print(f"❌ {key_name}: {os.path.basename(entry['path'])} predicts differently, not exported")
+            continue
+
+        entries[key_name] = entry
+        print(f"✅ {key_name}: {os.path.basename(entry['path'])} ({entry['format']}, "
+              f"{entry['size_bytes'] / 1024:.0f} KB) load {native_ms:.1f} ms vs pickle {pickle_ms:.1f} ms")
+
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump({'generated': datetime.now().isoformat(timespec='seconds'), 'models': entries},
+                  f, indent=2)
+    print(f"\n💾 Manifest saved: {MANIFEST_PATH} ({len(entries)} models)")
+
+    print("\n" + "=" * 70)
+    print("✅ EXPORT COMPLETE!")
+    print("=" * 70)
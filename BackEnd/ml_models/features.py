@@ -0,0 +1,146 @@
+"""
+Feature-vector builders shared by app.py, app_score.py and predict.py.
+
+The models are evaluated on tiny inputs (usually one row), where building a
+pandas DataFrame costs more than the model itself. These helpers write the
+features straight into float32 NumPy arrays in the fixed column order the
+models were trained with. float32 is what XGBoost and scikit-learn trees use
+internally, so predictions are identical to the old DataFrame path.
+"""
+import numpy as np
+
+# Feature columns for the win models (XGBoost + Random Forest)
+WIN_FEATURE_COLUMNS = [
+    'current_score', 'wickets_lost', 'overs_played', 'run_rate',
+    'innings', 'target', 'runs_needed', 'wickets_remaining',
+    'required_run_rate'
+]
+
+# Feature columns for the score models (XGBoost + Random Forest)
+SCORE_FEATURE_COLUMNS = [
+    'current_score', 'wickets_lost', 'overs_played',
+    'run_rate', 'wickets_remaining', 'total_overs'
+]
+
+
+def empty_row(columns):
+    """Allocate a (1, n_features) float32 row for ``columns``"""
+    return np.empty((1, len(columns)), dtype=np.float32)
+
+
+def build_win_features(data, out=None, total_overs=20, round_rates=True):
+    """
+    Win-model features for one match state as a (1, 9) float32 array.
+
+    ``data`` uses the API field names (current_score, wickets_lost,
+    overs_played, innings, target, runs_needed). app.py rounds the rates to
+    two decimals; predict.py passes ``round_rates=False`` and its own
+    ``total_overs``.
+    """
+    if out is None:
+        out = empty_row(WIN_FEATURE_COLUMNS)
+
+    current_score = data.get('current_score', 0)
+    wickets_lost = data.get('wickets_lost', 0)
+    overs_played = data.get('overs_played', 0)
+    innings = data.get('innings', 1)
+    target = data.get('target', 0)
+    runs_needed = data.get('runs_needed', 0)
+
+    run_rate = current_score / overs_played if overs_played > 0 else 0
+    overs_left = total_overs - overs_played
+    required_run_rate = runs_needed / overs_left if overs_left > 0 and innings == 2 else 0
+    if round_rates:
+        run_rate = round(run_rate, 2)
+        required_run_rate = round(required_run_rate, 2)
+
+    row = out[0]
+    row[0] = current_score
+    row[1] = wickets_lost
+    row[2] = overs_played
+    row[3] = run_rate
+    row[4] = innings
+    row[5] = target
+    row[6] = runs_needed
+    row[7] = 10 - wickets_lost
+    row[8] = required_run_rate
+    return out
+
+
+def build_win_feature_matrix(matches):
+    """Win-model features for many match states in one vectorized pass"""
+    def column(name, default):
+        return np.array([m.get(name, default) for m in matches], dtype=np.float64)
+
+    return win_feature_matrix_from_arrays(
+        current_score=column('current_score', 0),
+        wickets_lost=column('wickets_lost', 0),
+        overs_played=column('overs_played', 0),
+        innings=column('innings', 1),
+        target=column('target', 0),
+        runs_needed=column('runs_needed', 0),
+    )
+
+
+def win_feature_matrix_from_arrays(current_score, wickets_lost, overs_played,
+                                   innings, target, runs_needed, out=None):
+    """Same features as build_win_features, from equal-length float64 arrays"""
+    safe_overs = np.where(overs_played > 0, overs_played, 1)
+    run_rate = np.where(overs_played > 0, current_score / safe_overs, 0)
+    overs_left = 20 - overs_played
+    safe_overs_left = np.where(overs_left > 0, overs_left, 1)
+    required_run_rate = np.where(
+        (overs_left > 0) & (innings == 2), runs_needed / safe_overs_left, 0
+    )
+
+    if out is None:
+        out = np.empty((len(current_score), len(WIN_FEATURE_COLUMNS)), dtype=np.float32)
+    out[:, 0] = current_score
+    out[:, 1] = wickets_lost
+    out[:, 2] = overs_played
+    out[:, 3] = np.round(run_rate, 2)
+    out[:, 4] = innings
+    out[:, 5] = target
+    out[:, 6] = runs_needed
+    out[:, 7] = 10 - wickets_lost
+    out[:, 8] = np.round(required_run_rate, 2)
+    return out
+
+
+def build_score_features(data, out=None):
+    """Score-model features for one first-innings state as a (1, 6) float32 array"""
+    if out is None:
+        out = empty_row(SCORE_FEATURE_COLUMNS)
+
+    current_score = data.get('current_score', 0)
+    wickets_lost = data.get('wickets_lost', 0)
+    overs_played = data.get('overs_played', 0)
+
+    run_rate = current_score / overs_played if overs_played > 0 else 0
+
+    row = out[0]
+    row[0] = current_score
+    row[1] = wickets_lost
+    row[2] = overs_played
+    row[3] = round(run_rate, 2)
+    row[4] = 10 - wickets_lost
+    row[5] = data.get('total_overs', 20)
+    return out
+
+
+def score_features_from_win(win_features, total_overs=20, out=None):
+    """
+    Score-model row derived from a win-model row (app.py's /predict-all).
+    The shared columns (score, wickets, overs, rounded run rate, wickets
+    remaining) are copied instead of recomputed.
+    """
+    if out is None:
+        out = empty_row(SCORE_FEATURE_COLUMNS)
+    out[0, :5] = win_features[0, [0, 1, 2, 3, 7]]
+    out[0, 5] = total_overs
+    return out
+
+
+def features_to_dict(features, columns):
+    """Readable {column: value} view of a single feature row (for logging)"""
+    return {name: float(value) for name, value in zip(columns, features[0])}
@@ -0,0 +1,433 @@
+"""
+Per-ball live prediction feed over Server-Sent Events, as its own service.
+
+    python ml_models/serve.py live        # :5003 (python ml_models/live_feed.py also works)
+
+A match is registered once, the scorer pushes every ball into it, and the
+service keeps the match state. Each ball is predicted once (the /predict-all
+body) and the result is broadcast to every subscriber of that match, instead
+of every viewer posting the whole match state and running the models again.
+
+    POST   /live/matches                 register (or reset) a match:
+                                         {"match_id", "innings", "target",
+                                          "total_overs", "current_score",
+                                          "wickets_lost", "balls", "team_a_batting"}
+    POST   /live/matches/<id>/balls      one compact ball event {"r", "x", "t", "w"}
+                                         or {"e": "innings"} (match_state.py), or
+                                         {"balls": [...]} (404 if not registered)
+    GET    /live/matches/<id>            latest prediction
+    GET    /live/matches/<id>/stream     text/event-stream: "prediction" events
+                                         (the /predict-all body + match_id, seq
+                                         and state), ": heartbeat" comments, and
+                                         "end" when the match is removed
+    DELETE /live/matches/<id>            remove a match
+    GET    /live/matches                 registered matches and subscriber counts
+    GET    /health                       feed statistics
+
+A slow subscriber skips straight to the latest prediction rather than
+queueing every ball. Reconnecting clients send Last-Event-ID and don't get
+the prediction they already have again.
+
+Match state lives in this one process, so the prediction API (app.py) stays
+stateless and keeps its worker processes. The feed runs on an asyncio event
+loop: an open stream is a coroutine waiting for the next ball, not a thread,
+so the number of viewers isn't limited by a thread count. Only the model
+calls (app.py's all_predictions, one per ball) run on a small thread pool.
+
+Environment variables:
+    LIVE_FEED_TOKEN            required in X-Publish-Token for register/ball/delete
+                               (unset: publishing is open, as in development)
+    LIVE_FEED_HEARTBEAT        seconds between heartbeat comments (default 15)
+    LIVE_FEED_IDLE_TTL         seconds without a ball before a match is dropped
+                               (default 21600)
+    LIVE_FEED_PREDICT_THREADS  threads running model calls (default 2)
+"""
+import asyncio
+import contextlib
+import copy
+import hmac
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+from match_state import MatchState
+from service_logging import get_logger
+
+logger = get_logger('live_feed')
+
+DEFAULT_PORT = 5003
+DEFAULT_HEARTBEAT = 15.0
+DEFAULT_IDLE_TTL = 6 * 60 * 60
+DEFAULT_PREDICT_THREADS = 2
+# Idle keep-alive connections (the Node publisher reuses them) are closed after this
+KEEPALIVE_SECONDS = 5
+MAX_BODY_BYTES = 1 << 20
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-Publish-Token, Last-Event-ID',
+}
+
+
+def sse_message(event, data, event_id=None):
+    """One SSE frame; ``data`` is already JSON"""
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines += [f'event: {event}', f'data: {data}']
+    return '\n'.join(lines) + '\n\n'
+
+
+class Request:
+    """One parsed HTTP/1.1 request"""
+
+    def __init__(self, method, path, headers, body):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """Body as JSON ({} when empty); ValueError if it isn't"""
+        return json.loads(self.body) if self.body else {}
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(reader):
+    """Next request on the connection, None when the client closed it"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, 'Malformed request line') from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'transfer-encoding' in headers:
+        raise HTTPError(411, 'Send a Content-Length body')
+    length = int(headers.get('content-length') or 0)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, 'Request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return Request(method.upper(), unquote(urlsplit(target).path), headers, body)
+
+
+def response_head(status, headers):
+    lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+    lines += [f'{name}: {value}' for name, value in {**CORS_HEADERS, **headers}.items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def json_response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    return response_head(status, {
+        'Content-Type': 'application/json',
+        'Content-Length': len(body),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+    }) + body
+
+
+class LiveMatch:
+    """A registered match: its MatchState, latest prediction and subscribers"""
+
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.state = MatchState()
+        self.seq = 0
+        self.message = None
+        self.prediction = None
+        self.ended = False
+        self.subscribers = 0
+        self.updated_at = time.monotonic()
+        # Serializes register/push so predictions go out in ball order
+        self.lock = asyncio.Lock()
+        # Set (and replaced) on every new prediction and when the match ends
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class LiveFeedHub:
+    """
+    Registered matches, their latest predictions and their subscribers.
+    Everything except ``predict`` runs on the event loop thread.
+    """
+
+    def __init__(self, predict, token='', heartbeat=DEFAULT_HEARTBEAT, idle_ttl=DEFAULT_IDLE_TTL,
+                 predict_threads=DEFAULT_PREDICT_THREADS):
+        self.predict = predict
+        self.token = token
+        self.heartbeat = heartbeat
+        self.idle_ttl = idle_ttl
+        self.predict_threads = predict_threads
+        self.matches = {}
+        self.predictions = 0
+        self.broadcasts = 0
+        self._pool = ThreadPoolExecutor(max_workers=predict_threads, thread_name_prefix='live-predict')
+
+    @classmethod
+    def from_env(cls, predict, prefix='LIVE_FEED'):
+        """Build from <prefix>_TOKEN / _HEARTBEAT / _IDLE_TTL / _PREDICT_THREADS"""
+        return cls(
+            predict,
+            token=os.environ.get(f'{prefix}_TOKEN', ''),
+            heartbeat=float(os.environ.get(f'{prefix}_HEARTBEAT', DEFAULT_HEARTBEAT)),
+            idle_ttl=float(os.environ.get(f'{prefix}_IDLE_TTL', DEFAULT_IDLE_TTL)),
+            predict_threads=int(os.environ.get(f'{prefix}_PREDICT_THREADS', DEFAULT_PREDICT_THREADS))
+        )
+
+    def get(self, match_id):
+        return self.matches.get(match_id)
+
+    async def register(self, match_id, snapshot):
+        """Start (or restart) the feed of ``match_id`` from ``snapshot``; returns the match"""
+        try:
+            state = MatchState.from_snapshot(snapshot)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid match state: {e}") from None
+        self._drop_idle()
+        match = self.matches.get(match_id) or LiveMatch(match_id)
+        async with match.lock:
+            state_dict, prediction = await self._predict(state)
+            # Listed once its first prediction exists; existing subscribers keep their stream
+            match = self.matches.setdefault(match_id, match)
+            self._publish(match, state, state_dict, prediction)
+        return match
+
+    async def push(self, match, events):
+        """
+        Apply ball ``events`` to ``match`` and broadcast one prediction for the
+        result. A bad event raises ValueError with none of the batch applied.
+        """
+        if not isinstance(events, list):
+            raise ValueError("'balls' must be a list of ball events")
+        async with match.lock:
+            state = copy.copy(match.state).apply_all(events)
+            state_dict, prediction = await self._predict(state)
+            self._publish(match, state, state_dict, prediction)
+        return match
+
+    def remove(self, match_id):
+        match = self.matches.pop(match_id, None)
+        if match is not None:
+            match.ended = True
+            match.notify()
+        return match
+
+    def _drop_idle(self):
+        now = time.monotonic()
+        for match_id, match in list(self.matches.items()):
+            if now - match.updated_at > self.idle_ttl:
+                logger.info("Dropping idle live match %s", match_id)
+                self.remove(match_id)
+
+    async def _predict(self, state):
+        # Model calls block, so they run off the event loop
+        state_dict = state.to_dict()
+        loop = asyncio.get_running_loop()
+        prediction = await loop.run_in_executor(self._pool, self.predict, dict(state_dict))
+        return state_dict, prediction
+
+    def _publish(self, match, state, state_dict, prediction):
+        # The state changes only together with its prediction
+        match.state = state
+        match.updated_at = time.monotonic()
+        match.seq += 1
+        match.prediction = dict(prediction, match_id=match.match_id, seq=match.seq, state=state_dict)
+        # Serialized once per ball, sent as-is to every subscriber
+        match.message = sse_message('prediction', json.dumps(match.prediction), match.seq).encode()
+        self.predictions += 1
+        match.notify()
+
+    async def stream(self, match, writer, last_seen=0):
+        """SSE frames for one subscriber until the match ends or the client goes away"""
+        match.subscribers += 1
+        try:
+            writer.write(response_head(200, {
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+                'Connection': 'close',
+            }) + b'retry: 3000\n\n')
+            await writer.drain()
+            seen = last_seen
+            while True:
+                if match.seq == seen and not match.ended:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(match.changed.wait(), self.heartbeat)
+                seq, message, ended = match.seq, match.message, match.ended
+                if ended:
+                    if seq != seen and message:
+                        writer.write(message)
+                    writer.write(sse_message('end', json.dumps({'match_id': match.match_id})).encode())
+                    await writer.drain()
+                    return
+                if seq == seen:
+                    # Keeps proxies from closing the connection; a gone client shows up here
+                    writer.write(b': heartbeat\n\n')
+                else:
+                    seen = seq
+                    self.broadcasts += 1
+                    writer.write(message)
+                # Waits only for this client; a slow one skips to the latest prediction
+                await writer.drain()
+        finally:
+            match.subscribers -= 1
+
+    def stats(self):
+        return {
+            'matches': len(self.matches),
+            'subscribers': sum(match.subscribers for match in self.matches.values()),
+            'predictions': self.predictions,
+            'broadcasts': self.broadcasts,
+            'predict_threads': self.predict_threads
+        }
+
+    def authorized(self, request):
+        if not self.token:
+            return True
+        supplied = request.headers.get('x-publish-token', '')
+        return hmac.compare_digest(supplied, self.token)
+
+    # === HTTP ===
+    async def handle(self, request, writer):
+        """Answer one request; returns False when the connection must close"""
+        parts = [part for part in request.path.split('/') if part]
+        method = request.method
+        if method == 'OPTIONS':
+            writer.write(response_head(204, {'Content-Length': 0}))
+            return request.keep_alive
+        if parts == ['health'] and method == 'GET':
+            return self._reply(writer, request, 200, {'status': 'healthy', 'live_feed': self.stats()})
+        if parts[:2] != ['live', 'matches'] or len(parts) > 4:
+            return self._reply(writer, request, 404, {'success': False, 'error': 'Not found'})
+
+        if len(parts) == 2:
+            if method == 'GET':
+                matches = {match_id: {'seq': match.seq, 'subscribers': match.subscribers,
+                                      'state': match.state.to_dict()}
+                           for match_id, match in self.matches.items()}
+                return self._reply(writer, request, 200,
+                                   {'success': True, 'matches': matches, 'stats': self.stats()})
+            if method == 'POST':
+                return await self._publisher_call(writer, request, self._register)
+            return self._not_allowed(writer, request)
+
+        match_id = parts[2]
+        match = self.get(match_id)
+        if match is None and not (len(parts) == 3 and method == 'DELETE'):
+            return self._reply(writer, request, 404,
+                               {'success': False, 'error': f'Live match {match_id} not registered'})
+        if len(parts) == 4 and parts[3] == 'balls' and method == 'POST':
+            return await self._publisher_call(writer, request, self._push, match)
+        if len(parts) == 4 and parts[3] == 'stream' and method == 'GET':
+            try:
+                last_seen = int(request.headers.get('last-event-id', 0))
+            except ValueError:
+                last_seen = 0
+            await self.stream(match, writer, last_seen)
+            return False
+        if len(parts) == 3 and method == 'GET':
+            return self._reply(writer, request, 200, match.prediction)
+        if len(parts) == 3 and method == 'DELETE':
+            return await self._publisher_call(writer, request, self._remove, match_id)
+        return self._not_allowed(writer, request)
+
+    async def _register(self, data):
+        if not data.get('match_id'):
+            raise ValueError('Missing field: match_id')
+        match = await self.register(str(data['match_id']), data)
+        return 201, match.prediction
+
+    async def _push(self, data, match):
+        balls = data['balls'] if 'balls' in data else [data]
+        return 200, (await self.push(match, balls)).prediction
+
+    async def _remove(self, data, match_id):
+        if self.remove(match_id) is None:
+            return 404, {'success': False, 'error': f'Live match {match_id} not registered'}
+        return 200, {'success': True, 'match_id': match_id}
+
+    async def _publisher_call(self, writer, request, action, *args):
+        """Token check, JSON body, ValueError -> 400, anything else -> 500"""
+        if not self.authorized(request):
+            return self._reply(writer, request, 401, {'success': False, 'error': 'Invalid publish token'})
+        try:
+            data = request.json()
+            if not isinstance(data, dict):
+                raise ValueError('Expected a JSON object')
+            status, payload = await action(data, *args)
+        except ValueError as e:
+            status, payload = 400, {'success': False, 'error': str(e)}
+        except Exception as e:
+            logger.exception("Error handling %s %s", request.method, request.path)
+            status, payload = 500, {'success': False, 'error': str(e)}
+        return self._reply(writer, request, status, payload)
+
+    def _reply(self, writer, request, status, payload):
+        writer.write(json_response(status, payload, request.keep_alive))
+        return request.keep_alive
+
+    def _not_allowed(self, writer, request):
+        return self._reply(writer, request, 405, {'success': False, 'error': 'Method not allowed'})
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEPALIVE_SECONDS)
+                except HTTPError as e:
+                    writer.write(json_response(e.status, {'success': False, 'error': str(e)}, False))
+                    break
+                if request is None or not await self.handle(request, writer):
+                    break
+                await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            with contextlib.suppress(Exception):
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+
+    async def serve(self, host='0.0.0.0', port=DEFAULT_PORT):
+        server = await asyncio.start_server(self._connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def run(host='0.0.0.0', port=DEFAULT_PORT):
+    """Load the models (app.py) and serve the feed until interrupted"""
+    from app import all_predictions
+
+    hub = LiveFeedHub.from_env(all_predictions)
+    print(f"📡 Live feed: http://{host}:{port}/live/matches "
+          f"(asyncio, {hub.predict_threads} prediction threads)")
+    try:
+        asyncio.run(hub.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Live feed stopped")
+
+
+if __name__ == '__main__':
+    run(port=int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT)
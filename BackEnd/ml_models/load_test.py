@@ -0,0 +1,207 @@
+"""
+Load test for the prediction APIs: requests/second and p50/p99 latency.
+
+    python ml_models/load_test.py win                        # every installed mode
+    python ml_models/load_test.py score --modes gunicorn,waitress --concurrency 32
+    python ml_models/load_test.py win --url http://localhost:5001   # a running server
+
+For each mode the script starts serve.py on a free port, waits for /health,
+drives it with ``--concurrency`` keep-alive clients for ``--duration``
+seconds, and stops it. Requests cycle through ``--distinct`` different match
+states, so the response cache sees a realistic mix of hits and misses.
+Only the standard library is used on the client side.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENDPOINTS = {
+    'win': '/predict-both',
+    'score': '/predict-score-both',
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load test the prediction APIs')
+    parser.add_argument('service', choices=sorted(ENDPOINTS))
+    parser.add_argument('--modes', default='werkzeug,waitress,gunicorn',
+                        help='comma-separated serve.py servers to compare')
+    parser.add_argument('--url', help='test an already running server instead')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--distinct', type=int, default=1000,
+                        help='number of different match states to cycle through')
+    parser.add_argument('--workers', type=int, help='serve.py --workers')
+    parser.add_argument('--threads', type=int, help='serve.py --threads')
+    return parser.parse_args()
+
+
+def match_states(service, count):
+    rng = random.Random(0)
+    states = []
+    for _ in range(count):
+        overs = rng.randint(1, 19) + rng.randint(0, 5) / 10
+        score = rng.randint(int(overs * 5), int(overs * 11))
+        wickets = rng.randint(0, 9)
+        if service == 'score' or rng.random() < 0.5:
+            states.append({'current_score': score, 'wickets_lost': wickets,
+                           'overs_played': overs, 'innings': 1})
+        else:
+            target = rng.randint(130, 220)
+            score = min(score, target - 1)
+            states.append({'current_score': score, 'wickets_lost': wickets,
+                           'overs_played': overs, 'innings': 2,
+                           'target': target, 'runs_needed': target - score})
+    return [json.dumps(state) for state in states]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(host, port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_load(host, port, path, bodies, concurrency, duration):
+    """Keep-alive clients posting bodies until ``duration`` elapses"""
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    stop_at = time.perf_counter() + duration
+    headers = {'Content-Type': 'application/json'}
+
+    def client(index):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        position = index * 7919
+        while time.perf_counter() < stop_at:
+            body = bodies[position % len(bodies)]
+            position += 1
+            start = time.perf_counter()
+            try:
+                conn.request('POST', path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[index] += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            latencies[index].append(time.perf_counter() - start)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = np.concatenate([np.array(l) for l in latencies]) * 1000
+    if len(all_latencies) == 0:
+        return {'requests': 0, 'errors': sum(errors), 'rps': 0.0, 'p50_ms': None, 'p99_ms': None}
+    return {
+        'requests': len(all_latencies),
+        'errors': sum(errors),
+        'rps': len(all_latencies) / elapsed,
+        'p50_ms': float(np.percentile(all_latencies, 50)),
+        'p99_ms': float(np.percentile(all_latencies, 99)),
+    }
+
+
+def start_server(service, mode, port, args):
+    command = [sys.executable, os.path.join(SCRIPT_DIR, 'serve.py'), service,
+               '--server', mode, '--host', '127.0.0.1', '--port', str(port)]
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+    if args.threads:
+        command += ['--threads', str(args.threads)]
+    return subprocess.Popen(command, cwd=os.path.dirname(SCRIPT_DIR),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def installed(mode):
+    if mode == 'werkzeug':
+        return True
+    try:
+        __import__(mode)
+        return mode != 'gunicorn' or os.name != 'nt'
+    except ImportError:
+        return False
+
+
+def main():
+    args = parse_args()
+    path = ENDPOINTS[args.service]
+    bodies = match_states(args.service, args.distinct)
+
+    print("=" * 70)
+    print(f"🔥 LOAD TEST: {args.service} API {path}")
+    print("=" * 70)
+    print(f"Concurrency: {args.concurrency}, duration: {args.duration:.0f}s per mode, "
+          f"{len(bodies)} distinct match states")
+
+    results = {}
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        results[args.url] = run_load(parsed.hostname, parsed.port or 80, path, bodies,
+                                     args.concurrency, args.duration)
+    else:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            if not installed(mode):
+                print(f"\n⚠️  {mode} not installed, skipping")
+                continue
+            port = free_port()
+            print(f"\n🚀 Starting serve.py ({mode}) on port {port}...")
+            server = start_server(args.service, mode, port, args)
+            try:
+                if not wait_until_healthy('127.0.0.1', port):
+                    print(f"   ❌ {mode} did not become healthy")
+                    continue
+                run_load('127.0.0.1', port, path, bodies[:50], 2, 1.0)  # warm-up
+                results[mode] = run_load('127.0.0.1', port, path, bodies,
+                                         args.concurrency, args.duration)
+                print(f"   ✅ {results[mode]['rps']:.0f} req/s")
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    print("\n" + "=" * 70)
+    print(f"{'Mode':<28} {'Requests':>9} {'Errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    print("-" * 70)
+    for mode, r in results.items():
+        p50 = f"{r['p50_ms']:.2f}" if r['p50_ms'] is not None else '-'
+        p99 = f"{r['p99_ms']:.2f}" if r['p99_ms'] is not None else '-'
+        print(f"{mode:<28} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.0f} {p50:>8} {p99:>8}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
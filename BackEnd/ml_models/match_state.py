@@ -0,0 +1,252 @@
+"""
+Incremental match state: one O(1) update per ball instead of a full match document.
+
+    state = MatchState.from_snapshot({'innings': 1, 'total_overs': 20})
+    state.apply({'r': 4})                       # four off the bat
+    state.apply({'r': 0, 'x': 1, 't': 'wd'})    # wide
+    state.apply({'r': 0, 'w': 1})               # wicket
+    state.apply({'e': 'innings'})               # innings break: target = score + 1
+    X = state.features()                        # (1, 9) float32 win-model row
+
+Compact ball events (the long names the Node scorer uses work too):
+
+    r   runs off the bat           (runs)
+    x   extra runs                 (extras)
+    t   extras type: wd, nb, b, lb (extras_type / extrasType, Node and
+                                   Cricsheet spellings: wide, noBall, byes, ...)
+    w   1 if a wicket fell         (wicket / isWicket)
+    e   'innings' ends the innings instead of a ball
+
+Wides and no-balls aren't legal deliveries. Every other ball moves the over
+on (13 legal balls = 2.1 overs, as in the training data). A ball that arrives
+after the first innings is complete (all out or out of overs) starts the
+second innings first; an innings event during the chase changes nothing, so
+a scorer's explicit break after that doesn't start a third innings.
+
+The live feed (live_feed.py) keeps one MatchState per registered match, and
+predict.py's worker keeps one per match the Node bridge sends events for,
+so a prediction costs the same at ball 1 and at ball 240.
+"""
+import copy
+
+from features import WIN_FEATURE_COLUMNS, empty_row
+
+# Every extras spelling -> short code
+EXTRAS_TYPES = {
+    None: None, '': None, 'none': None,
+    'wd': 'wd', 'wide': 'wd', 'wides': 'wd',
+    'nb': 'nb', 'noBall': 'nb', 'noballs': 'nb',
+    'b': 'b', 'bye': 'b', 'byes': 'b',
+    'lb': 'lb', 'legBye': 'lb', 'legbyes': 'lb',
+}
+NOT_LEGAL = {'wd', 'nb'}
+INNINGS_EVENT = 'innings'
+
+
+def _field(event, short, long, camel=None, default=0):
+    if short in event:
+        return event[short]
+    if long in event:
+        return event[long]
+    if camel is not None and camel in event:
+        return event[camel]
+    return default
+
+
+class MatchState:
+    """Score, wickets, legal balls, innings and target of one match"""
+
+    __slots__ = ('total_overs', 'innings', 'target', 'score', 'wickets', 'balls',
+                 'extras', 'team_a_batting')
+
+    def __init__(self, total_overs=20, innings=1, target=0, current_score=0,
+                 wickets_lost=0, balls=0, extras=0, team_a_batting=True):
+        self.total_overs = int(total_overs)
+        self.innings = int(innings)
+        self.target = int(target) if self.innings == 2 else 0
+        self.score = int(current_score)
+        self.wickets = int(wickets_lost)
+        self.balls = int(balls)
+        self.extras = int(extras)
+        self.team_a_batting = bool(team_a_batting)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """From the API field names (to_dict() output, the live feed's register body)"""
+        balls = snapshot.get('balls')
+        if balls is None:
+            # Cricket notation: 2.1 overs = 13 balls
+            overs = snapshot.get('overs_played', 0)
+            balls = int(overs) * 6 + round((overs - int(overs)) * 10)
+        return cls(
+            total_overs=snapshot.get('total_overs', 20),
+            innings=snapshot.get('innings', 1),
+            target=snapshot.get('target', 0),
+            current_score=snapshot.get('current_score', 0),
+            wickets_lost=snapshot.get('wickets_lost', 0),
+            balls=balls,
+            extras=snapshot.get('extras', 0),
+            team_a_batting=snapshot.get('team_a_batting', True)
+        )
+
+    @classmethod
+    def from_match_document(cls, match_data):
+        """From predict.py's full match document (currentInnings, innings[], teamA)"""
+        number = match_data['currentInnings']
+        innings = match_data['innings']
+        current = innings[number - 1]
+        balls = current.get('balls')
+        if balls is None:
+            overs = current['overs']
+            balls = int(overs) * 6 + round((overs - int(overs)) * 10)
+        return cls(
+            total_overs=match_data['totalOvers'],
+            innings=number,
+            target=innings[0]['score'] + 1 if number == 2 else 0,
+            current_score=current['score'],
+            wickets_lost=current['wickets'],
+            balls=balls,
+            extras=current.get('extras', 0),
+            team_a_batting=current['battingTeam']['_id'] == match_data['teamA']['_id']
+        )
+
+    # === Updates ===
+    def apply(self, event):
+        """
+        One compact ball event (or an innings event); O(1). Raises ValueError
+        for a malformed event, possibly after part of it was applied: use
+        apply_all() to apply a batch all or nothing.
+        """
+        if not isinstance(event, dict):
+            raise ValueError(f"ball event must be an object, got {event!r}")
+        if event.get('e') == INNINGS_EVENT:
+            self.next_innings()
+            return self
+        if self.innings == 1 and self.innings_complete:
+            self.next_innings()
+
+        extras_type = _field(event, 't', 'extras_type', 'extrasType', None)
+        if extras_type not in EXTRAS_TYPES:
+            raise ValueError(f"unknown extras type {extras_type!r}")
+        extras_type = EXTRAS_TYPES[extras_type]
+        try:
+            extras = int(_field(event, 'x', 'extras'))
+            runs = int(_field(event, 'r', 'runs'))
+        except (TypeError, ValueError):
+            raise ValueError(f"runs and extras must be whole numbers: {event!r}") from None
+        self.score += runs + extras
+        self.extras += extras
+        if extras_type not in NOT_LEGAL:
+            self.balls += 1
+        if _field(event, 'w', 'wicket', 'isWicket', False):
+            self.wickets += 1
+        return self
+
+    def apply_all(self, events):
+        """Apply ``events`` in order, all or nothing: if one is bad the state is unchanged"""
+        updated = copy.copy(self)
+        for event in events:
+            updated.apply(event)
+        for name in self.__slots__:
+            setattr(self, name, getattr(updated, name))
+        return self
+
+    def next_innings(self):
+        """Innings break: the other side chases this total + 1 (no-op in the chase)"""
+        if self.innings == 2:
+            return
+        self.target = self.score + 1
+        self.innings = 2
+        self.score = self.wickets = self.balls = self.extras = 0
+        self.team_a_batting = not self.team_a_batting
+
+    # === Derived values ===
+    @property
+    def overs_played(self):
+        """Cricket notation: 13 legal balls = 2.1"""
+        return self.balls // 6 + (self.balls % 6) / 10
+
+    @property
+    def over(self):
+        """(completed overs, legal balls in the current over)"""
+        return divmod(self.balls, 6)
+
+    @property
+    def runs_needed(self):
+        return max(0, self.target - self.score) if self.innings == 2 else 0
+
+    @property
+    def innings_complete(self):
+        return (self.wickets >= 10 or self.balls >= self.total_overs * 6
+                or (self.innings == 2 and self.score >= self.target))
+
+    def to_dict(self):
+        """API field names (the /predict-all request body)"""
+        return {
+            'current_score': self.score,
+            'wickets_lost': self.wickets,
+            'overs_played': self.overs_played,
+            'innings': self.innings,
+            'target': self.target,
+            'runs_needed': self.runs_needed,
+            'total_overs': self.total_overs,
+            'balls': self.balls,
+            'extras': self.extras,
+            'team_a_batting': self.team_a_batting
+        }
+
+    def feature_dict(self):
+        """predict.py's extract_features output for this state"""
+        overs = self.overs_played
+        overs_left = self.total_overs - overs
+        runs_needed = self.target - self.score if self.innings == 2 else 0
+        return {
+            'current_score': self.score,
+            'wickets_lost': self.wickets,
+            'overs_played': overs,
+            'total_overs': self.total_overs,
+            'innings': self.innings,
+            'run_rate': self.score / overs if overs > 0 else 0,
+            'target': self.target,
+            'runs_needed': runs_needed,
+            'wickets_remaining': 10 - self.wickets,
+            'required_run_rate': runs_needed / overs_left if self.innings == 2 and overs_left > 0 else 0
+        }
+
+    def features(self, out=None, round_rates=True):
+        """
+        Win-model row written straight from the counters: the same values as
+        features.build_win_features(self.to_dict(), total_overs=self.total_overs).
+        ``round_rates=False`` is predict.py's
+        variant (unrounded rates, runs needed may go below zero).
+        """
+        if out is None:
+            out = empty_row(WIN_FEATURE_COLUMNS)
+        overs = self.overs_played
+        overs_left = self.total_overs - overs
+        chasing = self.innings == 2
+        runs_needed = (self.runs_needed if round_rates
+                       else (self.target - self.score if chasing else 0))
+        run_rate = self.score / overs if overs > 0 else 0
+        required_run_rate = runs_needed / overs_left if chasing and overs_left > 0 else 0
+        if round_rates:
+            run_rate = round(run_rate, 2)
+            required_run_rate = round(required_run_rate, 2)
+
+        row = out[0]
+        row[0] = self.score
+        row[1] = self.wickets
+        row[2] = overs
+        row[3] = run_rate
+        row[4] = self.innings
+        row[5] = self.target
+        row[6] = runs_needed
+        row[7] = 10 - self.wickets
+        row[8] = required_run_rate
+        return out
+
+    def __repr__(self):
+        completed, balls = self.over
+        return (f"MatchState(innings={self.innings}, {self.score}/{self.wickets} "
+                f"in {completed}.{balls} of {self.total_overs}, target={self.target})")
+
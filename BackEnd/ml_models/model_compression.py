@@ -0,0 +1,187 @@
+"""
+Smaller, faster versions of trained tree ensembles (Random Forest / XGBoost).
+
+    small = drop_trees(model, 30)                 # keep the first 30 trees
+    small = limit_depth(model, 6, X_train, y_train)
+    small = distill(model, X_train, n_estimators=60, max_depth=3)
+
+Every function returns a new model of a type the registry already loads:
+sklearn forests stay sklearn forests, XGBoost models stay XGBClassifier /
+XGBRegressor, and distillation always gives an XGBoost model. predict /
+predict_proba keep working unchanged. compress_model.py is the
+command-line front end.
+
+Depth limits cut every tree at ``max_depth``. The node that was split there
+becomes a leaf. A forest then predicts with the value sklearn stores for
+every node (the class fractions or mean of the samples that reached it).
+XGBoost uses its own 'prune' updater, which needs the training rows to
+recompute the new leaves. It is given the model's own learning rate and
+regularisation; with XGBoost's defaults (eta 0.3) the new leaves would be
+scaled for a different learning rate than the rest of the trees.
+"""
+import copy
+
+import numpy as np
+import xgboost as xgb
+from sklearn.base import is_classifier
+from sklearn.tree._tree import Tree
+
+from training_config import for_serving
+
+TREE_LEAF = -1
+TREE_UNDEFINED = -2
+
+# sklearn-wrapper parameter -> booster parameter the prune updater uses for new leaves
+XGB_LEAF_PARAMS = {
+    'objective': 'objective',
+    'learning_rate': 'eta',
+    'gamma': 'gamma',
+    'reg_lambda': 'lambda',
+    'reg_alpha': 'alpha',
+    'min_child_weight': 'min_child_weight',
+    'max_delta_step': 'max_delta_step',
+}
+
+
+def is_xgboost(model):
+    return isinstance(model, xgb.XGBModel)
+
+
+def tree_count(model):
+    if is_xgboost(model):
+        return model.get_booster().num_boosted_rounds()
+    return len(model.estimators_)
+
+
+def node_count(model):
+    if is_xgboost(model):
+        return len(model.get_booster().trees_to_dataframe())
+    return sum(estimator.tree_.node_count for estimator in model.estimators_)
+
+
+def max_tree_depth(model):
+    if is_xgboost(model):
+        return max(_xgb_depths(model.get_booster()))
+    return max(estimator.tree_.max_depth for estimator in model.estimators_)
+
+
+def _xgb_depths(booster):
+    """Depth of every XGBoost tree, from the node ids of its dump"""
+    nodes = booster.trees_to_dataframe()
+    depths = []
+    for _, tree in nodes.groupby('Tree'):
+        depth = {}
+        for node, yes, no in zip(tree['Node'], tree['Yes'], tree['No']):
+            depth.setdefault(node, 0)
+            if isinstance(yes, str):
+                for child in (yes, no):
+                    depth[int(child.split('-')[1])] = depth[node] + 1
+        depths.append(max(depth.values()))
+    return depths
+
+
+def _from_booster(model, booster):
+    """A fresh sklearn wrapper of ``model``'s type around ``booster``"""
+    wrapped = type(model)()
+    wrapped.load_model(bytearray(booster.save_raw('json')))
+    return for_serving(wrapped)
+
+
+def drop_trees(model, n_trees):
+    """The first ``n_trees`` trees of ``model`` (boosting rounds for XGBoost)"""
+    if n_trees >= tree_count(model):
+        return model
+    if is_xgboost(model):
+        return _from_booster(model, model.get_booster()[:n_trees])
+    smaller = copy.copy(model)
+    smaller.estimators_ = model.estimators_[:n_trees]
+    smaller.n_estimators = n_trees
+    return smaller
+
+
+def prune_tree(tree, max_depth):
+    """A copy of a fitted sklearn ``Tree`` cut at ``max_depth`` (unreachable nodes removed)"""
+    state = tree.__getstate__()
+    nodes = state['nodes']
+    if state['max_depth'] <= max_depth:
+        return tree
+
+    # Depth-first walk from the root; nodes below max_depth are dropped
+    keep = []
+    depth = {0: 0}
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        keep.append(node)
+        left, right = nodes['left_child'][node], nodes['right_child'][node]
+        if left != TREE_LEAF and depth[node] < max_depth:
+            depth[left] = depth[right] = depth[node] + 1
+            stack.extend([right, left])
+
+    new_id = {old: new for new, old in enumerate(keep)}
+    pruned = nodes[keep].copy()
+    for i, old in enumerate(keep):
+        left, right = nodes['left_child'][old], nodes['right_child'][old]
+        if left == TREE_LEAF or left not in new_id:
+            pruned['left_child'][i] = pruned['right_child'][i] = TREE_LEAF
+            pruned['feature'][i] = TREE_UNDEFINED
+            pruned['threshold'][i] = TREE_UNDEFINED
+        else:
+            pruned['left_child'][i] = new_id[left]
+            pruned['right_child'][i] = new_id[right]
+
+    state.update(nodes=pruned, values=state['values'][keep].copy(),
+                 node_count=len(keep), max_depth=max(depth.values()))
+    new_tree = Tree(tree.n_features, np.asarray(tree.n_classes, dtype=np.intp), tree.n_outputs)
+    new_tree.__setstate__(state)
+    return new_tree
+
+
+def limit_depth(model, max_depth, X=None, y=None):
+    """``model`` with every tree cut at ``max_depth`` (XGBoost needs the training rows X, y)"""
+    if is_xgboost(model):
+        if X is None or y is None:
+            raise ValueError("XGBoost depth limiting needs the training data (X, y)")
+        booster = model.get_booster()
+        dtrain = xgb.DMatrix(X, label=y, feature_names=booster.feature_names)
+        # Unset wrapper parameters (None) were trained with XGBoost's defaults too
+        params = {XGB_LEAF_PARAMS[name]: value for name, value in model.get_params().items()
+                  if name in XGB_LEAF_PARAMS and value is not None}
+        params.update(process_type='update', updater='prune', max_depth=max_depth)
+        pruned = xgb.train(params, dtrain, num_boost_round=booster.num_boosted_rounds(),
+                           xgb_model=booster.copy())
+        return _from_booster(model, pruned)
+
+    smaller = copy.copy(model)
+    smaller.estimators_ = []
+    for estimator in model.estimators_:
+        estimator = copy.copy(estimator)
+        estimator.tree_ = prune_tree(estimator.tree_, max_depth)
+        estimator.max_depth = max_depth
+        smaller.estimators_.append(estimator)
+    smaller.max_depth = max_depth
+    return smaller
+
+
+def distill(teacher, X, n_estimators=60, max_depth=3, learning_rate=0.2, n_jobs=None):
+    """
+    A shallow XGBoost student fitted to ``teacher``'s predictions on ``X``.
+
+    Classifiers learn the teacher's win probability as a soft label (every
+    row appears once as a win weighted p and once as a loss weighted 1 - p,
+    which is the same cross-entropy); regressors learn its predictions.
+    """
+    params = dict(n_estimators=n_estimators, max_depth=max_depth,
+                  learning_rate=learning_rate, random_state=42, tree_method='hist')
+    if n_jobs:
+        params['n_jobs'] = n_jobs
+    X = np.asarray(X, dtype=np.float32)
+    if is_classifier(teacher):
+        p = teacher.predict_proba(X)[:, 1]
+        student = xgb.XGBClassifier(eval_metric='logloss', **params)
+        student.fit(np.vstack([X, X]), np.concatenate([np.ones(len(X)), np.zeros(len(X))]),
+                    sample_weight=np.concatenate([p, 1 - p]))
+    else:
+        student = xgb.XGBRegressor(objective='reg:squarederror', **params)
+        student.fit(X, teacher.predict(X))
+    return for_serving(student)
@@ -0,0 +1,119 @@
+"""
+Evaluate a request's models concurrently on one shared, bounded thread pool.
+
+    outcomes = model_executor.run({
+        'xgboost': ('xgb', xgb_model.predict_proba, features),
+        'random_forest': ('rf', rf_model.predict_proba, features),
+    })
+    outcomes['xgboost'].value, outcomes['xgboost'].error, outcomes['xgboost'].timing_ms
+
+/predict-both and /predict-score-both submit both models at once, so the
+request takes about as long as the slower model instead of the sum (the
+native predict loops of XGBoost and scikit-learn release the GIL). Each
+model has its own timeout: a model that misses it is reported as an error
+and the response goes out with the other model's result. A call still
+queued behind busy threads is cancelled, so it never runs; one that already
+started finishes in the background on its pool thread. stats() counts the
+two separately ('cancelled' and 'timed_out').
+
+Environment variables:
+    MODEL_POOL_THREADS      pool size per process (default 4; 0 runs the models
+                            one after the other in the request thread)
+    MODEL_TIMEOUT_MS        per-model timeout (default 2000)
+    MODEL_TIMEOUT_MS_<KEY>  timeout for one model, e.g. MODEL_TIMEOUT_MS_RF=500
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+DEFAULT_THREADS = 4
+DEFAULT_TIMEOUT_MS = 2000
+
+Outcome = namedtuple('Outcome', ['value', 'error', 'timing_ms'])
+
+
+def _timed(function, args):
+    start = time.perf_counter()
+    try:
+        value, error = function(*args), None
+    except Exception as e:
+        value, error = None, e
+    return value, error, (time.perf_counter() - start) * 1000
+
+
+class ModelExecutor:
+    """Shared pool for model calls, with per-model timeouts and timings"""
+
+    def __init__(self, max_workers=DEFAULT_THREADS, timeout_ms=DEFAULT_TIMEOUT_MS, timeouts=None):
+        self.max_workers = max_workers
+        self.timeout_ms = timeout_ms
+        self.timeouts = timeouts or {}
+        self.timed_out = 0
+        self.cancelled = 0
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix='MODEL'):
+        """Build from <prefix>_POOL_THREADS / <prefix>_TIMEOUT_MS / <prefix>_TIMEOUT_MS_<KEY>"""
+        timeout_prefix = f'{prefix}_TIMEOUT_MS_'
+        return cls(
+            max_workers=int(os.environ.get(f'{prefix}_POOL_THREADS', DEFAULT_THREADS)),
+            timeout_ms=float(os.environ.get(f'{prefix}_TIMEOUT_MS', DEFAULT_TIMEOUT_MS)),
+            timeouts={name[len(timeout_prefix):].lower(): float(value)
+                      for name, value in os.environ.items() if name.startswith(timeout_prefix)}
+        )
+
+    def timeout_for(self, key):
+        return self.timeouts.get(key, self.timeout_ms)
+
+    def _executor(self):
+        # Threads don't survive fork: a gunicorn worker starts its own pool
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='model')
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def run(self, calls):
+        """{name: (model key, function, *args)} -> {name: Outcome}, all submitted at once"""
+        if self.max_workers <= 0:
+            return {name: Outcome(*_timed(function, args))
+                    for name, (key, function, *args) in calls.items()}
+
+        start = time.perf_counter()
+        pool = self._executor()
+        futures = {name: (key, pool.submit(_timed, function, args))
+                   for name, (key, function, *args) in calls.items()}
+        outcomes = {}
+        for name, (key, future) in futures.items():
+            timeout_ms = self.timeout_for(key)
+            remaining = timeout_ms / 1000 - (time.perf_counter() - start)
+            try:
+                outcomes[name] = Outcome(*future.result(timeout=max(remaining, 0)))
+            except TimeoutError:
+                # Queued calls never start; running ones can't be stopped
+                if future.cancel():
+                    self.cancelled += 1
+                else:
+                    self.timed_out += 1
+                outcomes[name] = Outcome(None, TimeoutError(f'{key} timed out after {timeout_ms:g} ms'),
+                                         timeout_ms)
+        return outcomes
+
+    def stats(self):
+        return {
+            'threads': self.max_workers,
+            'timeout_ms': self.timeout_ms,
+            'timeouts': self.timeouts,
+            'timed_out': self.timed_out,
+            'cancelled': self.cancelled
+        }
+
+
+# Process-wide pool shared by app.py and score_routes.py
+model_executor = ModelExecutor.from_env()
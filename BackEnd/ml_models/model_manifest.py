@@ -0,0 +1,121 @@
+"""
+Model manifest: where every served model file is, in which format, and what it expects.
+
+export_models.py writes models/manifest.json and a copy of every model in a
+format that loads without probing or unpickling a Python object graph:
+
+    XGBoost         models/native/<name>.ubj      xgboost's own binary format (UBJSON)
+    Random Forest   models/native/<name>.joblib   uncompressed joblib, opened with
+                                                  mmap_mode='r' so the tree arrays are
+                                                  file-backed and shared between workers
+
+Each manifest entry (keyed like benchmark_results.json: 'rf', 'rf_compressed')
+records the absolute path and sha256 of that file, the pickle it was exported
+from (path, sha256, size and mtime), the model class and the feature schema
+(column names, in order) the APIs must build.
+
+model_registry.py and predict.py read one entry per model instead of probing
+paths. An entry is not used (the pickle is loaded as before) when its file is
+missing or fails its checksum, when the pickle was retrained after the export,
+or when its features differ from features.py.
+"""
+import json
+import os
+
+from features import SCORE_FEATURE_COLUMNS, WIN_FEATURE_COLUMNS
+from win_table import file_sha256
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(SCRIPT_DIR, 'models')
+MANIFEST_PATH = os.environ.get('MODEL_MANIFEST', os.path.join(MODELS_DIR, 'manifest.json'))
+NATIVE_DIR = os.path.join(MODELS_DIR, 'native')
+
+XGBOOST_FORMAT = 'xgboost-ubj'
+JOBLIB_FORMAT = 'joblib-mmap'
+
+
+def feature_schema(task):
+    return list(WIN_FEATURE_COLUMNS if task == 'win' else SCORE_FEATURE_COLUMNS)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """{entry key: entry} from the manifest ({} if export_models.py hasn't been run)"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('models', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def source_unchanged(entry):
+    """Is the pickle ``entry`` was exported from still the same file (size and mtime)?"""
+    try:
+        stat = os.stat(entry['source'])
+    except OSError:
+        # Only the exported copy was deployed
+        return True
+    return stat.st_size == entry['source_size'] and stat.st_mtime_ns == entry['source_mtime_ns']
+
+
+def check_entry(entry, task):
+    """Why ``entry`` can't be used (None if it can)"""
+    if not os.path.exists(entry['path']):
+        return f"{entry['path']} is missing"
+    if not source_unchanged(entry):
+        return f"{os.path.basename(entry['source'])} changed since the export"
+    if entry['features'] != feature_schema(task):
+        return f"feature schema {entry['features']} does not match features.py"
+    if file_sha256(entry['path']) != entry['sha256']:
+        return f"{entry['path']} does not match its checksum"
+    return None
+
+
+def load_native(entry):
+    """The model stored at ``entry['path']``"""
+    if entry['format'] == XGBOOST_FORMAT:
+        import xgboost as xgb
+
+        model = getattr(xgb, entry['class'])()
+        model.load_model(entry['path'])
+        return model
+    if entry['format'] == JOBLIB_FORMAT:
+        import joblib
+
+        return joblib.load(entry['path'], mmap_mode='r')
+    raise ValueError(f"unknown model format {entry['format']!r}")
+
+
+def export_model(model, source_path, task, output_dir=NATIVE_DIR):
+    """Write ``model`` in its native format next to the others; returns its manifest entry"""
+    import xgboost as xgb
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    if isinstance(model, xgb.XGBModel):
+        path = os.path.join(output_dir, f'{stem}.ubj')
+        model.save_model(path)
+        model_format = XGBOOST_FORMAT
+    else:
+        import joblib
+
+        path = os.path.join(output_dir, f'{stem}.joblib')
+        # Uncompressed, so every array can be memory-mapped at load
+        joblib.dump(model, path)
+        model_format = JOBLIB_FORMAT
+
+    source_stat = os.stat(source_path)
+    return {
+        'format': model_format,
+        'class': type(model).__name__,
+        'path': os.path.abspath(path),
+        'sha256': file_sha256(path),
+        'size_bytes': os.path.getsize(path),
+        'source': os.path.abspath(source_path),
+        'source_sha256': file_sha256(source_path),
+        'source_size': source_stat.st_size,
+        'source_mtime_ns': source_stat.st_mtime_ns,
+        'task': task,
+        'features': feature_schema(task),
+        'n_features': model.n_features_in_,
+        'classes': [int(c) for c in model.classes_] if hasattr(model, 'classes_') else None
+    }
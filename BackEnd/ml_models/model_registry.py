@@ -0,0 +1,453 @@
+"""
+One registry for every model the prediction service serves.
+
+app.py loads the win and score models through ``registry`` at startup:
+
+    registry.load(required=['xgb', 'rf'])    # all four models, ready with the win models
+    registry.load(['score_xgb', 'score_rf']) # app_score.py on its own
+
+Request handlers look models up with ``registry.get(key)`` instead of
+holding their own module globals. That way the win routes (app.py) and the
+score routes (score_routes.py) share one copy of each model when they run in
+one process.
+
+Keys:
+    xgb        XGBoost win model          (models/model_xgb.pkl)
+    rf         Random Forest win model    (models/model_rf.pkl)
+    score_xgb  XGBoost score model        (models/model_score_xgb.pkl)
+    score_rf   Random Forest score model  (models/model_score_rf.pkl)
+
+Variants (compress_model.py writes models/<name>_compressed.pkl):
+    MODEL_VARIANT=compressed              every model
+    MODEL_VARIANT_RF=compressed           only the Random Forest win model
+A missing variant falls back to the full model.
+
+With models/manifest.json (python ml_models/export_models.py) each model is
+loaded from the absolute path in its manifest entry, in xgboost's native
+format or as a memory-mapped joblib file, after checking its sha256 and
+feature schema (model_manifest.py). Without it, the pickle is found by
+probing candidate_paths() as before.
+
+``registry.warm_up()`` runs every loaded model on a single row and a batch
+before the service reports ready, so the first request doesn't pay for lazy
+initialisation; ``registry.startup`` has the load / warm-up times and the
+time from process start to the first prediction. ``registry.ready`` also
+needs every ``required`` model (default: every loaded key) to be loaded.
+
+The models live in a ModelSet. model_reload.py pins one set to each request
+and can build a new set from changed files and ``registry.swap`` it in while
+the service keeps answering; ``registry.version`` identifies the set.
+
+Measured accuracy / latency (benchmark_models.py, models/benchmark_results.json)
+are served through ``registry.benchmark(key)`` and ``registry.speed(key)``, only
+when the results were measured on the exact file that was loaded.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from features import win_feature_matrix_from_arrays
+from model_manifest import check_entry, load_manifest, load_native
+from training_config import for_serving
+from tree_engine import select_backend, backend_name
+from win_table import attach_win_table, file_sha256
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(SCRIPT_DIR, 'models')
+
+ModelSpec = namedtuple('ModelSpec', ['key', 'name', 'filename', 'train_script'])
+
+MODEL_SPECS = {
+    'xgb': ModelSpec('xgb', 'XGBoost', 'model_xgb.pkl', 'train_model.py'),
+    'rf': ModelSpec('rf', 'Random Forest', 'model_rf.pkl', 'train_random_forest.py'),
+    'score_xgb': ModelSpec('score_xgb', 'XGBoost Score', 'model_score_xgb.pkl',
+                           'train_score_xgboost.py'),
+    'score_rf': ModelSpec('score_rf', 'Random Forest Score', 'model_score_rf.pkl',
+                          'train_score_random_forest.py'),
+}
+
+WIN_MODEL_KEYS = ['xgb', 'rf']
+SCORE_MODEL_KEYS = ['score_xgb', 'score_rf']
+
+FULL_VARIANT = 'full'
+
+WARMUP_ROWS = 64
+_IMPORTED_AT = time.perf_counter()
+
+BENCHMARK_RESULTS_PATH = os.path.join(MODELS_DIR, 'benchmark_results.json')
+
+
+def variant_for(key):
+    """Which variant of ``key`` to load: MODEL_VARIANT_<KEY>, else MODEL_VARIANT, else full"""
+    default = os.environ.get('MODEL_VARIANT', FULL_VARIANT)
+    return os.environ.get(f'MODEL_VARIANT_{key.upper()}', default).lower()
+
+
+def variant_filename(filename, variant):
+    """model_rf.pkl -> model_rf_compressed.pkl (unchanged for the full model)"""
+    if variant == FULL_VARIANT:
+        return filename
+    stem, extension = os.path.splitext(filename)
+    return f'{stem}_{variant}{extension}'
+
+
+def model_task(key):
+    return 'win' if key in WIN_MODEL_KEYS else 'score'
+
+
+def entry_key(key, variant):
+    """Entry of a model file in manifest.json / benchmark_results.json: 'rf', 'rf_compressed', ..."""
+    return key if variant == FULL_VARIANT else f'{key}_{variant}'
+
+
+def load_benchmark_results(path=BENCHMARK_RESULTS_PATH):
+    """{entry key: result} from benchmark_models.py ({} if it hasn't been run)"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('models', {})
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            print(f"⚠️ Could not read benchmark results {path}: {e}")
+        return {}
+
+
+def model_files(keys=None):
+    """[(entry key, registry key, variant, path)] for every model pickle in models/"""
+    files = []
+    for key in keys or list(MODEL_SPECS):
+        filename = MODEL_SPECS[key].filename
+        stem, extension = os.path.splitext(filename)
+        variants = [FULL_VARIANT] + sorted(
+            name[len(stem) + 1:-len(extension)] for name in os.listdir(MODELS_DIR)
+            if name.startswith(stem + '_') and name.endswith(extension)
+            # model_score_xgb.pkl also starts with model_score_
+            and not any(name == spec.filename for spec in MODEL_SPECS.values())
+        )
+        for variant in variants:
+            path = os.path.join(MODELS_DIR, variant_filename(filename, variant))
+            if os.path.exists(path):
+                files.append((entry_key(key, variant), key, variant, path))
+    return files
+
+
+def warmup_rows(key, rows=WARMUP_ROWS):
+    """``rows`` plausible match states as a feature matrix for ``key``'s model"""
+    rng = np.random.default_rng(0)
+    balls = rng.integers(1, 120, rows)
+    innings = np.where(np.arange(rows) % 2 == 0, 1.0, 2.0)
+    score = rng.integers(0, 200, rows).astype(np.float64)
+    target = np.where(innings == 2, rng.integers(120, 221, rows), 0).astype(np.float64)
+    X = win_feature_matrix_from_arrays(
+        current_score=score,
+        wickets_lost=rng.integers(0, 10, rows).astype(np.float64),
+        overs_played=balls // 6 + balls % 6 / 10,
+        innings=innings,
+        target=target,
+        runs_needed=np.where(innings == 2, np.maximum(target - score, 0), 0)
+    )
+    if model_task(key) == 'win':
+        return X
+    # Score columns: score, wickets, overs, run rate, wickets remaining, total overs
+    return np.column_stack([X[:, [0, 1, 2, 3, 7]], np.full(rows, 20, np.float32)])
+
+
+def seconds_since_process_start():
+    """Wall time since this process started (since this module was imported without /proc)"""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _IMPORTED_AT
+
+
+def candidate_paths(filename):
+    """Where to look for a model file (next to this script first, then cwd-relative)"""
+    return [
+        os.path.join(MODELS_DIR, filename),
+        os.path.join('models', filename),
+        os.path.join('ml_models', 'models', filename),
+        filename,
+        os.path.join('..', 'models', filename),
+    ]
+
+
+class ModelSet:
+    """
+    One loaded generation of every model. A request predicts with a single
+    ModelSet from start to finish; a reload builds a new one next to it.
+    """
+
+    def __init__(self, number=1):
+        self.number = number
+        self.models = {}
+        self.paths = {}
+        self.backends = {}
+        self.variants = {}
+        self.checksums = {}
+        self.sources = {}
+        self.win_table = None
+        self.loaded_at = None
+        self.version = self.digest_version()
+        # Requests currently using this set; a retired set is released at zero
+        self.active = 0
+        self.retired = False
+
+    def digest_version(self):
+        """'v2-1a2b3c4d5e6f': generation number and a digest of the loaded files"""
+        digest = hashlib.sha256()
+        for key in sorted(self.models):
+            digest.update(f'{key}:{self.variants.get(key)}:{self.checksums.get(key)};'.encode())
+        return f'v{self.number}-{digest.hexdigest()[:12]}'
+
+    def load(self, keys, manifest):
+        """Load ``keys`` (default: every model); missing files are reported, not fatal"""
+        for key in keys or list(MODEL_SPECS):
+            self.load_model(key, manifest)
+
+        # Precomputed XGBoost win table (python build_win_table.py), live model outside the grid
+        if self.models.get('xgb') is not None and self.win_table is None:
+            source = self.sources['xgb']
+            self.models['xgb'], self.win_table = attach_win_table(
+                self.models['xgb'], source, os.path.dirname(os.path.abspath(source)),
+                model_sha256=self.checksums['xgb']
+            )
+        self.loaded_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.version = self.digest_version()
+        return self
+
+    def warm_up(self, rows=WARMUP_ROWS):
+        """One single-row and one ``rows``-row prediction per loaded model"""
+        for key, model in self.models.items():
+            if model is None:
+                continue
+            X = warmup_rows(key, rows)
+            predict = model.predict_proba if model_task(key) == 'win' else model.predict
+            predict(X[:1])
+            predict(X)
+        return self
+
+    def load_model(self, key, manifest):
+        spec = MODEL_SPECS[key]
+        variant = variant_for(key)
+        model, path, checksum = self._load_variant(key, variant, manifest)
+        if model is None and variant != FULL_VARIANT:
+            print(f"⚠️ {spec.name}: no '{variant}' variant, loading the full model")
+            variant = FULL_VARIANT
+            model, path, checksum = self._load_variant(key, variant, manifest)
+        if model is not None:
+            print(f"✅ {spec.name} model loaded from: {path}")
+            print(f"   🔧 Model Type: {type(model).__name__}")
+
+            # Single-row predictions: older pickles still carry n_jobs=-1 (PREDICT_N_JOBS)
+            model = for_serving(model)
+            # Optional compiled inference backend (INFERENCE_BACKEND / INFERENCE_BACKEND_<KEY>)
+            model = select_backend(model, key)
+            self.models[key] = model
+            self.paths[key] = path
+            self.backends[key] = backend_name(model)
+            self.variants[key] = variant
+            self.checksums[key] = checksum
+            return model
+
+        print(f"❌ {spec.name} model NOT loaded!")
+        print(f"💡 Solution: Run 'python ml_models/{spec.train_script}'")
+        self.models[key] = None
+        return None
+
+    def _load_variant(self, key, variant, manifest):
+        """(model, path, sha256 of its pickle) from the manifest, else by probing for the pickle"""
+        spec = MODEL_SPECS[key]
+        entry = (manifest or {}).get(entry_key(key, variant))
+        if entry:
+            problem = check_entry(entry, model_task(key))
+            if problem is None:
+                try:
+                    model = load_native(entry)
+                    self.sources[key] = entry['source']
+                    return model, entry['path'], entry['source_sha256']
+                except Exception as e:
+                    problem = str(e)
+            print(f"⚠️ {spec.name}: manifest entry not used ({problem}), loading the pickle")
+
+        model, path = self._load_file(spec, variant_filename(spec.filename, variant))
+        if model is None:
+            return None, None, None
+        self.sources[key] = path
+        return model, path, file_sha256(path)
+
+    def _load_file(self, spec, filename):
+        """(model, path) from the first readable candidate path, (None, None) if none"""
+        for path in candidate_paths(filename):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    return pickle.load(f), path
+            except Exception as e:
+                print(f"❌ Error loading {spec.name} from {path}: {e}")
+        return None, None
+
+    def release(self):
+        """Drop every model reference (called once no request uses this set)"""
+        self.models = {key: None for key in self.models}
+        self.win_table = None
+
+
+class ModelRegistry:
+    """
+    The served ModelSet and what is known about it.
+
+    Lookups (``get``, ``loaded``, ``backend``, ...) use the set pinned to the
+    current thread by ``acquire`` (a request, see model_reload.py), else the
+    current set. ``swap`` makes a new set current; the old one is released
+    when its last request finishes.
+    """
+
+    def __init__(self):
+        self.current = ModelSet()
+        self.keys = None
+        self.required = ()
+        self.manifest = None
+        self.benchmarks = None
+        self.warmed = False
+        self.startup = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _set(self):
+        return getattr(self._local, 'models', None) or self.current
+
+    @property
+    def models(self):
+        return self._set().models
+
+    @property
+    def paths(self):
+        return self._set().paths
+
+    @property
+    def checksums(self):
+        return self._set().checksums
+
+    @property
+    def win_table(self):
+        return self._set().win_table
+
+    @property
+    def version(self):
+        return self._set().version
+
+    def load(self, keys=None, required=None):
+        """
+        Load ``keys`` (default: every model) as the current set. The service
+        is ready only once the ``required`` models (default: ``keys``) loaded.
+        """
+        start = time.perf_counter()
+        self.keys = keys
+        self.required = tuple(required if required is not None else keys or MODEL_SPECS)
+        self.manifest = load_manifest()
+        self.current = ModelSet().load(keys, self.manifest)
+        self.startup['load_ms'] = (time.perf_counter() - start) * 1000
+        return self
+
+    def warm_up(self, rows=WARMUP_ROWS):
+        """Warm the current set up, then mark the service ready"""
+        start = time.perf_counter()
+        self.current.warm_up(rows)
+        self.startup['warmup_ms'] = (time.perf_counter() - start) * 1000
+        self.startup['time_to_first_prediction_s'] = seconds_since_process_start()
+        self.warmed = True
+        missing = [key for key in self.required if not self.loaded(key)]
+        if missing:
+            print(f"⚠️ Not ready: required models not loaded: {', '.join(missing)}")
+        return self
+
+    @property
+    def ready(self):
+        """Warmed up, with every required model loaded"""
+        return self.warmed and all(self.loaded(key) for key in self.required)
+
+    def acquire(self):
+        """Pin the current set to this thread until ``release``"""
+        with self._lock:
+            models = self.current
+            models.active += 1
+        self._local.models = models
+        return models
+
+    def release(self):
+        models = self._local.__dict__.pop('models', None)
+        if models is None:
+            return
+        with self._lock:
+            models.active -= 1
+            drained = models.retired and models.active == 0
+        if drained:
+            self._release(models)
+
+    def swap(self, models):
+        """Serve ``models`` from now on; the previous set is released once drained"""
+        with self._lock:
+            old, self.current = self.current, models
+            old.retired = True
+            drained = old.active == 0
+        # New checksums: measured results are matched again
+        self.benchmarks = None
+        if drained:
+            self._release(old)
+        return old
+
+    def _release(self, models):
+        models.release()
+        print(f"♻️  Models {models.version} released (no requests in flight)")
+
+    def get(self, key):
+        return self.models.get(key)
+
+    def loaded(self, key):
+        return self.models.get(key) is not None
+
+    def status(self, keys=None):
+        """{key: 'loaded' / 'not loaded'} for /health"""
+        return {key: 'loaded' if self.loaded(key) else 'not loaded'
+                for key in keys or self.models}
+
+    def backend(self, key):
+        return self._set().backends.get(key) if self.loaded(key) else None
+
+    def variant(self, key):
+        return self._set().variants.get(key) if self.loaded(key) else None
+
+    def benchmark(self, key):
+        """benchmark_models.py result for the loaded file of ``key`` (None if not measured)"""
+        if not self.loaded(key):
+            return None
+        if self.benchmarks is None:
+            self.benchmarks = load_benchmark_results()
+        result = self.benchmarks.get(entry_key(key, self.variant(key)))
+        # Results of an older model file would describe a different model
+        if result is None or result.get('sha256') != self.checksums.get(key):
+            return None
+        return result
+
+    def speed(self, key):
+        """'Faster' / 'Moderate' by measured p50 latency against the other loaded model of the same task"""
+        peers = WIN_MODEL_KEYS if key in WIN_MODEL_KEYS else SCORE_MODEL_KEYS
+        latencies = {peer: self.benchmark(peer)['latency_ms']['p50']
+                     for peer in peers if self.benchmark(peer)}
+        if key not in latencies:
+            return None
+        return 'Faster' if latencies[key] == min(latencies.values()) else 'Moderate'
+
+
+# Process-wide registry shared by app.py and score_routes.py
+registry = ModelRegistry()
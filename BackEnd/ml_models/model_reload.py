@@ -0,0 +1,222 @@
+"""
+Hot reload of the served models without restarting the API.
+
+    ModelReloader(registry).install(app)
+
+pins one ModelSet (model_registry.py) to every request for its whole
+duration and adds
+
+    POST /admin/reload     reload now (header X-Admin-Token: $MODEL_RELOAD_TOKEN);
+                           ?wait=1 answers with the result instead of 202
+
+A reload loads the model files again in a background thread (manifest
+entries first, then the pickles), runs a sanity batch through every new
+model and compares it with the model it replaces, warms the new set up and
+then swaps it in. Requests already running finish on the old models, which
+are released when the last of them is done. A failed load or sanity check
+leaves the old models in place.
+
+Environment variables:
+    MODEL_RELOAD_TOKEN     enables POST /admin/reload (disabled when unset)
+    MODEL_WATCH_INTERVAL   seconds between checks of the model files, the
+                           manifest and models/.reload (0 / unset: no watching)
+    MODEL_RELOAD_MAX_DRIFT largest win-probability change on the sanity batch
+                           a reload may bring (default 1.0: any)
+
+Under gunicorn every worker has its own models. The reload endpoint also
+touches models/.reload, so with MODEL_WATCH_INTERVAL set the other workers
+follow within one interval.
+"""
+import hmac
+import os
+import threading
+import time
+
+import numpy as np
+from flask import jsonify, request
+
+from model_manifest import MANIFEST_PATH, load_manifest
+from model_registry import (MODEL_SPECS, MODELS_DIR, FULL_VARIANT, ModelSet, model_task,
+                            variant_filename, variant_for, warmup_rows)
+
+RELOAD_MARKER = os.path.join(MODELS_DIR, '.reload')
+SANITY_ROWS = 256
+MAX_PREDICTED_SCORE = 500
+
+
+class ReloadError(Exception):
+    """New models that must not be served"""
+
+
+def sanity_report(new, old, max_drift=1.0):
+    """
+    Check every model of ``new`` on the sanity batch; returns {key: report}.
+    Raises ReloadError on invalid outputs, a model that disappeared, an
+    unchanged file that predicts differently, or drift above ``max_drift``.
+    """
+    report = {}
+    for key, model in new.models.items():
+        previous = old.models.get(key)
+        if model is None:
+            if previous is not None:
+                raise ReloadError(f"{key} could not be loaded")
+            continue
+        X = warmup_rows(key, SANITY_ROWS)
+        if model_task(key) == 'win':
+            predicted = model.predict_proba(X)
+            if (predicted.shape != (len(X), 2) or not np.isfinite(predicted).all()
+                    or (predicted < 0).any() or (predicted > 1).any()
+                    or not np.allclose(predicted.sum(axis=1), 1, atol=1e-4)):
+                raise ReloadError(f"{key} returned invalid probabilities")
+        else:
+            predicted = model.predict(X)
+            if (predicted.shape != (len(X),) or not np.isfinite(predicted).all()
+                    or (predicted < 0).any() or (predicted > MAX_PREDICTED_SCORE).any()):
+                raise ReloadError(f"{key} returned invalid scores")
+
+        entry = {'version': new.checksums[key][:12], 'changed': True, 'max_drift': None}
+        if previous is not None:
+            before = (previous.predict_proba(X) if model_task(key) == 'win'
+                      else previous.predict(X))
+            drift = float(np.abs(predicted - before).max())
+            entry.update(changed=new.checksums[key] != old.checksums.get(key), max_drift=drift)
+            if not entry['changed'] and drift > 1e-6:
+                raise ReloadError(f"{key}: same file, different predictions ({drift:.4g})")
+            if model_task(key) == 'win' and drift > max_drift:
+                raise ReloadError(f"{key}: win probability moved by {drift:.3f} "
+                                  f"(MODEL_RELOAD_MAX_DRIFT={max_drift})")
+        report[key] = entry
+    return report
+
+
+class ModelReloader:
+    """Background reloads, the file watcher and the admin endpoint for one registry"""
+
+    def __init__(self, registry, token=None, watch_interval=None, max_drift=None):
+        self.registry = registry
+        self.token = token if token is not None else os.environ.get('MODEL_RELOAD_TOKEN', '')
+        self.watch_interval = float(watch_interval if watch_interval is not None
+                                    else os.environ.get('MODEL_WATCH_INTERVAL', 0) or 0)
+        self.max_drift = float(max_drift if max_drift is not None
+                               else os.environ.get('MODEL_RELOAD_MAX_DRIFT', 1.0))
+        self._reload_lock = threading.Lock()
+        self._watcher_pid = None
+        self._watched = None
+        self.status = {'state': 'idle', 'reloads': 0, 'failures': 0,
+                       'last_reload_at': None, 'last_error': None, 'last_report': None}
+
+    def reload(self, reason='manual'):
+        """Load, check, warm and swap in new models; returns the status dict"""
+        if not self._reload_lock.acquire(blocking=False):
+            return dict(self.status, state='loading')
+        try:
+            self.status['state'] = 'loading'
+            start = time.perf_counter()
+            print(f"🔄 Reloading models ({reason})...")
+            # Snapshot first: changes made while loading trigger another reload
+            self._watched = self.watched_files()
+            old = self.registry.current
+            new = ModelSet(old.number + 1).load(self.registry.keys, load_manifest())
+            report = sanity_report(new, old, self.max_drift)
+            new.warm_up()
+            self.registry.swap(new)
+            self.status.update(state='idle', reloads=self.status['reloads'] + 1,
+                               last_reload_at=time.strftime('%Y-%m-%d %H:%M:%S'),
+                               last_error=None, last_report=report,
+                               last_reload_ms=(time.perf_counter() - start) * 1000)
+            print(f"✅ Serving models {new.version} (was {old.version}), "
+                  f"reloaded in {self.status['last_reload_ms']:.0f} ms")
+        except Exception as e:
+            self.status.update(state='failed', failures=self.status['failures'] + 1,
+                               last_error=str(e))
+            print(f"❌ Reload failed, still serving {self.registry.current.version}: {e}")
+        finally:
+            self._reload_lock.release()
+        return dict(self.status)
+
+    def reload_in_background(self, reason='manual'):
+        threading.Thread(target=self.reload, args=(reason,), daemon=True,
+                         name='model-reload').start()
+
+    def watched_files(self):
+        """{path: (size, mtime) or None} of every file a reload would read"""
+        current = self.registry.current
+        paths = {MANIFEST_PATH, RELOAD_MARKER}
+        for key in self.registry.keys or list(MODEL_SPECS):
+            filename = MODEL_SPECS[key].filename
+            paths.add(os.path.join(MODELS_DIR, filename))
+            if variant_for(key) != FULL_VARIANT:
+                paths.add(os.path.join(MODELS_DIR, variant_filename(filename, variant_for(key))))
+        paths.update(path for path in current.sources.values() if path)
+        paths.update(path for path in current.paths.values() if path)
+        stats = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stats[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                stats[path] = None
+        return stats
+
+    def _watch(self):
+        pending = None
+        while True:
+            time.sleep(self.watch_interval)
+            stats = self.watched_files()
+            if stats == self._watched:
+                pending = None
+                continue
+            # Reload once the files have stopped changing for a whole interval
+            if stats == pending:
+                self.reload('model files changed')
+                pending = None
+            else:
+                pending = stats
+
+    def ensure_watching(self):
+        """Start the watcher thread in this process (again after a fork)"""
+        if self.watch_interval <= 0 or self._watcher_pid == os.getpid():
+            return
+        self._watcher_pid = os.getpid()
+        if self._watched is None:
+            self._watched = self.watched_files()
+        threading.Thread(target=self._watch, daemon=True, name='model-watch').start()
+        print(f"👀 Watching model files every {self.watch_interval:g}s (pid {os.getpid()})")
+
+    def authorized(self):
+        supplied = request.headers.get('X-Admin-Token', '')
+        return bool(self.token) and hmac.compare_digest(supplied, self.token)
+
+    def install(self, app):
+        """Pin models per request on ``app`` and add POST /admin/reload"""
+
+        @app.before_request
+        def _pin_models():
+            self.ensure_watching()
+            self.registry.acquire()
+
+        @app.teardown_request
+        def _unpin_models(exc):
+            self.registry.release()
+
+        @app.route('/admin/reload', methods=['POST'])
+        def admin_reload():
+            """Reload the models (X-Admin-Token header; ?wait=1 to wait for the result)"""
+            if not self.token:
+                return jsonify({'success': False,
+                                'error': 'Reload endpoint disabled (set MODEL_RELOAD_TOKEN)'}), 403
+            if not self.authorized():
+                return jsonify({'success': False, 'error': 'Invalid admin token'}), 401
+            # Other workers watching the model files follow the marker
+            with open(RELOAD_MARKER, 'a'):
+                os.utime(RELOAD_MARKER)
+            if request.args.get('wait', '').lower() in ('1', 'true', 'yes'):
+                status = self.reload('admin request')
+                ok = status['state'] == 'idle'
+                return jsonify({'success': ok, 'version': self.registry.current.version,
+                                'reload': status}), 200 if ok else 500
+            self.reload_in_background('admin request')
+            return jsonify({'success': True, 'reload': 'started',
+                            'version': self.registry.current.version}), 202
+
+        return self
@@ -0,0 +1,406 @@
+"""
+Training pipeline runner: every training script as a stage in a dependency graph.
+
+    python ml_models/pipeline.py                   # everything that is out of date
+    python ml_models/pipeline.py train_score_rf    # one stage and what it needs
+    python ml_models/pipeline.py --jobs 2 --force  # rerun everything, 2 stages at a time
+    python ml_models/pipeline.py --dry-run         # show what would run
+
+    generate ─> final_score ─> cache ─┬─> train_xgb ──┬─> compare
+                                      ├─> train_rf ───┘
+                                      ├─> train_score_xgb
+                                      └─> train_score_rf
+                                 train_xgb ─> win_table
+                                 all four train_* ─> benchmark
+                                 all four train_* ─> export
+
+Each stage is its own process, started from BackEnd/ whatever the current
+directory is (the scripts use BackEnd-relative paths). Stages whose
+dependencies are done run in parallel, up to --jobs at a time (default: the
+four model fits at once, fewer on smaller machines). The cores are split
+between them through TRAIN_N_JOBS (training_config.py) unless it is set.
+The cache stage builds the typed training-data cache (dataset.py) once, so
+the parallel fits start by memory-mapping it instead of each parsing the CSV.
+
+A stage is skipped when its key is unchanged and its outputs are still what
+the pipeline last left there. The key is the sha256 of the stage's script,
+the local modules it imports, and the content of its inputs. An input made
+by an upstream stage counts as the content that stage produced. State is
+kept in ml_models/.pipeline/state.json; each stage's output goes to
+ml_models/.pipeline/logs/<stage>.log.
+
+Wall time and peak memory (max RSS from os.wait4) are reported per stage.
+Where os.wait4 is unavailable (Windows) peak memory is not reported.
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+STATE_DIR = os.path.join(SCRIPT_DIR, '.pipeline')
+STATE_PATH = os.path.join(STATE_DIR, 'state.json')
+LOG_DIR = os.path.join(STATE_DIR, 'logs')
+
+sys.path.insert(0, SCRIPT_DIR)
+from win_table import file_sha256
+from training_config import available_cores
+
+Stage = namedtuple('Stage', ['name', 'script', 'inputs', 'outputs', 'deps', 'code'])
+
+TRAINING_DATA = 'data/training_data_ipl.csv'
+TRAINING_DATA_CACHE = 'data/.cache/training_data_ipl.csv/meta.json'
+WIN_TABLE_FILES = ['ml_models/models/win_table/meta.json',
+                   'ml_models/models/win_table/innings1.npy',
+                   'ml_models/models/win_table/innings2.npy']
+
+# Local modules every serving-side script imports (model_registry.py and what it pulls in)
+REGISTRY_CODE = ['features.py', 'model_manifest.py', 'model_registry.py', 'training_config.py',
+                 'tree_engine.py', 'win_table.py']
+TRAIN_CODE = ['dataset.py', 'training_config.py', 'win_table.py']
+
+# Paths are relative to BackEnd/; ``code`` lists the local modules the script
+# imports, directly or through other local modules
+STAGES = [
+    Stage('generate', 'generate_training_data.py',
+          ['ml_models/data/matches.csv', 'ml_models/data/deliveries.csv'], [TRAINING_DATA],
+          [], []),
+    Stage('final_score', 'add_final_score_column.py',
+          [TRAINING_DATA], [TRAINING_DATA],
+          ['generate'], []),
+    Stage('cache', 'dataset.py',
+          [TRAINING_DATA], [TRAINING_DATA_CACHE],
+          ['final_score'], ['win_table.py']),
+    Stage('train_xgb', 'train_model.py',
+          [TRAINING_DATA], ['ml_models/models/model_xgb.pkl'],
+          ['cache'], TRAIN_CODE),
+    Stage('train_rf', 'train_random_forest.py',
+          [TRAINING_DATA], ['ml_models/models/model_rf.pkl'],
+          ['cache'], TRAIN_CODE),
+    Stage('train_score_xgb', 'train_score_xgboost.py',
+          [TRAINING_DATA], ['ml_models/models/model_score_xgb.pkl'],
+          ['cache'], TRAIN_CODE),
+    Stage('train_score_rf', 'train_score_random_forest.py',
+          [TRAINING_DATA], ['ml_models/models/model_score_rf.pkl'],
+          ['cache'], TRAIN_CODE),
+    Stage('compare', 'compare_two_models.py',
+          [TRAINING_DATA, 'ml_models/models/model_xgb.pkl', 'ml_models/models/model_rf.pkl'],
+          ['ml_models/comparison_report.txt'],
+          ['train_xgb', 'train_rf'],
+          ['benchmark_models.py', 'dataset.py', 'tune_models.py'] + REGISTRY_CODE),
+    Stage('benchmark', 'benchmark_models.py',
+          [TRAINING_DATA, 'ml_models/models/model_xgb.pkl', 'ml_models/models/model_rf.pkl',
+           'ml_models/models/model_score_xgb.pkl', 'ml_models/models/model_score_rf.pkl'],
+          ['ml_models/models/benchmark_results.json'],
+          ['train_xgb', 'train_rf', 'train_score_xgb', 'train_score_rf'],
+          ['dataset.py', 'tune_models.py'] + REGISTRY_CODE),
+    Stage('export', 'export_models.py',
+          ['ml_models/models/model_xgb.pkl', 'ml_models/models/model_rf.pkl',
+           'ml_models/models/model_score_xgb.pkl', 'ml_models/models/model_score_rf.pkl'],
+          ['ml_models/models/manifest.json'],
+          ['train_xgb', 'train_rf', 'train_score_xgb', 'train_score_rf'],
+          REGISTRY_CODE),
+    Stage('win_table', 'build_win_table.py',
+          ['ml_models/models/model_xgb.pkl'], WIN_TABLE_FILES,
+          ['train_xgb'], ['features.py', 'win_table.py']),
+]
+STAGES_BY_NAME = {stage.name: stage for stage in STAGES}
+
+# Widest level of the graph (the four model fits)
+MAX_PARALLEL_STAGES = 4
+
+
+def backend_path(path):
+    return os.path.join(BACKEND_DIR, path)
+
+
+def file_digest(path):
+    path = backend_path(path)
+    return file_sha256(path) if os.path.exists(path) else None
+
+
+def load_state():
+    try:
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp_path = STATE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def ancestors(name):
+    """Every stage ``name`` depends on, directly or not"""
+    seen = set()
+    pending = list(STAGES_BY_NAME[name].deps)
+    while pending:
+        dep = pending.pop()
+        if dep not in seen:
+            seen.add(dep)
+            pending.extend(STAGES_BY_NAME[dep].deps)
+    return seen
+
+
+def selected_stages(targets):
+    """``targets`` plus everything they depend on, in graph order"""
+    if not targets:
+        return list(STAGES)
+    wanted = set()
+    for target in targets:
+        wanted.add(target)
+        wanted |= ancestors(target)
+    return [stage for stage in STAGES if stage.name in wanted]
+
+
+def last_producer(path, stages):
+    """The last stage (in graph order) among ``stages`` that writes ``path``"""
+    producer = None
+    for stage in STAGES:
+        if stage.name in stages and path in stage.outputs:
+            producer = stage.name
+    return producer
+
+
+def stage_key(stage, state):
+    """sha256 of the script, its local modules and its inputs (None if an input is missing)"""
+    digest = hashlib.sha256()
+    for module in [stage.script] + stage.code:
+        digest.update(module.encode())
+        digest.update(file_sha256(os.path.join(SCRIPT_DIR, module)).encode())
+    upstream = ancestors(stage.name)
+    for path in stage.inputs:
+        producer = last_producer(path, upstream)
+        content = state.get(producer, {}).get('outputs', {}).get(path) if producer else None
+        content = content or file_digest(path)
+        if content is None:
+            return None
+        digest.update(path.encode())
+        digest.update(content.encode())
+    return digest.hexdigest()
+
+
+def outputs_current(stage, state):
+    """True if every output still holds what the pipeline last wrote to it"""
+    for path in stage.outputs:
+        # Files rewritten in place downstream (final_score) are checked against the last writer
+        producer = last_producer(path, {name for name in state})
+        expected = state.get(producer, {}).get('outputs', {}).get(path)
+        if expected is None or file_digest(path) != expected:
+            return False
+    return True
+
+
+def missing_inputs(stage):
+    return [path for path in stage.inputs if not os.path.exists(backend_path(path))]
+
+
+class StageRun:
+    """One stage process and its measurements"""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.status = 'pending'
+        self.wall_time = None
+        self.peak_rss_mb = None
+        self.returncode = None
+        self.process = None
+        self.key = None
+        self.log_path = os.path.join(LOG_DIR, f'{stage.name}.log')
+
+    def start(self, train_threads):
+        os.makedirs(LOG_DIR, exist_ok=True)
+        self.log = open(self.log_path, 'w', encoding='utf-8')
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        env.setdefault('TRAIN_N_JOBS', str(train_threads))
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join('ml_models', self.stage.script)],
+            cwd=BACKEND_DIR, stdout=self.log, stderr=subprocess.STDOUT, env=env
+        )
+        self.status = 'running'
+
+    def finish(self, returncode, rusage=None):
+        self.wall_time = time.perf_counter() - self.started
+        self.returncode = returncode
+        if rusage is not None:
+            # ru_maxrss is KB on Linux, bytes on macOS
+            scale = 1 if sys.platform == 'darwin' else 1024
+            self.peak_rss_mb = rusage.ru_maxrss * scale / 1e6
+        self.log.close()
+        self.status = 'ran' if returncode == 0 else 'failed'
+
+    def log_tail(self, lines=15):
+        with open(self.log_path, encoding='utf-8', errors='replace') as f:
+            return f.read().splitlines()[-lines:]
+
+
+def wait_any(running):
+    """Block until one running stage exits; returns it"""
+    if hasattr(os, 'wait4'):
+        by_pid = {run.process.pid: run for run in running}
+        while True:
+            pid, status, rusage = os.wait4(-1, 0)
+            run = by_pid.get(pid)
+            if run is None:
+                continue
+            # Reaped here, so tell Popen it has exited
+            run.process.returncode = os.waitstatus_to_exitcode(status)
+            run.finish(run.process.returncode, rusage)
+            return run
+    while True:
+        for run in running:
+            if run.process.poll() is not None:
+                run.finish(run.process.returncode)
+                return run
+        time.sleep(0.1)
+
+
+def run_pipeline(stages, jobs, force=False, dry_run=False):
+    state = load_state()
+    runs = {stage.name: StageRun(stage) for stage in stages}
+    names = set(runs)
+    running = []
+    # Parallel fits share the machine instead of each starting a thread per core
+    train_threads = max(1, available_cores() // jobs)
+
+    def deps_done(stage):
+        return all(runs[dep].status in ('ran', 'skipped') for dep in stage.deps if dep in names)
+
+    def deps_failed(stage):
+        return any(runs[dep].status in ('failed', 'blocked') for dep in stage.deps if dep in names)
+
+    def deps_reran(stage):
+        return any(runs[dep].status == 'ran' for dep in stage.deps if dep in names)
+
+    while True:
+        for run in runs.values():
+            if run.status != 'pending':
+                continue
+            stage = run.stage
+            if deps_failed(stage):
+                run.status = 'blocked'
+                continue
+            if not deps_done(stage) or len(running) >= jobs:
+                continue
+
+            key = stage_key(stage, state)
+            up_to_date = (key is not None and state.get(stage.name, {}).get('key') == key
+                          and outputs_current(stage, state))
+            if dry_run:
+                # Assume anything downstream of a rerun stage reruns as well
+                run.status = 'ran' if force or not up_to_date or deps_reran(stage) else 'skipped'
+                print(f"   {'▶️  run ' if run.status == 'ran' else '⏭️  skip'}  {stage.name}")
+                continue
+            if not force and up_to_date:
+                run.status = 'skipped'
+                print(f"⏭️  {stage.name}: up to date")
+                continue
+
+            missing = missing_inputs(stage)
+            if missing:
+                if all(os.path.exists(backend_path(path)) for path in stage.outputs):
+                    # e.g. deliveries.csv not extracted: keep the committed training data
+                    print(f"⚠️ {stage.name}: missing {', '.join(missing)}, using existing outputs")
+                    state[stage.name] = {'key': None, 'outputs': {p: file_digest(p) for p in stage.outputs}}
+                    save_state(state)
+                    run.status = 'skipped'
+                else:
+                    print(f"❌ {stage.name}: missing inputs {', '.join(missing)}")
+                    run.status = 'failed'
+                continue
+
+            print(f"▶️  {stage.name}: python ml_models/{stage.script}")
+            run.key = key
+            run.start(train_threads)
+            running.append(run)
+
+        if not running:
+            break
+
+        run = wait_any(running)
+        running.remove(run)
+        if run.status == 'ran':
+            state[run.stage.name] = {
+                'key': run.key,
+                'outputs': {path: file_digest(path) for path in run.stage.outputs}
+            }
+            save_state(state)
+            print(f"✅ {run.stage.name}: {run.wall_time:.1f}s")
+        else:
+            state.pop(run.stage.name, None)
+            save_state(state)
+            print(f"❌ {run.stage.name}: exit code {run.returncode} (log: {run.log_path})")
+            for line in run.log_tail():
+                print(f"   | {line}")
+
+    return list(runs.values())
+
+
+def print_report(runs, wall_time):
+    print("\n📊 Stage Report:")
+    print(f"   {'Stage':<18} {'Status':<9} {'Wall time':>10} {'Peak RSS':>11}")
+    print("   " + "-" * 51)
+    for run in runs:
+        wall = f"{run.wall_time:.1f}s" if run.wall_time is not None else '-'
+        peak = f"{run.peak_rss_mb:.0f} MB" if run.peak_rss_mb is not None else '-'
+        print(f"   {run.stage.name:<18} {run.status:<9} {wall:>10} {peak:>11}")
+    ran = [run for run in runs if run.wall_time is not None]
+    serial = sum(run.wall_time for run in ran)
+    print(f"\n⏱️  Pipeline wall time: {wall_time:.1f}s (stages add up to {serial:.1f}s)")
+    peaks = [run.peak_rss_mb for run in ran if run.peak_rss_mb is not None]
+    if peaks:
+        print(f"🧠 Largest stage peak RSS: {max(peaks):.0f} MB")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Run the training pipeline')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help=f"stages to bring up to date (default: all): {', '.join(STAGES_BY_NAME)}")
+    parser.add_argument('--jobs', '-j', type=int,
+                        default=int(os.environ.get('PIPELINE_JOBS',
+                                                   min(MAX_PARALLEL_STAGES, available_cores()))),
+                        help='stages run at once (default: PIPELINE_JOBS or min(4, CPU cores))')
+    parser.add_argument('--force', action='store_true', help='rerun stages even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='show what would run')
+    args = parser.parse_args()
+    unknown = [name for name in args.stages if name not in STAGES_BY_NAME]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("🔗 TRAINING PIPELINE")
+    print("=" * 70)
+    print(f"\n📂 Working directory for stages: {BACKEND_DIR}")
+    print(f"⚙️  Parallel stages: {max(1, args.jobs)}, "
+          f"TRAIN_N_JOBS: {os.environ.get('TRAIN_N_JOBS', max(1, available_cores() // max(1, args.jobs)))}\n")
+
+    start_time = time.perf_counter()
+    runs = run_pipeline(selected_stages(args.stages), max(1, args.jobs), args.force, args.dry_run)
+    if args.dry_run:
+        sys.exit(0)
+    print_report(runs, time.perf_counter() - start_time)
+
+    failed = [run.stage.name for run in runs if run.status in ('failed', 'blocked')]
+    print("\n" + "=" * 70)
+    if failed:
+        print(f"❌ PIPELINE FAILED: {', '.join(failed)}")
+        print("=" * 70)
+        sys.exit(1)
+    print("✅ PIPELINE COMPLETE!")
+    print("=" * 70)
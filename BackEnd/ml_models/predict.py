@@ -1,14 +1,53 @@
 import sys
 import json
 import pickle
-import pandas as pd
+from collections import OrderedDict
 import numpy as np
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
+# Allow `from ml_models.predict import ...` as well as running the script directly
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from features import build_win_features
+from match_state import MatchState
+from model_manifest import check_entry, load_manifest, load_native
+from model_registry import load_benchmark_results, seconds_since_process_start, warmup_rows
+from training_config import for_serving
+from win_table import file_sha256
+
+def model_label(model_sha256):
+    """'XGBoost (72.48%)' with the accuracy benchmark_models.py measured for this file"""
+    result = load_benchmark_results().get('xgb')
+    if result and result.get('sha256') == model_sha256:
+        return f"XGBoost ({result['metric'] * 100:.2f}%)", result
+    return 'XGBoost', None
+
+def loaded(model, model_path, model_sha256):
+    """(model, label) for a freshly loaded model, reported on stderr"""
+    label, result = model_label(model_sha256)
+    if result:
+        print(f"✅ Loaded XGBoost model from: {model_path} "
+              f"({result['metric'] * 100:.2f}% accuracy, {result['training_samples']} training rows)",
+              file=sys.stderr)
+    else:
+        print(f"✅ Loaded XGBoost model from: {model_path} (not benchmarked)", file=sys.stderr)
+    # One row per call: don't spin up a thread pool (PREDICT_N_JOBS)
+    return for_serving(model), label
+
 def load_model():
     """Load the trained XGBoost model"""
+    # Manifest entry (python export_models.py): absolute path, native format, no probing
+    entry = load_manifest().get('xgb')
+    if entry:
+        problem = check_entry(entry, 'win')
+        if problem is None:
+            try:
+                return loaded(load_native(entry), entry['path'], entry['source_sha256'])
+            except Exception as e:
+                problem = str(e)
+        print(f"⚠️ Manifest entry not used ({problem}), loading the pickle", file=sys.stderr)
+    
     # Try multiple paths
     paths_to_try = [
         'models/model_xgb.pkl',            # ✅ Correct when running from ml_models/
@@ -22,8 +61,7 @@ def load_model():
             try:
                 with open(model_path, 'rb') as f:
                     model = pickle.load(f)
-                    print(f"✅ Loaded XGBoost model from: {model_path} (72.48% accuracy, 8720 IPL samples)", file=sys.stderr)
-                    return model, 'XGBoost (72.48%)'
+                return loaded(model, model_path, file_sha256(model_path))
             except Exception as e:
                 print(f"⚠️ Failed to load from {model_path}: {e}", file=sys.stderr)
                 continue
@@ -88,107 +126,27 @@ def extract_features(match_data):
     
     return features
 
-def predict_match(match_data):
-    """Make prediction using XGBoost model"""
+def predict_match(match_data, model=None, model_name=None):
+    """Make prediction using XGBoost model
+
+    A preloaded ``model`` can be passed in (worker mode) so the pickle is
+    only read once per process instead of once per prediction.
+    """
     try:
-        model, model_name = load_model()
+        if model is None:
+            model, model_name = load_model()
         features = extract_features(match_data)
         
-        # Create DataFrame with correct feature order for XGBoost
-        feature_columns = [
-            'current_score', 'wickets_lost', 'overs_played', 'run_rate',
-            'innings', 'target', 'runs_needed', 'wickets_remaining', 
-            'required_run_rate'
-        ]
-        X = pd.DataFrame([features])[feature_columns]
-        
-        # Predict
-        prediction = model.predict(X)[0]
-        probabilities = model.predict_proba(X)[0]
+        # Float32 row in the model's feature order (no DataFrame needed)
+        X = build_win_features(features, total_overs=features['total_overs'],
+                               round_rates=False)
         
         # Current batting team
         current_innings = match_data['currentInnings']
         batting_team = match_data['innings'][current_innings - 1]['battingTeam']['_id']
-        team_a = match_data['teamA']['_id']
-        
-        # Calculate probabilities - Convert numpy types to Python float
-        if current_innings == 1:
-            # First innings: batting team win probability
-            if batting_team == team_a:
-                team_a_prob = float(probabilities[1] * 100)
-                team_b_prob = float(probabilities[0] * 100)
-            else:
-                team_a_prob = float(probabilities[0] * 100)
-                team_b_prob = float(probabilities[1] * 100)
-        else:
-            # Second innings: chasing team win probability
-            if batting_team == team_a:
-                team_a_prob = float(probabilities[1] * 100)
-                team_b_prob = float(probabilities[0] * 100)
-            else:
-                team_a_prob = float(probabilities[0] * 100)
-                team_b_prob = float(probabilities[1] * 100)
-        
-        # Predicted score with realistic bounds
-        if current_innings == 1:
-            current_score = features['current_score']
-            overs_played = features['overs_played']
-            overs_left = features['total_overs'] - overs_played
-            run_rate = features['run_rate']
-            wickets_remaining = features['wickets_remaining']
-            
-            # Calculate projected score with wicket factor
-            wicket_factor = wickets_remaining / 10
-            acceleration = 1.15 if overs_left < 5 else 1.0
-            predicted_score = int(current_score + (run_rate * overs_left * wicket_factor * acceleration))
-            
-            # Apply realistic bounds based on format
-            if features['total_overs'] == 20:  # T20
-                predicted_score = max(120, min(predicted_score, 240))
-            elif features['total_overs'] == 50:  # ODI
-                predicted_score = max(200, min(predicted_score, 400))
-            else:  # Other formats
-                predicted_score = max(100, min(predicted_score, int(features['total_overs'] * 12)))
-                
-        else:
-            # Second innings - target is the predicted score
-            predicted_score = int(features['target'])
+        team_a_batting = batting_team == match_data['teamA']['_id']
         
-        # Key factors
-        key_factors = []
-        if features['wickets_remaining'] <= 3:
-            key_factors.append("Few wickets remaining")
-        if features.get('required_run_rate', 0) > 12:
-            key_factors.append("High required run rate")
-        if features['run_rate'] > 8:
-            key_factors.append("Strong batting performance")
-        if features.get('required_run_rate', 0) > 0 and features['run_rate'] > features['required_run_rate']:
-            key_factors.append("Ahead of required run rate")
-        
-        # Confidence - Convert to Python float
-        max_prob = float(max(probabilities))
-        if max_prob > 0.8:
-            confidence = "high"
-        elif max_prob > 0.6:
-            confidence = "medium"
-        else:
-            confidence = "low"
-        
-        result = {
-            "success": True,
-            "data": {
-                "winProbability": {
-                    "teamA": float(round(team_a_prob, 2)),
-                    "teamB": float(round(team_b_prob, 2))
-                },
-                "predictedScore": predicted_score,
-                "keyFactors": key_factors,
-                "confidence": confidence,
-                "model": model_name
-            }
-        }
-        
-        return result
+        return prediction_result(features, X, team_a_batting, model, model_name)
         
     except Exception as e:
         import traceback
@@ -199,11 +157,191 @@ def predict_match(match_data):
             "error": str(e)
         }
 
+def predict_state(state, model, model_name):
+    """Prediction for a MatchState: the feature row comes straight from its counters"""
+    try:
+        X = state.features(round_rates=False)
+        return prediction_result(state.feature_dict(), X, state.team_a_batting, model, model_name)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+def prediction_result(features, X, team_a_batting, model, model_name):
+    """Response body for one feature row (``features`` as extract_features returns them)"""
+    # Predict (predict_proba only - the class label is never used here)
+    probabilities = model.predict_proba(X)[0]
+    current_innings = features['innings']
+    
+    # Batting (innings 1) or chasing (innings 2) team win probability
+    # - Convert numpy types to Python float
+    if team_a_batting:
+        team_a_prob = float(probabilities[1] * 100)
+        team_b_prob = float(probabilities[0] * 100)
+    else:
+        team_a_prob = float(probabilities[0] * 100)
+        team_b_prob = float(probabilities[1] * 100)
+    
+    # Predicted score with realistic bounds
+    if current_innings == 1:
+        current_score = features['current_score']
+        overs_played = features['overs_played']
+        overs_left = features['total_overs'] - overs_played
+        run_rate = features['run_rate']
+        wickets_remaining = features['wickets_remaining']
+        
+        # Calculate projected score with wicket factor
+        wicket_factor = wickets_remaining / 10
+        acceleration = 1.15 if overs_left < 5 else 1.0
+        predicted_score = int(current_score + (run_rate * overs_left * wicket_factor * acceleration))
+        
+        # Apply realistic bounds based on format
+        if features['total_overs'] == 20:  # T20
+            predicted_score = max(120, min(predicted_score, 240))
+        elif features['total_overs'] == 50:  # ODI
+            predicted_score = max(200, min(predicted_score, 400))
+        else:  # Other formats
+            predicted_score = max(100, min(predicted_score, int(features['total_overs'] * 12)))
+            
+    else:
+        # Second innings - target is the predicted score
+        predicted_score = int(features['target'])
+    
+    # Key factors
+    key_factors = []
+    if features['wickets_remaining'] <= 3:
+        key_factors.append("Few wickets remaining")
+    if features.get('required_run_rate', 0) > 12:
+        key_factors.append("High required run rate")
+    if features['run_rate'] > 8:
+        key_factors.append("Strong batting performance")
+    if features.get('required_run_rate', 0) > 0 and features['run_rate'] > features['required_run_rate']:
+        key_factors.append("Ahead of required run rate")
+    
+    # Confidence - Convert to Python float
+    max_prob = float(max(probabilities))
+    if max_prob > 0.8:
+        confidence = "high"
+    elif max_prob > 0.6:
+        confidence = "medium"
+    else:
+        confidence = "low"
+    
+    result = {
+        "success": True,
+        "data": {
+            "winProbability": {
+                "teamA": float(round(team_a_prob, 2)),
+                "teamB": float(round(team_b_prob, 2))
+            },
+            "predictedScore": predicted_score,
+            "keyFactors": key_factors,
+            "confidence": confidence,
+            "model": model_name
+        }
+    }
+    
+    return result
+
+# Matches a worker keeps state for (least recently predicted are dropped first)
+MAX_WORKER_MATCHES = int(os.environ.get('ML_WORKER_MAX_MATCHES', 256))
+
+def match_state_for(matches, message):
+    """
+    MatchState after a {"matchId", "state"?, "events"?} message, or None if
+    the worker has no state for the match (restarted, or it was dropped).
+    """
+    match_id = message['matchId']
+    if 'state' in message:
+        matches[match_id] = MatchState.from_snapshot(message['state'])
+    state = matches.get(match_id)
+    if state is None:
+        return None
+    matches.move_to_end(match_id)
+    while len(matches) > MAX_WORKER_MATCHES:
+        matches.popitem(last=False)
+    return state.apply_all(message.get('events', ()))
+
+
+def run_worker():
+    """
+    Persistent worker mode for the Node.js bridge.
+
+    Loads the model once, then reads newline-delimited JSON requests from
+    stdin and writes one JSON result per line to stdout:
+
+        in:  {"id": 7, "matchData": {...}}
+        out: {"id": 7, "success": true, "data": {...}}
+
+    Live matches are sent as ball deltas instead (match_state.py). The first
+    message of a match carries its state, later ones only the balls bowled
+    since the previous prediction, so a message doesn't grow with the match:
+
+        in:  {"id": 8, "matchId": "m1", "state": {...}, "events": []}
+        in:  {"id": 9, "matchId": "m1", "events": [{"r": 4}, {"r": 0, "w": 1}]}
+        out: {"id": 9, "success": false, "code": "unknown_match", ...}
+             when the worker has no state for m1; the bridge resends the state
+
+    A {"ready": true} line is written once the model is loaded and has
+    made a warm-up prediction.
+    """
+    model, model_name = load_model()
+    model.predict_proba(warmup_rows('xgb'))
+    startup_s = seconds_since_process_start()
+    print(f"⏱️ First prediction {startup_s:.2f}s after process start", file=sys.stderr)
+    print(json.dumps({"ready": True, "model": model_name,
+                      "time_to_first_prediction_s": round(startup_s, 3)}), flush=True)
+    
+    matches = OrderedDict()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        request_id = None
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise TypeError(f"Expected a JSON object, got {type(message).__name__}")
+            request_id = message.get('id')
+            if 'matchId' in message:
+                state = match_state_for(matches, message)
+                if state is None:
+                    result = {"success": False, "code": "unknown_match",
+                              "error": f"No state for match {message['matchId']}"}
+                else:
+                    result = predict_state(state, model, model_name)
+            else:
+                result = predict_match(message['matchData'], model, model_name)
+        except json.JSONDecodeError as e:
+            result = {"success": False, "error": f"Invalid JSON: {str(e)}"}
+        except KeyError as e:
+            result = {"success": False, "error": f"Missing field: {e}"}
+        except ValueError as e:
+            # Bad ball event (none of the batch was applied): drop the match
+            # so the bridge resyncs from its saved state next time
+            matches.pop(message.get('matchId'), None)
+            result = {"success": False, "error": str(e)}
+        except Exception as e:
+            # Any other bad request fails alone; the worker keeps serving
+            print(f"❌ Worker request failed: {e!r}", file=sys.stderr)
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        
+        result = {"id": request_id, **result}
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
 
 # === Main Entry Point ===
 if __name__ == "__main__":
     import sys
     
+    if '--worker' in sys.argv[1:]:
+        run_worker()
+        sys.exit(0)
+    
     try:
         # Try reading from stdin (for Node.js bridge)
         if not sys.stdin.isatty():
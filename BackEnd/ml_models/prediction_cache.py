@@ -0,0 +1,87 @@
+"""
+Bounded in-process response cache for the prediction endpoints.
+
+Every viewer of a live match sends the same match state after each ball, so
+/predict-both and /predict-score-both cache their model results keyed on the
+normalized feature row. One inference is shared by all viewers of that ball.
+Entries expire after ``ttl`` seconds and the least recently used entry is
+evicted once ``maxsize`` is reached.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a TTL and hit/miss/eviction counters"""
+
+    def __init__(self, maxsize=1024, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, prefix='PREDICTION_CACHE'):
+        """Build from <prefix>_SIZE / <prefix>_TTL (size 0 disables caching)"""
+        return cls(
+            maxsize=int(os.environ.get(f'{prefix}_SIZE', 1024)),
+            ttl=float(os.environ.get(f'{prefix}_TTL', 30))
+        )
+
+    @staticmethod
+    def key_for(features, *extra):
+        """Cache key for a (1, n) feature row (values are already normalized)"""
+        return tuple(features[0].tolist()) + extra
+
+    def get(self, key):
+        if self.maxsize <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / total, 4) if total else None
+            }
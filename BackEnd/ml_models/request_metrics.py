@@ -0,0 +1,140 @@
+"""
+Request-timing metrics for the Flask prediction services.
+
+``RequestMetrics(service).install(app)`` times every request with
+before/after_request hooks. It records the latency in a fixed-bucket
+histogram per (endpoint, method) and counts responses per status code.
+Observing a request is a bisect plus a few integer increments under a lock.
+The totals are served on GET /metrics in Prometheus text format, or as JSON
+with /metrics?format=json.
+"""
+import bisect
+import threading
+import time
+
+from flask import g, jsonify, request, Response
+
+# Upper bounds in milliseconds; one extra overflow bucket (+Inf) is kept
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (not thread-safe; RequestMetrics locks)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def cumulative(self):
+        """(upper_bound, cumulative_count) pairs, ending with ('+Inf', count)"""
+        total = 0
+        pairs = []
+        for bound, n in zip(self.buckets + ('+Inf',), self.counts):
+            total += n
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (None if empty)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return '+Inf'
+
+
+class RequestMetrics:
+    """Per-endpoint latency histograms and status counters for one service"""
+
+    def __init__(self, service, buckets=DEFAULT_BUCKETS_MS):
+        self.service = service
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._histograms = {}
+        self._statuses = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, method, status, elapsed_ms):
+        with self._lock:
+            histogram = self._histograms.get((endpoint, method))
+            if histogram is None:
+                histogram = self._histograms[(endpoint, method)] = LatencyHistogram(self.buckets)
+            histogram.observe(elapsed_ms)
+            key = (endpoint, method, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def install(self, app):
+        """Time every request on ``app`` and add the GET /metrics endpoint"""
+
+        @app.before_request
+        def _start_timer():
+            g.request_start = time.perf_counter()
+
+        @app.after_request
+        def _record_timing(response):
+            start = g.pop('request_start', None)
+            if start is not None:
+                endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+                self.observe(endpoint, request.method, response.status_code,
+                             (time.perf_counter() - start) * 1000)
+            return response
+
+        @app.route('/metrics')
+        def metrics():
+            """Request-timing histograms (Prometheus text, or ?format=json)"""
+            if request.args.get('format') == 'json':
+                return jsonify(self.to_dict())
+            return Response(self.render_prometheus(),
+                            mimetype='text/plain; version=0.0.4')
+
+        return self
+
+    def to_dict(self):
+        with self._lock:
+            endpoints = {}
+            for (endpoint, method), histogram in sorted(self._histograms.items()):
+                endpoints[f'{method} {endpoint}'] = {
+                    'count': histogram.count,
+                    'mean_ms': round(histogram.sum / histogram.count, 3),
+                    'p50_ms_le': histogram.quantile(0.50),
+                    'p95_ms_le': histogram.quantile(0.95),
+                    'p99_ms_le': histogram.quantile(0.99),
+                    'buckets_ms': {str(bound): n for bound, n in histogram.cumulative()}
+                }
+            statuses = {f'{method} {endpoint} {status}': n
+                        for (endpoint, method, status), n in sorted(self._statuses.items())}
+        return {
+            'service': self.service,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'endpoints': endpoints,
+            'responses': statuses
+        }
+
+    def render_prometheus(self):
+        lines = [
+            '# HELP uniplay_request_duration_ms Request latency in milliseconds',
+            '# TYPE uniplay_request_duration_ms histogram'
+        ]
+        with self._lock:
+            for (endpoint, method), histogram in sorted(self._histograms.items()):
+                labels = f'service="{self.service}",endpoint="{endpoint}",method="{method}"'
+                for bound, total in histogram.cumulative():
+                    lines.append(f'uniplay_request_duration_ms_bucket{{{labels},le="{bound}"}} {total}')
+                lines.append(f'uniplay_request_duration_ms_sum{{{labels}}} {histogram.sum:.3f}')
+                lines.append(f'uniplay_request_duration_ms_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP uniplay_requests_total Responses by status code')
+            lines.append('# TYPE uniplay_requests_total counter')
+            for (endpoint, method, status), n in sorted(self._statuses.items()):
+                lines.append(f'uniplay_requests_total{{service="{self.service}",endpoint="{endpoint}",'
+                             f'method="{method}",status="{status}"}} {n}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,161 @@
+"""
+Score-projection routes (XGBoost + Random Forest score models) as a Blueprint.
+
+app.py registers ``score_bp`` next to the win routes, so one process serves
+/predict-both, /predict-score-both and /predict-all from one model registry.
+app_score.py registers the same blueprint on its own for a standalone score
+service on port 5002.
+"""
+import logging
+
+from flask import Blueprint, request, jsonify
+
+from features import SCORE_FEATURE_COLUMNS, build_score_features, features_to_dict
+from model_executor import model_executor
+from model_registry import registry
+from prediction_cache import PredictionCache
+from service_logging import get_logger
+
+score_bp = Blueprint('score_api', __name__)
+
+logger = get_logger('score_api')
+
+FEATURE_COLUMNS = SCORE_FEATURE_COLUMNS
+
+# Shared by every viewer of the same ball (PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL)
+score_cache = PredictionCache.from_env()
+
+def calculate_score_features(data):
+    """Calculate features for score prediction as a float32 row"""
+    return build_score_features(data)
+
+def score_request_error(data):
+    """Why a score projection can't be made for ``data`` (None if it can)"""
+    for field in ['current_score', 'wickets_lost', 'overs_played']:
+        if field not in data:
+            return f'Missing field: {field}'
+    
+    # Only predict for innings 1
+    if data.get('innings', 1) != 1:
+        return 'Score prediction only available for first innings'
+    
+    # Check if innings complete
+    if data['overs_played'] >= data.get('total_overs', 20):
+        return 'Innings already complete'
+    return None
+
+def run_score_models(features, current_score):
+    """Run both score models on one feature row; returns (results, average_pred)"""
+    results = {}
+    models = {'xgboost': ('score_xgb', 'XGBoost', registry.get('score_xgb')),
+              'random_forest': ('score_rf', 'Random Forest', registry.get('score_rf'))}
+    
+    # Both models at once on the shared pool (per-model timeouts, see model_executor.py)
+    outcomes = model_executor.run({name: (key, model.predict, features)
+                                   for name, (key, _, model) in models.items() if model})
+    
+    for name, (key, model_name, model) in models.items():
+        if not model:
+            results[name] = {
+                'error': 'Model not available',
+                'predicted_score': None
+            }
+            continue
+        
+        outcome = outcomes[name]
+        if outcome.error is not None:
+            logger.error("Score prediction failed for %s: %s", model_name, outcome.error)
+            results[name] = {
+                'error': str(outcome.error),
+                'predicted_score': None,
+                'timing_ms': round(outcome.timing_ms, 3)
+            }
+            continue
+        
+        results[name] = {
+            'predicted_score': max(current_score, int(round(outcome.value[0]))),
+            'model': model_name,
+            'speed': registry.speed(key),
+            'timing_ms': round(outcome.timing_ms, 3)
+        }
+    
+    # Calculate average if both available
+    average_pred = None
+    if all('error' not in result for result in results.values()):
+        average_pred = int(round((results['xgboost']['predicted_score'] +
+                                 results['random_forest']['predicted_score']) / 2))
+        logger.debug("Score predictions: xgb=%s rf=%s average=%s",
+                     results['xgboost']['predicted_score'],
+                     results['random_forest']['predicted_score'], average_pred)
+    
+    return results, average_pred
+
+def predict_score(features, current_score):
+    """Cached run_score_models for one feature row"""
+    # Same normalized state as a recent request (e.g. another viewer of this ball)?
+    cache_key = PredictionCache.key_for(features, registry.version)
+    cached = score_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Score prediction served from cache")
+        return cached
+    
+    results, average_pred = run_score_models(features, current_score)
+    # Don't cache a timeout or other transient error from a loaded model
+    failed = ((registry.loaded('score_xgb') and 'error' in results['xgboost']) or
+              (registry.loaded('score_rf') and 'error' in results['random_forest']))
+    if not failed:
+        score_cache.set(cache_key, (results, average_pred))
+    return results, average_pred
+
+def score_response(data, results, average_pred):
+    """/predict-score-both response body"""
+    return {
+        'success': True,
+        'models': results,
+        'average_prediction': average_pred,
+        'match_context': {
+            'current_score': data['current_score'],
+            'wickets_lost': data['wickets_lost'],
+            'overs_played': data['overs_played'],
+            'overs_remaining': data['total_overs'] - data['overs_played']
+        }
+    }
+
+@score_bp.route('/predict-score-both', methods=['POST'])
+def predict_score_both():
+    """
+    Get score predictions from both models
+    
+    Request:
+    {
+        "current_score": 85,
+        "wickets_lost": 2,
+        "overs_played": 10.0,
+        "total_overs": 20
+    }
+    """
+    try:
+        data = request.json
+        
+        error = score_request_error(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        data.setdefault('total_overs', 20)
+        
+        features = calculate_score_features(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("predict-score-both features: %s", features_to_dict(features, FEATURE_COLUMNS))
+        
+        results, average_pred = predict_score(features, data['current_score'])
+        return jsonify(score_response(data, results, average_pred))
+        
+    except Exception as e:
+        logger.exception("Error in predict_score_both")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
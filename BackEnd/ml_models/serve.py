@@ -0,0 +1,190 @@
+"""
+Production entry point for the prediction APIs.
+
+    python ml_models/serve.py win          # app.py on :5001
+    python ml_models/serve.py score        # app_score.py on :5002
+    python ml_models/serve.py live         # live_feed.py on :5003
+    python ml_models/serve.py win --workers 4 --threads 4 --keepalive 5
+
+On Linux/macOS the service runs under gunicorn with ``preload_app``. The
+models are unpickled once in the master, gc.freeze() moves them out of the
+garbage collector's reach, and the forked workers share those pages
+copy-on-write. Where gunicorn is unavailable (Windows), waitress serves the
+app from a thread pool. ``--server werkzeug`` is the Flask development
+server without the debugger/reloader, kept for comparison in load_test.py.
+
+Each worker reloads models on its own (model_reload.py): set
+MODEL_WATCH_INTERVAL so every worker picks up replaced model files and
+POST /admin/reload requests that reached another worker.
+
+The live prediction feed (live_feed.py) keeps every match's state in one
+process, so it is a service of its own: one asyncio process where an open
+stream doesn't hold a thread. --server, --workers, --threads and
+--keepalive don't apply to it. The win and score APIs stay stateless and
+keep their worker processes.
+
+Options fall back to environment variables:
+    SERVE_SERVER      auto | gunicorn | waitress | werkzeug (default auto)
+    SERVE_WORKERS     worker processes (default: min(CPU count, 4))
+    SERVE_THREADS     threads per worker (default 2 for gunicorn, 8 for waitress;
+                      gunicorn with 1 thread uses sync workers, which ignore keep-alive)
+    SERVE_KEEPALIVE   seconds to keep idle connections open (default 5)
+    SERVE_TIMEOUT     worker timeout in seconds (default 30)
+    SERVE_HOST        bind address (default 0.0.0.0)
+    PORT              port (default 5001 for win, 5002 for score, 5003 for live)
+"""
+import argparse
+import gc
+import importlib
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+# service name -> (module, default port)
+SERVICES = {
+    'win': ('app', 5001),
+    'score': ('app_score', 5002),
+    'live': ('live_feed', 5003),
+}
+# Not WSGI apps: served by their module's run(host, port)
+STANDALONE_SERVICES = {'live'}
+
+
+def default_workers():
+    return min(os.cpu_count() or 1, 4)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a UniPlay prediction API')
+    parser.add_argument('service', choices=sorted(SERVICES))
+    parser.add_argument('--server', default=os.environ.get('SERVE_SERVER', 'auto'),
+                        choices=['auto', 'gunicorn', 'waitress', 'werkzeug'])
+    parser.add_argument('--host', default=os.environ.get('SERVE_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=os.environ.get('PORT'))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('SERVE_WORKERS', default_workers())))
+    parser.add_argument('--threads', type=int, default=os.environ.get('SERVE_THREADS'))
+    parser.add_argument('--keepalive', type=int, default=int(os.environ.get('SERVE_KEEPALIVE', 5)))
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('SERVE_TIMEOUT', 30)))
+    args = parser.parse_args(argv)
+    if args.port is None:
+        args.port = SERVICES[args.service][1]
+    args.port = int(args.port)
+    if args.threads is not None:
+        args.threads = int(args.threads)
+    return args
+
+
+def resolve_server(requested):
+    """Pick the best installed server for ``requested`` ('auto' prefers gunicorn)"""
+    if requested != 'auto':
+        return requested
+    if os.name != 'nt':
+        try:
+            import gunicorn  # noqa: F401
+            return 'gunicorn'
+        except ImportError:
+            pass
+    try:
+        import waitress  # noqa: F401
+        return 'waitress'
+    except ImportError:
+        return 'werkzeug'
+
+
+def load_app(service):
+    """Import the service module (loading its models) and return the Flask app"""
+    module = importlib.import_module(SERVICES[service][0])
+    # Models are loaded now; keep the collector from touching (and un-sharing) their pages
+    gc.collect()
+    gc.freeze()
+    return module.app
+
+
+def gunicorn_threads(args):
+    return args.threads or 2
+
+
+def gunicorn_options(args):
+    threads = gunicorn_threads(args)
+    return {
+        'bind': f'{args.host}:{args.port}',
+        'workers': args.workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'keepalive': args.keepalive,
+        'timeout': args.timeout,
+        'preload_app': True,
+        'accesslog': None,
+        'loglevel': os.environ.get('LOG_LEVEL', 'info').lower(),
+    }
+
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app(args.service)
+
+    PreloadedApplication(gunicorn_options(args)).run()
+
+
+def run_waitress(args):
+    from waitress import serve
+
+    # One process; concurrency comes from the thread pool
+    serve(load_app(args.service), host=args.host, port=args.port,
+          threads=args.threads or 8, channel_timeout=args.keepalive,
+          ident='uniplay')
+
+
+def run_werkzeug(args):
+    app = load_app(args.service)
+    app.run(host=args.host, port=args.port, debug=False, threaded=True, use_reloader=False)
+
+
+def run_standalone(args):
+    module = importlib.import_module(SERVICES[args.service][0])
+    module.run(host=args.host, port=args.port)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = 'asyncio' if args.service in STANDALONE_SERVICES else resolve_server(args.server)
+
+    print("=" * 70)
+    print(f"🚀 SERVING {args.service.upper()} API ({server})")
+    print("=" * 70)
+    print(f"📡 http://{args.host}:{args.port}")
+    if server == 'gunicorn':
+        threads = gunicorn_threads(args)
+        keepalive = f"keep-alive {args.keepalive}s" if threads > 1 else "no keep-alive (sync workers)"
+        print(f"⚙️  Workers: {args.workers} x {threads} threads, "
+              f"{keepalive}, models preloaded before fork")
+        if threads == 1 and args.keepalive:
+            print(f"⚠️  --keepalive {args.keepalive} is ignored by sync workers; use --threads 2 or more")
+    elif server == 'asyncio':
+        print("⚙️  Single process, event loop: streams don't hold threads")
+    elif server == 'waitress':
+        print(f"⚙️  Threads: {args.threads or 8}, keep-alive {args.keepalive}s (single process)")
+    else:
+        print("⚠️  Werkzeug development server (no debugger), for comparison only")
+    print("=" * 70 + "\n")
+
+    {'gunicorn': run_gunicorn, 'waitress': run_waitress, 'werkzeug': run_werkzeug,
+     'asyncio': run_standalone}[server](args)
+
+
+if __name__ == '__main__':
+    main()
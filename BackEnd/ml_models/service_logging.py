@@ -0,0 +1,107 @@
+"""
+Leveled, non-blocking logging for the prediction services.
+
+Request handlers log through ``get_logger(...)`` instead of print(). Records
+are put on an in-memory queue, and a background QueueListener thread writes
+them to stderr, so a request never waits on a console write. Per-request
+detail is logged at DEBUG. At the default INFO level, ``logger.debug(...)``
+returns before any message is built. Handlers also guard expensive arguments
+(feature dicts) with ``logger.isEnabledFor(logging.DEBUG)``.
+
+Environment:
+    LOG_LEVEL        DEBUG / INFO / WARNING / ERROR (default INFO)
+    LOG_FORMAT       'text' (default) or 'json' (one JSON object per line)
+    LOG_SAMPLE_RATE  fraction of DEBUG/INFO records kept, 0-1 (default 1);
+                     WARNING and above are always kept
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+ROOT_LOGGER = 'uniplay'
+
+_listener = None
+_queue_handler = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every WARNING+ record and a ``rate`` fraction of the rest"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; ``extra={'fields': {...}}`` adds keys"""
+
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) +
+                  f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _start_listener(root, stream):
+    """Queue handler on ``root`` plus the listener thread that drains it"""
+    global _listener, _queue_handler
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(SamplingFilter(float(os.environ.get('LOG_SAMPLE_RATE', 1))))
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    _listener.start()
+
+
+def configure_logging():
+    """Attach the queue handler to the 'uniplay' logger once per process"""
+    if _listener is not None:
+        return
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    root.propagate = False
+
+    stream = logging.StreamHandler(sys.stderr)
+    if os.environ.get('LOG_FORMAT', 'text').lower() == 'json':
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    _start_listener(root, stream)
+    atexit.register(lambda: _listener.stop())
+
+    def restart_in_child():
+        # Threads don't survive fork (gunicorn preload); give each worker its own listener
+        root.removeHandler(_queue_handler)
+        _start_listener(root, stream)
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=restart_in_child)
+
+
+def get_logger(name):
+    """Logger under 'uniplay' (e.g. get_logger('win_api') -> 'uniplay.win_api')"""
+    configure_logging()
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
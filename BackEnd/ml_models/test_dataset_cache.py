@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from dataset import load_training_data
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 DATASET CACHE TEST (concurrent loads while the source changes)")
+print("=" * 70)
+
+PROCESSES = 4
+ROUNDS = 40
+
+
+def write_source(path, rows, seed):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'current_score': rng.integers(0, 300, rows),
+        'wickets_lost': rng.integers(0, 11, rows),
+        'run_rate': rng.uniform(0, 20, rows).round(2),
+    }).to_csv(path, index=False)
+
+
+def load_and_check(path):
+    """Child process: load through the cache and compare with a plain parse"""
+    try:
+        cached = load_training_data(path)
+        expected = pd.read_csv(path)
+        ok = (len(cached) == len(expected)
+              and np.array_equal(cached['current_score'].to_numpy(), expected['current_score'].to_numpy())
+              and np.allclose(cached['run_rate'].to_numpy(), expected['run_rate'].to_numpy(), atol=1e-5))
+        return None if ok else 'cached columns differ from the source'
+    except Exception as e:
+        return f'{type(e).__name__}: {e}'
+
+
+failures = 0
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'training_data_ipl.csv')
+    context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    print(f"\n🏏 {ROUNDS} rounds x {PROCESSES} processes loading a changed source...")
+    held = None
+    pool = ProcessPoolExecutor(PROCESSES, mp_context=context)
+    try:
+        for round_number in range(ROUNDS):
+            write_source(path, 2000 + round_number, round_number)
+            # Every process finds a stale cache and tries to rebuild it at once
+            try:
+                errors = list(pool.map(load_and_check, [path] * PROCESSES))
+            except BrokenProcessPool:
+                # A reader was killed (SIGBUS on a truncated mapping)
+                errors = ['a loading process crashed']
+                pool.shutdown(cancel_futures=True)
+                pool = ProcessPoolExecutor(PROCESSES, mp_context=context)
+            for error in filter(None, errors):
+                failures += 1
+                print(f"   ❌ round {round_number}: {error}")
+
+            # Columns mapped by an earlier round stay readable after the rebuild
+            if held is not None:
+                frame, total = held
+                if int(frame['current_score'].sum()) != total:
+                    failures += 1
+                    print(f"   ❌ round {round_number}: a mapped column changed under its reader")
+            frame = load_training_data(path)
+            held = (frame, int(frame['current_score'].sum()))
+    finally:
+        pool.shutdown()
+
+    builds = [entry for entry in os.listdir(os.path.join(directory, '.cache', 'training_data_ipl.csv'))
+              if entry.startswith('build-')]
+    if len(builds) != 1:
+        failures += 1
+        print(f"   ❌ {len(builds)} builds left in the cache directory (expected 1)")
+
+print(f"   {'✅' if not failures else '❌'} {ROUNDS * PROCESSES} concurrent loads, {failures} failure(s)")
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} DATASET CACHE CHECK(S) FAILED")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ DATASET CACHE IS SAFE UNDER CONCURRENT LOADS")
+print("=" * 70)
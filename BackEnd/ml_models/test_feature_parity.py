@@ -0,0 +1,164 @@
+import os
+import pickle
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from features import (WIN_FEATURE_COLUMNS, SCORE_FEATURE_COLUMNS, build_win_features,
+                      build_win_feature_matrix, build_score_features, score_features_from_win)
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 FEATURE BUILDER PARITY TEST (NumPy rows vs one-row DataFrames)")
+print("=" * 70)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+
+# === Reference implementations: the old DataFrame paths ===
+def dataframe_win_features(data):
+    """Old app.py calculate_features"""
+    current_score = data.get('current_score', 0)
+    wickets_lost = data.get('wickets_lost', 0)
+    overs_played = data.get('overs_played', 0)
+    innings = data.get('innings', 1)
+    target = data.get('target', 0)
+    runs_needed = data.get('runs_needed', 0)
+    run_rate = current_score / overs_played if overs_played > 0 else 0
+    overs_left = 20 - overs_played
+    required_run_rate = runs_needed / overs_left if overs_left > 0 and innings == 2 else 0
+    return pd.DataFrame([{
+        'current_score': current_score,
+        'wickets_lost': wickets_lost,
+        'overs_played': overs_played,
+        'run_rate': round(run_rate, 2),
+        'innings': innings,
+        'target': target,
+        'runs_needed': runs_needed,
+        'wickets_remaining': 10 - wickets_lost,
+        'required_run_rate': round(required_run_rate, 2)
+    }])[WIN_FEATURE_COLUMNS]
+
+
+def dataframe_predict_features(features):
+    """Old predict.py predict_match (features from extract_features)"""
+    return pd.DataFrame([features])[WIN_FEATURE_COLUMNS]
+
+
+def dataframe_score_features(data):
+    """Old app_score.py calculate_score_features"""
+    current_score = data.get('current_score', 0)
+    overs_played = data.get('overs_played', 0)
+    run_rate = current_score / overs_played if overs_played > 0 else 0
+    return pd.DataFrame([{
+        'current_score': current_score,
+        'wickets_lost': data.get('wickets_lost', 0),
+        'overs_played': overs_played,
+        'run_rate': round(run_rate, 2),
+        'wickets_remaining': 10 - data.get('wickets_lost', 0),
+        'total_overs': data.get('total_overs', 20)
+    }])[SCORE_FEATURE_COLUMNS]
+
+
+def predict_features(state):
+    """predict.py extract_features output for an API-style state"""
+    overs, total_overs = state['overs_played'], 20
+    features = {
+        'current_score': state['current_score'],
+        'wickets_lost': state['wickets_lost'],
+        'overs_played': overs,
+        'total_overs': total_overs,
+        'innings': state['innings'],
+        'run_rate': state['current_score'] / overs if overs > 0 else 0,
+        'target': state['target'],
+        'runs_needed': state['runs_needed'],
+        'wickets_remaining': 10 - state['wickets_lost'],
+        'required_run_rate': 0
+    }
+    if state['innings'] == 2 and total_overs - overs > 0:
+        features['required_run_rate'] = state['runs_needed'] / (total_overs - overs)
+    return features
+
+
+# === Match states to compare ===
+rng = np.random.default_rng(42)
+states = []
+for _ in range(2000):
+    innings = int(rng.integers(1, 3))
+    overs = float(rng.choice([0, 0.1, 0.5, 3.3, 6, 10, 12.4, 15, 19.5, 20]))
+    score = int(rng.integers(0, 260))
+    target = int(rng.integers(100, 260)) if innings == 2 else 0
+    states.append({
+        'current_score': score,
+        'wickets_lost': int(rng.integers(0, 11)),
+        'overs_played': overs,
+        'innings': innings,
+        'target': target,
+        'runs_needed': max(0, target - score) if innings == 2 else 0,
+        'total_overs': 20
+    })
+
+failures = 0
+
+
+def check(name, ok):
+    global failures
+    print(f"   {'✅' if ok else '❌'} {name}")
+    if not ok:
+        failures += 1
+
+
+print(f"\n🧮 Comparing features for {len(states)} match states...")
+check("app.py win features", all(
+    np.array_equal(build_win_features(s), dataframe_win_features(s).to_numpy(np.float32))
+    for s in states
+))
+check("app.py batch win features", np.array_equal(
+    build_win_feature_matrix(states),
+    np.vstack([dataframe_win_features(s).to_numpy(np.float32) for s in states])
+))
+check("predict.py win features", all(
+    np.array_equal(
+        build_win_features(predict_features(s), total_overs=20, round_rates=False),
+        dataframe_predict_features(predict_features(s)).to_numpy(np.float32)
+    )
+    for s in states
+))
+check("app_score.py score features", all(
+    np.array_equal(build_score_features(s), dataframe_score_features(s).to_numpy(np.float32))
+    for s in states
+))
+check("app.py /predict-all score features (from the win row)", all(
+    np.array_equal(score_features_from_win(build_win_features(s), s['total_overs']),
+                   dataframe_score_features(s).to_numpy(np.float32))
+    for s in states
+))
+
+print("\n🤖 Comparing model outputs...")
+for filename, builder, reference, method in [
+    ('model_xgb.pkl', build_win_features, dataframe_win_features, 'predict_proba'),
+    ('model_rf.pkl', build_win_features, dataframe_win_features, 'predict_proba'),
+    ('model_score_xgb.pkl', build_score_features, dataframe_score_features, 'predict'),
+    ('model_score_rf.pkl', build_score_features, dataframe_score_features, 'predict'),
+]:
+    path = os.path.join(MODELS_DIR, filename)
+    if not os.path.exists(path):
+        print(f"   ⚠️  {filename} not found, skipping")
+        continue
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+    predict = getattr(model, method)
+    check(filename, all(
+        np.array_equal(predict(builder(s)), predict(reference(s))) for s in states[:300]
+    ))
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} PARITY CHECK(S) FAILED")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ FEATURE BUILDERS MATCH THE DATAFRAME PATH")
+print("=" * 70)
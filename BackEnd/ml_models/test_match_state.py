@@ -0,0 +1,147 @@
+import sys
+import warnings
+
+import numpy as np
+
+from features import build_win_features
+from match_state import MatchState
+from predict import extract_features
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 MATCH STATE TEST (ball deltas vs full match documents)")
+print("=" * 70)
+
+EXTRAS = [('none', 0), ('wide', 1), ('noBall', 1), ('bye', 1), ('legBye', 2), ('wides', 5)]
+
+
+def random_ball(rng):
+    extras_type, extras = EXTRAS[0] if rng.random() < 0.85 else EXTRAS[rng.integers(1, len(EXTRAS))]
+    return {
+        'runs': int(rng.choice([0, 0, 1, 1, 2, 4, 6])) if extras_type not in ('wide', 'wides') else 0,
+        'extras': extras,
+        'extrasType': extras_type,
+        'isWicket': bool(rng.random() < 0.05)
+    }
+
+
+def compact(ball):
+    """Node's compactBall (src/utils/matchEvents.js)"""
+    codes = {'wide': 'wd', 'wides': 'wd', 'noBall': 'nb', 'bye': 'b', 'legBye': 'lb'}
+    event = {'r': ball['runs']}
+    if ball['extras']:
+        event['x'] = ball['extras']
+    if ball['extrasType'] in codes:
+        event['t'] = codes[ball['extrasType']]
+    if ball['isWicket']:
+        event['w'] = 1
+    return event
+
+
+def score_ball(innings, ball):
+    """Node's updateBall on one innings of the LiveMatch document"""
+    innings['ballByBall'].append(ball)
+    innings['score'] += ball['runs'] + ball['extras']
+    innings['extras'] += ball['extras']
+    if ball['extrasType'] not in ('wide', 'wides', 'noBall'):
+        innings['balls'] += 1
+    innings['overs'] = innings['balls'] // 6 + (innings['balls'] % 6) / 10
+    if ball['isWicket']:
+        innings['wickets'] += 1
+
+
+def new_innings(number, batting):
+    return {'inningsNumber': number, 'battingTeam': {'_id': batting}, 'score': 0, 'wickets': 0,
+            'balls': 0, 'overs': 0, 'extras': 0, 'ballByBall': []}
+
+
+failures = 0
+checks = 0
+
+
+def check(name, ok):
+    global failures, checks
+    checks += 1
+    if not ok:
+        failures += 1
+        print(f"   ❌ {name}")
+
+
+rng = np.random.default_rng(11)
+matches = 200
+print(f"\n🏏 Replaying {matches} random matches ball by ball...")
+for m in range(matches):
+    total_overs = int(rng.choice([5, 10, 20]))
+    team_a_bats_first = bool(rng.random() < 0.5)
+    doc = {'totalOvers': total_overs, 'currentInnings': 1, 'teamA': {'_id': 'A'},
+           'innings': [new_innings(1, 'A' if team_a_bats_first else 'B')]}
+    state = MatchState(total_overs=total_overs, team_a_batting=team_a_bats_first)
+    # What the live feed and the worker hold: rebuilt from compact events only
+    events = MatchState(total_overs=total_overs, team_a_batting=team_a_bats_first)
+
+    for innings_number in (1, 2):
+        if innings_number == 2:
+            doc['innings'].append(new_innings(2, 'B' if team_a_bats_first else 'A'))
+            doc['currentInnings'] = 2
+            state.apply({'e': 'innings'})
+            events.apply({'e': 'innings'})
+        innings = doc['innings'][innings_number - 1]
+        target = doc['innings'][0]['score'] + 1
+
+        while innings['wickets'] < 10 and innings['balls'] < total_overs * 6:
+            if innings_number == 2 and innings['score'] >= target:
+                break
+            ball = random_ball(rng)
+            score_ball(innings, ball)
+            state.apply(ball)
+            events.apply(compact(ball))
+
+            full = build_win_features(extract_features(doc), total_overs=total_overs, round_rates=False)
+            tag = f"match {m} innings {innings_number} ball {len(innings['ballByBall'])}"
+            check(f"{tag}: predict.py features", np.array_equal(state.features(round_rates=False), full))
+            check(f"{tag}: compact events", np.array_equal(events.features(round_rates=False), full))
+            check(f"{tag}: app.py features", np.array_equal(
+                state.features(), build_win_features(state.to_dict(), total_overs=total_overs)))
+            check(f"{tag}: snapshot round trip", np.array_equal(
+                MatchState.from_snapshot(state.to_dict()).features(), state.features()))
+            check(f"{tag}: from the document", np.array_equal(
+                MatchState.from_match_document(doc).features(round_rates=False), full))
+            check(f"{tag}: batting side", state.team_a_batting == (
+                innings['battingTeam']['_id'] == doc['teamA']['_id']))
+print(f"   {'✅' if not failures else '❌'} {checks - failures}/{checks} checks passed")
+
+print("\n🔁 Innings rules...")
+state = MatchState(total_overs=1)
+state.apply_all([{'r': 1}] * 6)
+check("over rollover: 6 legal balls = 1.0 overs", state.overs_played == 1.0 and state.over == (1, 0))
+state.apply({'r': 2})
+check("ball after a completed first innings starts the chase",
+      state.innings == 2 and state.target == 7 and state.score == 2 and state.balls == 1)
+state.apply({'e': 'innings'})
+check("innings event during the chase is ignored", state.innings == 2 and state.score == 2)
+state.apply({'r': 0, 'x': 1, 't': 'wd'})
+check("wide is not a legal ball", state.balls == 1 and state.score == 3)
+try:
+    state.apply({'t': 'zz'})
+    check("unknown extras type is rejected", False)
+except ValueError:
+    check("unknown extras type is rejected", True)
+state = MatchState(total_overs=20)
+state.apply({'r': 1})
+for bad in ({'r': 'x'}, {'r': None}, {'x': '1.5'}, 'four'):
+    before = state.to_dict()
+    try:
+        state.apply_all([{'r': 4}, {'e': 'innings'}, bad])
+        check(f"bad event {bad!r} is rejected", False)
+    except ValueError:
+        check(f"bad event {bad!r} leaves the batch unapplied", state.to_dict() == before)
+print(f"   {'✅' if not failures else '❌'} innings switch, rollover, extras, bad batches")
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} MATCH STATE CHECK(S) FAILED")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ MATCH STATE MATCHES THE FULL-DOCUMENT PATH")
+print("=" * 70)
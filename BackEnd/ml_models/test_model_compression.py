@@ -0,0 +1,74 @@
+import os
+import pickle
+import sys
+import warnings
+
+import numpy as np
+
+from dataset import load_training_data
+from model_compression import limit_depth
+from tune_models import task_splits
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 DEPTH-LIMITED XGBOOST TEST (predictions before vs after pruning)")
+print("=" * 70)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+MAX_DEPTH = 4
+
+try:
+    data = load_training_data()
+except FileNotFoundError:
+    print("\n⚠️  Training data not found, skipping")
+    sys.exit(0)
+
+failures = 0
+
+# Pruned leaves must be on the model's own learning-rate scale: a few runs /
+# a few points of probability, not a shifted prediction for every row
+for filename, task, limit in [
+    ('model_score_xgb.pkl', 'score', 10.0),    # mean |change| in projected runs
+    ('model_xgb.pkl', 'win', 0.08),            # mean |change| in win probability
+]:
+    path = os.path.join(MODELS_DIR, filename)
+    if not os.path.exists(path):
+        print(f"\n⚠️  {filename} not found, skipping")
+        continue
+    # The pickle as saved: its booster carries XGBoost's default eta, not the
+    # wrapper's learning_rate (for_serving() would sync them and hide a regression)
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+
+    splits = task_splits(data, task)
+    X_train, y_train = splits['train']
+    X_test, y_test = splits['test']
+    pruned = limit_depth(model, MAX_DEPTH, X_train, y_train)
+
+    if task == 'win':
+        before, after = model.predict_proba(X_test)[:, 1], pruned.predict_proba(X_test)[:, 1]
+        quality = f"accuracy {np.mean(model.predict(X_test) == y_test):.3f} -> " \
+                  f"{np.mean(pruned.predict(X_test) == y_test):.3f}"
+        ok = True
+    else:
+        before, after = model.predict(X_test), pruned.predict(X_test)
+        mae_before = float(np.mean(np.abs(before - y_test)))
+        mae_after = float(np.mean(np.abs(after - y_test)))
+        quality = f"test MAE {mae_before:.1f} -> {mae_after:.1f} runs"
+        ok = mae_after <= mae_before * 1.1
+    change = float(np.mean(np.abs(after - before)))
+    ok = ok and change <= limit
+
+    print(f"\n{'✅' if ok else '❌'} {filename} cut at depth {MAX_DEPTH}: {quality}")
+    print(f"   Mean |change| per test row: {change:.4f} (limit {limit:g})")
+    if not ok:
+        failures += 1
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} PRUNED MODEL(S) DRIFTED FROM THE ORIGINAL")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ PRUNED MODELS STAY CLOSE TO THE ORIGINALS")
+print("=" * 70)
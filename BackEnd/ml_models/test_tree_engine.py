@@ -0,0 +1,76 @@
+import os
+import pickle
+import sys
+import warnings
+
+import numpy as np
+
+from tree_engine import compile_model
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 COMPILED TREE ENGINE PARITY TEST")
+print("=" * 70)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# Random match states covering the whole input range (plus a few edge rows)
+rng = np.random.default_rng(7)
+n = 20000
+X_win = np.column_stack([
+    rng.integers(0, 300, n),             # current_score
+    rng.integers(0, 11, n),              # wickets_lost
+    rng.integers(0, 201, n) / 10,        # overs_played
+    rng.uniform(0, 20, n).round(2),      # run_rate
+    rng.integers(1, 3, n),               # innings
+    rng.integers(0, 300, n),             # target
+    rng.integers(0, 300, n),             # runs_needed
+    rng.integers(0, 11, n),              # wickets_remaining
+    rng.uniform(0, 36, n).round(2),      # required_run_rate
+]).astype(np.float32)
+X_win[:3] = 0
+X_score = X_win[:, [0, 1, 2, 3, 7]]
+X_score = np.column_stack([X_score, np.full(n, 20)]).astype(np.float32)
+
+failures = 0
+
+for filename, X, method, tolerance in [
+    ('model_xgb.pkl', X_win, 'predict_proba', 1e-6),
+    ('model_rf.pkl', X_win, 'predict_proba', 1e-9),
+    ('model_score_xgb.pkl', X_score, 'predict', 1e-5),
+    ('model_score_rf.pkl', X_score, 'predict', 1e-9),
+]:
+    path = os.path.join(MODELS_DIR, filename)
+    if not os.path.exists(path):
+        print(f"\n⚠️  {filename} not found, skipping")
+        continue
+
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+    compiled = compile_model(model)
+
+    expected = getattr(model, method)(X)
+    actual = getattr(compiled, method)(X)
+    # Relative error for regressors (scores ~100-250), absolute for probabilities
+    scale = np.maximum(np.abs(expected), 1.0)
+    max_error = float(np.max(np.abs(expected - actual) / scale))
+    ok = max_error <= tolerance
+
+    if method == 'predict_proba':
+        same_class = np.array_equal(model.predict(X), compiled.predict(X))
+        ok = ok and same_class
+
+    print(f"\n{'✅' if ok else '❌'} {filename}: {compiled.n_trees} trees, "
+          f"{compiled.n_nodes} nodes, depth {compiled.max_depth}")
+    print(f"   Max error over {n} rows: {max_error:.2e} (tolerance {tolerance:.0e})")
+    if not ok:
+        failures += 1
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} MODEL(S) DIFFER FROM THE ORIGINAL")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ COMPILED MODELS MATCH THE ORIGINALS")
+print("=" * 70)
@@ -0,0 +1,124 @@
+import os
+import pickle
+import sys
+import warnings
+
+import numpy as np
+
+from features import win_feature_matrix_from_arrays
+from win_table import QUANT_SCALE, TABLE_DIR_NAME, TableBackedModel, WinProbabilityTable, overs_grid
+
+warnings.filterwarnings('ignore')
+
+print("=" * 70)
+print("🔍 WIN TABLE PARITY TEST (table lookups vs XGBoost predict_proba)")
+print("=" * 70)
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+MODEL_PATH = os.path.join(MODELS_DIR, 'model_xgb.pkl')
+TABLE_DIR = os.environ.get('WIN_TABLE_DIR', os.path.join(MODELS_DIR, TABLE_DIR_NAME))
+
+if not os.path.exists(MODEL_PATH):
+    print(f"\n⚠️  {MODEL_PATH} not found, skipping")
+    sys.exit(0)
+table = WinProbabilityTable.load(TABLE_DIR, MODEL_PATH)
+if table is None:
+    print(f"\n⚠️  No win table for this model in {TABLE_DIR} (python build_win_table.py), skipping")
+    sys.exit(0)
+
+with open(MODEL_PATH, 'rb') as f:
+    model = pickle.load(f)
+
+# Innings 1 is stored as float32; innings 2 is rounded to 1/QUANT_SCALE
+FLOAT_TOLERANCE = 1e-6
+QUANT_TOLERANCE = 0.5 / QUANT_SCALE + FLOAT_TOLERANCE
+
+rng = np.random.default_rng(13)
+n = 20000
+overs = overs_grid()
+failures = 0
+
+
+def states(**columns):
+    return win_feature_matrix_from_arrays(**{k: np.asarray(v, dtype=np.float64)
+                                             for k, v in columns.items()})
+
+
+def check_grid(name, X, tolerance):
+    """Every row must come from the table, within ``tolerance`` of the model"""
+    global failures
+    looked_up = [table.lookup(row) for row in X]
+    missing = sum(value is None for value in looked_up)
+    expected = model.predict_proba(X)[:, 1]
+    actual = np.array([np.nan if value is None else value for value in looked_up])
+    max_error = float(np.nanmax(np.abs(expected - actual))) if missing < len(X) else 0.0
+    ok = missing == 0 and max_error <= tolerance
+    print(f"\n{'✅' if ok else '❌'} {name}: {len(X) - missing}/{len(X)} rows from the table")
+    print(f"   Max error: {max_error:.2e} (tolerance {tolerance:.1e})")
+    if not ok:
+        failures += 1
+
+
+# === Grid states ===
+score = rng.integers(0, table.max_score + 1, n)
+check_grid("Innings 1 grid states", states(
+    current_score=score,
+    wickets_lost=rng.integers(0, 11, n),
+    overs_played=overs[rng.integers(0, len(overs), n)],
+    innings=np.ones(n),
+    target=np.zeros(n),
+    runs_needed=np.zeros(n),
+), FLOAT_TOLERANCE)
+
+target = rng.integers(table.target_min, table.meta['target_max'] + 1, n)
+if table.target_step > 1:
+    # Interpolated targets are approximate by design; test only the stored ones
+    target = table.target_min + (target - table.target_min) // table.target_step * table.target_step
+runs_needed = rng.integers(0, table.max_runs_needed + 1, n)
+offset = rng.integers(0, 2, n)
+runs_needed = np.minimum(runs_needed, target + offset)
+check_grid("Innings 2 grid states", states(
+    current_score=target - runs_needed + offset,
+    wickets_lost=rng.integers(0, 11, n),
+    overs_played=overs[rng.integers(0, len(overs), n)],
+    innings=np.full(n, 2),
+    target=target,
+    runs_needed=runs_needed,
+), QUANT_TOLERANCE)
+
+# === Out-of-grid states: no lookup, answered by the live model ===
+m = 2000
+off_grid = np.concatenate([
+    # Mid-over decimals (12.7)
+    states(current_score=rng.integers(0, 200, m), wickets_lost=rng.integers(0, 11, m),
+           overs_played=rng.integers(0, 20, m) + rng.integers(6, 10, m) / 10,
+           innings=np.ones(m), target=np.zeros(m), runs_needed=np.zeros(m)),
+    # First-innings scores above the grid
+    states(current_score=rng.integers(table.max_score + 1, table.max_score + 100, m),
+           wickets_lost=rng.integers(0, 11, m), overs_played=overs[rng.integers(0, len(overs), m)],
+           innings=np.ones(m), target=np.zeros(m), runs_needed=np.zeros(m)),
+    # Targets outside the grid
+    states(current_score=np.zeros(m), wickets_lost=rng.integers(0, 11, m),
+           overs_played=overs[rng.integers(0, len(overs), m)], innings=np.full(m, 2),
+           target=np.full(m, table.meta['target_max'] + 1), runs_needed=np.full(m, table.meta['target_max'] + 1)),
+    # Score not consistent with target - runs_needed (offset outside 0..1)
+    states(current_score=np.full(m, 50), wickets_lost=rng.integers(0, 11, m),
+           overs_played=overs[rng.integers(0, len(overs), m)], innings=np.full(m, 2),
+           target=np.full(m, table.target_min), runs_needed=np.full(m, 10)),
+])
+outside = sum(table.lookup(row) is not None for row in off_grid)
+backed = TableBackedModel(model, table)
+max_error = float(np.max(np.abs(backed.predict_proba(off_grid) - model.predict_proba(off_grid))))
+ok = outside == 0 and max_error <= FLOAT_TOLERANCE
+print(f"\n{'✅' if ok else '❌'} Out-of-grid states: {outside}/{len(off_grid)} answered from the table")
+print(f"   Max error through TableBackedModel: {max_error:.2e} (live model, tolerance {FLOAT_TOLERANCE:.1e})")
+if not ok:
+    failures += 1
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} WIN TABLE CHECK(S) FAILED")
+    print("=" * 70)
+    sys.exit(1)
+print("✅ WIN TABLE MATCHES THE MODEL")
+print("=" * 70)
@@ -6,13 +6,16 @@ import xgboost as xgb
 import pickle
 import os
 
+from dataset import load_training_data
+from training_config import xgb_training_params, for_serving
+
 print("=" * 70)
 print("🤖 XGBoost MODEL TRAINING - IPL DATA")
 print("=" * 70)
 
 # Load IPL training data
 print("\n📂 Loading training data...")
-df = pd.read_csv('data/training_data_ipl.csv')
+df = load_training_data('data/training_data_ipl.csv')
 print(f"✅ Loaded {len(df)} samples")
 print(f"   Win samples: {sum(df['team_won'] == 1)}")
 print(f"   Loss samples: {sum(df['team_won'] == 0)}")
@@ -45,8 +48,10 @@ model = xgb.XGBClassifier(
     max_depth=6,
     learning_rate=0.1,
     random_state=42,
-    eval_metric='logloss'
+    eval_metric='logloss',
+    **xgb_training_params()  # tree_method='hist', all cores (TRAIN_N_JOBS)
 )
+print(f"   ⚙️  tree_method={model.tree_method}, n_jobs={model.n_jobs}")
 
 model.fit(X_train, y_train)
 print("✅ Training complete!")
@@ -83,7 +88,8 @@ model_path = 'ml_models/models/model_xgb.pkl'
 os.makedirs('ml_models/models', exist_ok=True)
 
 with open(model_path, 'wb') as f:
-    pickle.dump(model, f)
+    # Predictions are one row at a time: save with PREDICT_N_JOBS threads (default 1)
+    pickle.dump(for_serving(model), f)
 
 print(f"\n💾 Model saved: {model_path}")
 
@@ -7,13 +7,16 @@ import pickle
 import os
 import time
 
+from dataset import load_training_data
+from training_config import rf_training_params, for_serving
+
 print("=" * 70)
 print("🌲 RANDOM FOREST MODEL TRAINING - IPL DATA")
 print("=" * 70)
 
 # Load IPL training data
 print("\n📂 Loading training data...")
-df = pd.read_csv('data/training_data_ipl.csv')
+df = load_training_data('data/training_data_ipl.csv')
 print(f"✅ Loaded {len(df)} samples")
 print(f"   Win samples: {sum(df['team_won'] == 1)}")
 print(f"   Loss samples: {sum(df['team_won'] == 0)}")
@@ -49,8 +52,9 @@ model = RandomForestClassifier(
     min_samples_split=5,
     min_samples_leaf=2,
     random_state=42,
-    n_jobs=-1  # Use all CPU cores
+    **rf_training_params()  # All cores (TRAIN_N_JOBS)
 )
+print(f"   ⚙️  n_jobs={model.n_jobs}")
 
 model.fit(X_train, y_train)
 training_time = time.time() - start_time
@@ -92,7 +96,8 @@ model_path = 'ml_models/models/model_rf.pkl'
 os.makedirs('ml_models/models', exist_ok=True)
 
 with open(model_path, 'wb') as f:
-    pickle.dump(model, f)
+    # Predictions are one row at a time: save with PREDICT_N_JOBS threads (default 1)
+    pickle.dump(for_serving(model), f)
 
 print(f"\n💾 Model saved: {model_path}")
 
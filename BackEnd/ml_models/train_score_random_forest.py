@@ -7,6 +7,9 @@ import pickle
 import os
 import time
 
+from dataset import find_training_data, load_training_data
+from training_config import rf_training_params, for_serving
+
 print("=" * 70)
 print("🌲 RANDOM FOREST SCORE PREDICTION MODEL TRAINING - IPL DATA")
 print("=" * 70)
@@ -16,19 +19,9 @@ current_dir = os.getcwd()
 print(f"\n📂 Current Directory: {current_dir}")
 
 # Find the training data file
-possible_paths = [
-    'data/training_data_ipl.csv',
-    '../data/training_data_ipl.csv',
-    './training_data_ipl.csv',
-    'ml_models/data/training_data_ipl.csv'
-]
-
-training_data_path = None
-for path in possible_paths:
-    if os.path.exists(path):
-        training_data_path = path
-        print(f"✅ Found training data at: {path}")
-        break
+training_data_path = find_training_data()
+if training_data_path:
+    print(f"✅ Found training data at: {training_data_path}")
 
 if not training_data_path:
     print("\n❌ ERROR: training_data_ipl.csv not found!")
@@ -37,21 +30,24 @@ if not training_data_path:
 
 # Load training data
 print(f"\n📂 Loading training data...")
-df = pd.read_csv(training_data_path)
+df = load_training_data(training_data_path)
 print(f"✅ Loaded {len(df)} samples")
 
-# Check if final_score exists
-if 'final_score' not in df.columns:
-    print("\n❌ ERROR: 'final_score' column not found!")
+# Regression target: the actual innings total (generate_training_data.py),
+# or the heuristic final_score for data generated before it was recorded
+target_column = 'innings_total' if 'innings_total' in df.columns else 'final_score'
+if target_column not in df.columns:
+    print("\n❌ ERROR: neither 'innings_total' nor 'final_score' column found!")
     print(f"   Available columns: {list(df.columns)}")
-    print("\n💡 Solution: Run 'python ml_models/add_final_score_column.py' first")
+    print("\n💡 Solution: Run 'python ml_models/generate_training_data.py' first")
     exit(1)
+print(f"🎯 Target: {target_column}")
 
 # Filter only first innings for score prediction
 df_innings1 = df[df['innings'] == 1].copy()
 print(f"✅ First innings samples: {len(df_innings1)}")
-print(f"   Average final score: {df_innings1['final_score'].mean():.2f}")
-print(f"   Score range: {df_innings1['final_score'].min()} - {df_innings1['final_score'].max()}")
+print(f"   Average final score: {df_innings1[target_column].mean():.2f}")
+print(f"   Score range: {df_innings1[target_column].min()} - {df_innings1[target_column].max()}")
 
 # Features for score prediction
 print("\n🔍 Preparing features...")
@@ -68,7 +64,7 @@ if missing_features:
     exit(1)
 
 X = df_innings1[feature_columns]
-y = df_innings1['final_score']
+y = df_innings1[target_column]
 
 print(f"✅ Features: {len(feature_columns)}")
 print(f"   {', '.join(feature_columns)}")
@@ -91,8 +87,9 @@ model = RandomForestRegressor(
     min_samples_split=5,
     min_samples_leaf=2,
     random_state=42,
-    n_jobs=-1  # Use all CPU cores
+    **rf_training_params()  # All cores (TRAIN_N_JOBS)
 )
+print(f"   ⚙️  n_jobs={model.n_jobs}")
 
 model.fit(X_train, y_train)
 training_time = time.time() - start_time
@@ -113,6 +110,15 @@ print(f"\n🎯 Model Performance:")
 print(f"   RMSE (Root Mean Squared Error): {rmse:.2f} runs")
 print(f"   MAE (Mean Absolute Error): {mae:.2f} runs")
 print(f"   R² Score: {r2:.4f}")
+
+# Error against what the innings actually finished on
+if 'innings_total' in df_innings1.columns:
+    actual_totals = df_innings1.loc[X_test.index, 'innings_total']
+    print(f"\n🏏 MAE vs actual innings totals:")
+    print(f"   {'Model:':<22} {mean_absolute_error(actual_totals, y_pred):.2f} runs")
+    if 'final_score' in df_innings1.columns:
+        heuristic = df_innings1.loc[X_test.index, 'final_score']
+        print(f"   {'final_score formula:':<22} {mean_absolute_error(actual_totals, heuristic):.2f} runs")
 print(f"   ⏱️  Prediction time: {prediction_time:.4f}s")
 
 # Show sample predictions
@@ -151,7 +157,8 @@ os.makedirs(model_dir, exist_ok=True)
 model_path = os.path.join(model_dir, 'model_score_rf.pkl')
 
 with open(model_path, 'wb') as f:
-    pickle.dump(model, f)
+    # Predictions are one row at a time: save with PREDICT_N_JOBS threads (default 1)
+    pickle.dump(for_serving(model), f)
 
 print(f"\n💾 Model saved: {model_path}")
 print(f"   File size: {os.path.getsize(model_path) / 1024:.2f} KB")
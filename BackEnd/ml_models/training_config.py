@@ -0,0 +1,66 @@
+"""
+Shared threading / tree-construction settings for the model trainers.
+
+    model = xgb.XGBClassifier(n_estimators=100, ..., **xgb_training_params())
+    model = RandomForestClassifier(n_estimators=100, ..., **rf_training_params())
+    model.fit(X_train, y_train)
+    pickle.dump(for_serving(model), f)
+
+XGBoost builds trees with the histogram method and both libraries use every
+available core while fitting. The saved model is switched to a small
+prediction thread count, because the APIs predict one row at a time and
+parallelise across worker processes (serve.py) instead.
+
+Environment variables:
+    TRAIN_N_JOBS      threads per fit (default: all cores available to the process)
+    XGB_TREE_METHOD   hist | approx | exact (default hist)
+    PREDICT_N_JOBS    threads a loaded model uses per prediction (default 1)
+"""
+import os
+
+DEFAULT_TREE_METHOD = 'hist'
+DEFAULT_PREDICT_N_JOBS = 1
+
+
+def available_cores():
+    """CPU cores this process may run on (respects taskset / container CPU sets)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _env_jobs(name, default):
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+    jobs = int(value)
+    # -1 / 0 mean "all cores", as for scikit-learn's n_jobs=-1
+    return available_cores() if jobs <= 0 else jobs
+
+
+def train_n_jobs():
+    return _env_jobs('TRAIN_N_JOBS', available_cores())
+
+
+def predict_n_jobs():
+    return _env_jobs('PREDICT_N_JOBS', DEFAULT_PREDICT_N_JOBS)
+
+
+def xgb_training_params(n_jobs=None):
+    """XGBClassifier / XGBRegressor keyword arguments for fitting"""
+    return {
+        'tree_method': os.environ.get('XGB_TREE_METHOD', DEFAULT_TREE_METHOD),
+        'n_jobs': n_jobs or train_n_jobs()
+    }
+
+
+def rf_training_params(n_jobs=None):
+    """RandomForestClassifier / RandomForestRegressor keyword arguments for fitting"""
+    return {'n_jobs': n_jobs or train_n_jobs()}
+
+
+def for_serving(model, n_jobs=None):
+    """Set ``model``'s prediction thread count (PREDICT_N_JOBS); returns the model"""
+    if hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs or predict_n_jobs())
+    return model
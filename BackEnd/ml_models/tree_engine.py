@@ -0,0 +1,282 @@
+"""
+Compiled tree-ensemble inference for the win and score models.
+
+The served models are small (100-150 trees) and are almost always asked
+about one row at a time, where the generic sklearn/xgboost ``predict``
+spends most of its time in Python dispatch and input validation. This
+module flattens every tree of a fitted RandomForest or XGBoost model into
+a handful of NumPy arrays:
+
+    feature    int32    split feature per node (0 for leaves)
+    threshold  float    split threshold per node
+    left       int32    left child (global node index, -1 for leaves)
+    right      int32    right child (global node index, -1 for leaves)
+    value      float64  leaf output per node
+
+and evaluates all trees at once with a vectorized level-by-level walk.
+
+The compiled model exposes the same ``predict``/``predict_proba``/``classes_``
+surface as the original, so app.py and app_score.py can swap it in per model:
+
+    INFERENCE_BACKEND=compiled            every model
+    INFERENCE_BACKEND_XGB=compiled        only the XGBoost win model
+    INFERENCE_BACKEND_SCORE_RF=native     keep the RF score model native
+
+Large batches (e.g. /predict-batch) are faster in the native C++ loops, so
+a compiled model hands inputs above COMPILED_MAX_BATCH rows (default 64)
+back to the original model it was built from.
+"""
+import json
+import os
+
+import numpy as np
+
+NATIVE = 'native'
+COMPILED = 'compiled'
+
+# Above this many rows the native libraries' C++ loops win; hand over to them
+NATIVE_BATCH_THRESHOLD = int(os.environ.get('COMPILED_MAX_BATCH', 64))
+
+
+class CompiledTreeEnsemble:
+    """Flattened tree ensemble evaluated with NumPy"""
+
+    def __init__(self, kind, feature, threshold, left, right, value, roots,
+                 max_depth, n_features, classes=None, base_margin=0.0,
+                 default_left=None):
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.base_margin = base_margin
+        self.default_left = default_left
+        self.native_model = None
+        if classes is not None:
+            self.classes_ = np.asarray(classes)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _leaf_values(self, X):
+        """Leaf output of every tree for every row, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            left = self.left[node]
+            is_split = left >= 0
+            if not is_split.any():
+                break
+            x = np.take_along_axis(X, self.feature[node], axis=1)
+            if self.kind.startswith('xgb'):
+                # XGBoost: x < threshold goes left, missing values follow default_left
+                go_left = np.where(np.isnan(x), self.default_left[node],
+                                   x < self.threshold[node])
+            else:
+                # scikit-learn: x <= threshold goes left
+                go_left = x <= self.threshold[node]
+            next_node = np.where(go_left, left, self.right[node])
+            node = np.where(is_split, next_node, node)
+
+        return self.value[node]
+
+    def _raw(self, X):
+        leaves = self._leaf_values(X)
+        if self.kind.startswith('xgb'):
+            return self.base_margin + leaves.sum(axis=1)
+        return leaves.mean(axis=1)
+
+    def _use_native(self, X):
+        return self.native_model is not None and len(X) > NATIVE_BATCH_THRESHOLD
+
+    def predict_proba(self, X):
+        if self._use_native(X):
+            return self.native_model.predict_proba(X)
+        if self.kind == 'xgb_classifier':
+            win = 1.0 / (1.0 + np.exp(-self._raw(X)))
+            return np.column_stack([1.0 - win, win]).astype(np.float32)
+        if self.kind == 'rf_classifier':
+            # RF leaves hold one normalized value per class; average over trees
+            return self._raw(X)
+        raise AttributeError(f"{self.kind} has no predict_proba")
+
+    def predict(self, X):
+        if self._use_native(X):
+            return self.native_model.predict(X)
+        if self.kind in ('xgb_classifier', 'rf_classifier'):
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        raw = self._raw(X)
+        return raw.astype(np.float32) if self.kind == 'xgb_regressor' else raw
+
+
+def _pack(trees, kind, n_features, classes=None, base_margin=0.0, xgboost=False):
+    """Concatenate per-tree node arrays into one global node table"""
+    offsets = np.cumsum([0] + [len(t['feature']) for t in trees])
+    feature = np.concatenate([t['feature'] for t in trees]).astype(np.int32)
+    left = np.concatenate([
+        np.where(t['left'] >= 0, t['left'] + offset, -1)
+        for t, offset in zip(trees, offsets)
+    ]).astype(np.int32)
+    right = np.concatenate([
+        np.where(t['right'] >= 0, t['right'] + offset, -1)
+        for t, offset in zip(trees, offsets)
+    ]).astype(np.int32)
+    threshold = np.concatenate([t['threshold'] for t in trees])
+    value = np.concatenate([t['value'] for t in trees])
+    default_left = np.concatenate([t['default_left'] for t in trees]) if xgboost else None
+
+    # Leaves point at feature 0 so the gather never goes out of bounds
+    feature[left < 0] = 0
+
+    return CompiledTreeEnsemble(
+        kind=kind,
+        feature=feature,
+        threshold=threshold,
+        left=left,
+        right=right,
+        value=value,
+        roots=offsets[:-1].astype(np.int32),
+        max_depth=max(t['depth'] for t in trees),
+        n_features=n_features,
+        classes=classes,
+        base_margin=base_margin,
+        default_left=default_left,
+    )
+
+
+def _tree_depth(left, right):
+    max_depth = 0
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        max_depth = max(max_depth, depth)
+        if left[node] >= 0:
+            stack.append((left[node], depth + 1))
+            stack.append((right[node], depth + 1))
+    return max_depth
+
+
+def compile_sklearn_forest(model):
+    """Flatten a fitted RandomForestClassifier/RandomForestRegressor"""
+    is_classifier = hasattr(model, 'classes_')
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        if is_classifier:
+            # Older sklearn stores class counts, newer stores fractions
+            value = value / value.sum(axis=1, keepdims=True)
+        else:
+            value = value[:, 0]
+        trees.append({
+            'feature': tree.feature,
+            'threshold': tree.threshold.astype(np.float64),
+            'left': tree.children_left,
+            'right': tree.children_right,
+            'value': value.astype(np.float64),
+            'depth': tree.max_depth,
+        })
+
+    return _pack(
+        trees,
+        kind='rf_classifier' if is_classifier else 'rf_regressor',
+        n_features=model.n_features_in_,
+        classes=model.classes_ if is_classifier else None,
+    )
+
+
+def compile_xgboost(model):
+    """Flatten a fitted XGBClassifier/XGBRegressor (gbtree booster)"""
+    booster = model.get_booster()
+    learner = json.loads(booster.save_raw('json'))['learner']
+    objective = learner['objective']['name']
+    gbtree = learner['gradient_booster']
+    if gbtree['name'] != 'gbtree':
+        raise ValueError(f"Unsupported booster: {gbtree['name']}")
+
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    if objective == 'binary:logistic':
+        kind = 'xgb_classifier'
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+    elif objective == 'reg:squarederror':
+        kind = 'xgb_regressor'
+        base_margin = base_score
+    else:
+        raise ValueError(f"Unsupported objective: {objective}")
+
+    json_trees = gbtree['model']['trees']
+    # Respect early stopping the same way the sklearn wrapper does
+    best_iteration = getattr(model, 'best_iteration', None)
+    if best_iteration is not None:
+        json_trees = json_trees[:best_iteration + 1]
+
+    trees = []
+    for t in json_trees:
+        left = np.array(t['left_children'], dtype=np.int64)
+        right = np.array(t['right_children'], dtype=np.int64)
+        trees.append({
+            'feature': np.array(t['split_indices'], dtype=np.int64),
+            'threshold': np.array(t['split_conditions'], dtype=np.float32),
+            'left': left,
+            'right': right,
+            # Leaf outputs are stored in split_conditions for leaf nodes
+            'value': np.where(left < 0, np.array(t['split_conditions'], dtype=np.float64), 0.0),
+            'default_left': np.array(t['default_left'], dtype=bool),
+            'depth': _tree_depth(left, right),
+        })
+
+    return _pack(
+        trees,
+        kind=kind,
+        n_features=int(learner['learner_model_param']['num_feature']),
+        classes=np.array([0, 1]) if kind == 'xgb_classifier' else None,
+        base_margin=base_margin,
+        xgboost=True,
+    )
+
+
+def compile_model(model):
+    """Compile any of the supported sklearn/xgboost tree ensembles"""
+    if hasattr(model, 'get_booster'):
+        return compile_xgboost(model)
+    if hasattr(model, 'estimators_'):
+        return compile_sklearn_forest(model)
+    raise TypeError(f"Cannot compile model of type {type(model).__name__}")
+
+
+def backend_for(model_key):
+    """Inference backend for one model key (e.g. 'xgb', 'score_rf') from the environment"""
+    default = os.environ.get('INFERENCE_BACKEND', NATIVE)
+    return os.environ.get(f'INFERENCE_BACKEND_{model_key.upper()}', default).lower()
+
+
+def select_backend(model, model_key):
+    """Return ``model`` compiled if its backend is set to 'compiled', else unchanged"""
+    if model is None or backend_for(model_key) != COMPILED:
+        return model
+    try:
+        compiled = compile_model(model)
+        compiled.native_model = model
+        print(f"⚡ {model_key}: compiled backend ({compiled.n_trees} trees, "
+              f"{compiled.n_nodes} nodes, depth {compiled.max_depth})")
+        return compiled
+    except Exception as e:
+        print(f"⚠️ {model_key}: could not compile ({e}), using native backend")
+        return model
+
+
+def backend_name(model):
+    """'compiled' or 'native' for a loaded model (for /health)"""
+    return COMPILED if isinstance(model, CompiledTreeEnsemble) else NATIVE
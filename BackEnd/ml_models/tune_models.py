@@ -0,0 +1,350 @@
+"""
+Hyperparameter search for the win and score models.
+
+    python ml_models/tune_models.py                       # all four models
+    python ml_models/tune_models.py xgb score_rf --trials 54 --jobs 4
+    python ml_models/tune_models.py rf --strategy random --trials 20
+    python ml_models/tune_models.py xgb --install         # replace models/model_xgb.pkl
+
+The trainers' train/test split (80/20, random_state=42) is kept. The test
+rows are only used for the final report. The training part is split again
+80/20 into fit and validation rows, and trials are scored on validation.
+
+Successive halving (default): ``--trials`` random configurations are fitted
+with a small tree budget. The best 1/``--eta`` move on to a budget ``--eta``
+times larger, and so on up to the full budget. ``--strategy random`` fits
+every configuration with the full budget. XGBoost trials also stop early
+once the validation loss hasn't improved for EARLY_STOPPING_ROUNDS rounds.
+Trials run in parallel worker processes. The winner is the best trial of
+any rung, since a smaller budget also means a faster model.
+
+Selection weighs serving cost as well as quality:
+    win models:    validation accuracy - latency_weight * single-row latency (ms)
+    score models:  -(validation MAE + latency_weight * single-row latency (ms))
+Smaller ensembles predict faster, so they win ties in quality.
+
+The best configuration is refitted on the whole training part, with the
+number of trees its best trial used. It is compared with the current model
+on the test split and written in the registry's pickle format to
+ml_models/tuning/<model file>. Every trial is saved to
+ml_models/tuning/<key>_trials.json. With ``--install`` the tuned model
+replaces the served one in ml_models/models/.
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from dataset import load_training_data
+from features import SCORE_FEATURE_COLUMNS, WIN_FEATURE_COLUMNS
+from model_registry import MODEL_SPECS, MODELS_DIR
+from training_config import available_cores, for_serving, rf_training_params, xgb_training_params
+
+warnings.filterwarnings('ignore')
+
+TUNING_DIR = os.path.join(SCRIPT_DIR, 'tuning')
+EARLY_STOPPING_ROUNDS = 20
+LATENCY_CALLS = 200
+
+# Penalty per millisecond of single-row latency, in accuracy (win) or runs of MAE (score)
+DEFAULT_LATENCY_WEIGHT = {'win': 0.005, 'score': 0.5}
+
+# key -> family, task, tree budgets (successive-halving rungs), fixed parameters
+SEARCH = {
+    'xgb': {'family': 'xgb', 'task': 'win', 'budgets': [40, 120, 360],
+            'fixed': {'eval_metric': 'logloss', 'random_state': 42}},
+    'rf': {'family': 'rf', 'task': 'win', 'budgets': [15, 45, 135],
+           'fixed': {'random_state': 42}},
+    'score_xgb': {'family': 'xgb', 'task': 'score', 'budgets': [40, 120, 360],
+                  'fixed': {'objective': 'reg:squarederror', 'random_state': 42}},
+    'score_rf': {'family': 'rf', 'task': 'score', 'budgets': [15, 45, 135],
+                 'fixed': {'random_state': 42}},
+}
+
+
+def sample_params(family, rng):
+    """One random configuration (plain Python types, so it can go into JSON)"""
+    if family == 'xgb':
+        return {
+            'max_depth': int(rng.integers(2, 11)),
+            'learning_rate': float(np.exp(rng.uniform(np.log(0.02), np.log(0.3)))),
+            'subsample': float(rng.uniform(0.6, 1.0)),
+            'colsample_bytree': float(rng.uniform(0.6, 1.0)),
+            'min_child_weight': float(rng.uniform(1, 10)),
+            'reg_lambda': float(np.exp(rng.uniform(np.log(0.1), np.log(10)))),
+        }
+    return {
+        'max_depth': int(rng.integers(4, 17)),
+        'min_samples_split': int(rng.integers(2, 21)),
+        'min_samples_leaf': int(rng.integers(1, 11)),
+        'max_features': [None, 'sqrt', 0.5, 0.8][int(rng.integers(0, 4))],
+    }
+
+
+def build_model(key, params, n_estimators, n_jobs, early_stopping=False):
+    search = SEARCH[key]
+    kwargs = dict(search['fixed'], **params, n_estimators=n_estimators)
+    if search['family'] == 'xgb':
+        if early_stopping:
+            kwargs['early_stopping_rounds'] = EARLY_STOPPING_ROUNDS
+        kwargs.update(xgb_training_params(n_jobs))
+        return (xgb.XGBClassifier if search['task'] == 'win' else xgb.XGBRegressor)(**kwargs)
+    kwargs.update(rf_training_params(n_jobs))
+    return (RandomForestClassifier if search['task'] == 'win' else RandomForestRegressor)(**kwargs)
+
+
+def task_splits(df, task):
+    """{'fit', 'val', 'train', 'test': (X, y)} with the trainers' 80/20 split"""
+    if task == 'win':
+        X = df[WIN_FEATURE_COLUMNS].to_numpy(np.float32)
+        y = df['team_won'].to_numpy()
+        stratify = y
+    else:
+        innings1 = df[df['innings'] == 1]
+        target = 'innings_total' if 'innings_total' in df.columns else 'final_score'
+        X = innings1[SCORE_FEATURE_COLUMNS].to_numpy(np.float32)
+        y = innings1[target].to_numpy(np.float32)
+        stratify = None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=stratify)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=0.2, random_state=42,
+        stratify=y_train if task == 'win' else None)
+    return {'fit': (X_fit, y_fit), 'val': (X_val, y_val),
+            'train': (X_train, y_train), 'test': (X_test, y_test)}
+
+
+def quality(task, y_true, y_pred):
+    """Accuracy (win, higher is better) or MAE in runs (score, lower is better)"""
+    if task == 'win':
+        return float(accuracy_score(y_true, y_pred))
+    return float(mean_absolute_error(y_true, y_pred))
+
+
+def selection_score(task, metric, latency_ms, latency_weight):
+    """Higher is better"""
+    if task == 'win':
+        return metric - latency_weight * latency_ms
+    return -(metric + latency_weight * latency_ms)
+
+
+def single_row_latency_ms(model, X):
+    """Median time of one single-row prediction, as the APIs make them"""
+    predict = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+    rows = X[:LATENCY_CALLS]
+    predict(rows[:1])
+    times = []
+    for i in range(LATENCY_CALLS):
+        row = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        predict(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+_SPLITS = {}
+
+
+def _init_worker():
+    """Load the data once per worker process (memory-mapped dataset cache)"""
+    df = load_training_data()
+    for task in ('win', 'score'):
+        _SPLITS[task] = task_splits(df, task)
+
+
+def run_trial(key, trial, params, budget, rung, n_jobs, latency_weight):
+    search = SEARCH[key]
+    task = search['task']
+    X_fit, y_fit = _SPLITS[task]['fit']
+    X_val, y_val = _SPLITS[task]['val']
+
+    model = build_model(key, params, budget, n_jobs, early_stopping=True)
+    start = time.perf_counter()
+    if search['family'] == 'xgb':
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        trees = int(model.best_iteration) + 1
+    else:
+        model.fit(X_fit, y_fit)
+        trees = budget
+    fit_time = time.perf_counter() - start
+
+    metric = quality(task, y_val, model.predict(X_val))
+    latency_ms = single_row_latency_ms(for_serving(model, n_jobs=1), X_val)
+    return {
+        'trial': trial,
+        'rung': rung,
+        'budget': budget,
+        'trees': trees,
+        'stopped_early': trees < budget,
+        'params': params,
+        'val_metric': metric,
+        'latency_ms': latency_ms,
+        'score': selection_score(task, metric, latency_ms, latency_weight),
+        'fit_s': fit_time
+    }
+
+
+def save_history(key, history):
+    os.makedirs(TUNING_DIR, exist_ok=True)
+    path = os.path.join(TUNING_DIR, f'{key}_trials.json')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def search(key, args, rng):
+    """Run the search for one model; returns the history dict"""
+    spec = SEARCH[key]
+    task = spec['task']
+    metric_name = 'accuracy' if task == 'win' else 'MAE'
+    latency_weight = args.latency_weight if args.latency_weight is not None else DEFAULT_LATENCY_WEIGHT[task]
+    budgets = spec['budgets'] if args.strategy == 'halving' else spec['budgets'][-1:]
+    configs = [sample_params(spec['family'], rng) for _ in range(args.trials)]
+    threads = max(1, available_cores() // args.jobs)
+
+    history = {
+        'model': key,
+        'strategy': args.strategy,
+        'eta': args.eta,
+        'budgets': budgets,
+        'latency_weight': latency_weight,
+        'metric': metric_name,
+        'seed': args.seed,
+        'trials': []
+    }
+    alive = list(range(len(configs)))
+    results = []
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker) as pool:
+        for rung, budget in enumerate(budgets):
+            start = time.perf_counter()
+            futures = [pool.submit(run_trial, key, trial, configs[trial], budget, rung,
+                                   threads, latency_weight) for trial in alive]
+            results = [future.result() for future in as_completed(futures)]
+            results.sort(key=lambda r: r['score'], reverse=True)
+            history['trials'].extend(results)
+            save_history(key, history)
+
+            stopped = sum(r['stopped_early'] for r in results)
+            best = results[0]
+            print(f"   Rung {rung}: {len(results)} trials x {budget} trees in "
+                  f"{time.perf_counter() - start:.1f}s"
+                  + (f" ({stopped} stopped early)" if spec['family'] == 'xgb' else ''))
+            print(f"      best #{best['trial']}: {metric_name} {best['val_metric']:.4f}, "
+                  f"{best['latency_ms']:.3f} ms, {best['trees']} trees, score {best['score']:.4f}")
+
+            # Keep the best 1/eta for the next, bigger budget
+            alive = [r['trial'] for r in results[:max(1, len(results) // args.eta)]]
+
+    # Every trial is a complete model scored on the same validation rows, so a
+    # small early-rung forest can beat the full budget once latency counts
+    history['best'] = dict(max(history['trials'], key=lambda r: r['score']))
+    return history
+
+
+def evaluate(model, task, X_test, y_test):
+    return quality(task, y_test, model.predict(X_test)), single_row_latency_ms(model, X_test)
+
+
+def finish(key, history, df, args):
+    """Refit the best configuration, compare with the served model, save"""
+    spec = SEARCH[key]
+    task = spec['task']
+    splits = task_splits(df, task)
+    X_train, y_train = splits['train']
+    X_test, y_test = splits['test']
+    best = history['best']
+
+    model = build_model(key, best['params'], best['trees'], None)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    refit_time = time.perf_counter() - start
+    model = for_serving(model)
+    metric, latency = evaluate(model, task, X_test, y_test)
+
+    metric_name = history['metric']
+    print(f"\n   📊 Test split ({len(y_test)} rows):")
+    print(f"      {'':<10} {metric_name:>10} {'latency':>12} {'trees':>7}")
+    print(f"      {'tuned':<10} {metric:>10.4f} {latency:>9.3f} ms {best['trees']:>7}")
+
+    current_path = os.path.join(MODELS_DIR, MODEL_SPECS[key].filename)
+    if os.path.exists(current_path):
+        with open(current_path, 'rb') as f:
+            current = for_serving(pickle.load(f))
+        current_metric, current_latency = evaluate(current, task, X_test, y_test)
+        print(f"      {'current':<10} {current_metric:>10.4f} {current_latency:>9.3f} ms "
+              f"{getattr(current, 'n_estimators', '-'):>7}")
+
+    os.makedirs(TUNING_DIR, exist_ok=True)
+    output_path = os.path.join(TUNING_DIR, MODEL_SPECS[key].filename)
+    with open(output_path, 'wb') as f:
+        pickle.dump(model, f)
+    history['best'].update({'test_metric': metric, 'test_latency_ms': latency,
+                            'refit_s': refit_time, 'path': os.path.relpath(output_path, SCRIPT_DIR)})
+    history_path = save_history(key, history)
+    print(f"\n   💾 Tuned model: {output_path}")
+    print(f"   📝 Trial history: {history_path}")
+
+    if args.install:
+        shutil.copyfile(output_path, current_path)
+        print(f"   ✅ Installed as {current_path}")
+        if key == 'xgb':
+            print("   💡 Rebuild the win table: python ml_models/build_win_table.py")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Tune the win/score models')
+    parser.add_argument('models', nargs='*', metavar='model',
+                        help=f"models to tune (default: all): {', '.join(SEARCH)}")
+    parser.add_argument('--strategy', choices=['halving', 'random'], default='halving')
+    parser.add_argument('--trials', type=int, default=27, help='random configurations (default 27)')
+    parser.add_argument('--eta', type=int, default=3, help='halving factor (default 3)')
+    parser.add_argument('--jobs', '-j', type=int, default=available_cores(),
+                        help='parallel trial processes (default: CPU cores)')
+    parser.add_argument('--latency-weight', type=float, default=None,
+                        help=f"penalty per ms of latency (default: {DEFAULT_LATENCY_WEIGHT})")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--install', action='store_true',
+                        help='replace the served model in ml_models/models/ with the tuned one')
+    args = parser.parse_args()
+    args.models = args.models or list(SEARCH)
+    unknown = [key for key in args.models if key not in SEARCH]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+    args.jobs = max(1, args.jobs)
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    print("=" * 70)
+    print("🎛️  MODEL TUNING: randomized search / successive halving")
+    print("=" * 70)
+    print(f"\n⚙️  Strategy: {args.strategy}, {args.trials} trials, eta={args.eta}, "
+          f"{args.jobs} parallel trials")
+
+    df = load_training_data()
+    rng = np.random.default_rng(args.seed)
+    for key in args.models:
+        print(f"\n🔍 {MODEL_SPECS[key].name} ({key})")
+        history = search(key, args, rng)
+        finish(key, history, df, args)
+
+    print("\n" + "=" * 70)
+    print("✅ TUNING COMPLETE!")
+    print("=" * 70)
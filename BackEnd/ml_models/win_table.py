@@ -0,0 +1,203 @@
+"""
+Precomputed win-probability table for the XGBoost win model.
+
+The model's inputs are nearly discrete: whole runs and wickets, overs in
+cricket notation (12.3 = 12 overs and 3 balls), and a target. build_win_table.py
+evaluates model_xgb.pkl once over that grid and stores the results as .npy
+files. This module memory-maps them, so a per-ball win probability becomes an
+array read instead of a model call:
+
+    innings1.npy  [score 0..S, wickets 0..10, ball 0..120]
+    innings2.npy  [target index, runs_needed 0..R, offset 0..1, wickets 0..10, ball 0..120]
+
+``offset`` is current_score - (target - runs_needed). It is 0 when the
+target is first-innings score + 1 (the training data convention). It is 1
+when the frontend sends the first-innings score as the target.
+
+Innings 1 is stored as float32, so lookups are exact. Innings 2 is much
+larger and is stored as uint16 probabilities with a resolution of 1/65534.
+65535 marks unreachable cells. By default every target in the practical
+range is stored, so lookups there are exact as well. A table built with
+target_step > 1 is linearly interpolated between targets. Tree models are
+step functions, so that option trades accuracy for size. Any state outside
+the grid falls back to the live model. That includes mid-over decimals
+such as 12.7, scores or targets outside the grid, and other formats.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+BALLS_PER_INNINGS = 120
+TABLE_DIR_NAME = 'win_table'
+
+# innings2.npy quantization: probability = value / QUANT_SCALE, QUANT_MISSING = no entry
+QUANT_SCALE = 65534
+QUANT_MISSING = 65535
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ball_index(overs):
+    """Balls bowled for an overs value in cricket notation, or None if not x.0-x.5"""
+    whole = int(overs + 1e-6)
+    balls = int(round((overs - whole) * 10))
+    if balls > 5 or abs(overs - (whole + balls / 10)) > 1e-4:
+        return None
+    index = whole * 6 + balls
+    return index if 0 <= index <= BALLS_PER_INNINGS else None
+
+
+def overs_grid():
+    """Overs value for every ball index 0..120 (0.0, 0.1, ..., 0.5, 1.0, ...)"""
+    balls = np.arange(BALLS_PER_INNINGS + 1)
+    return (balls // 6 * 10 + balls % 6) / 10
+
+
+class WinProbabilityTable:
+    """Memory-mapped lookup table with hit/miss counters"""
+
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self.innings1 = np.load(os.path.join(directory, 'innings1.npy'), mmap_mode='r')
+        self.innings2 = np.load(os.path.join(directory, 'innings2.npy'), mmap_mode='r')
+        self.max_score = meta['max_score']
+        self.target_min = meta['target_min']
+        self.target_step = meta['target_step']
+        self.n_targets = self.innings2.shape[0]
+        self.max_runs_needed = self.innings2.shape[1] - 1
+        self.hits = 0
+        self.misses = 0
+        # Request threads (gthread workers, the model pool) share one table
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, directory, model_path=None, model_sha256=None):
+        """Open the table in ``directory``; None if missing or built from another model"""
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if model_path and not model_sha256:
+            model_sha256 = file_sha256(model_path)
+        if model_sha256 and meta.get('model_sha256') != model_sha256:
+            print(f"⚠️ Win table in {directory} was built from a different model, ignoring it")
+            return None
+        return cls(directory, meta)
+
+    def lookup(self, row):
+        """Win probability for one win-feature row, or None if outside the grid"""
+        score, wickets, overs, innings, target, runs_needed = (
+            float(row[0]), float(row[1]), float(row[2]),
+            float(row[4]), float(row[5]), float(row[6])
+        )
+        ball = ball_index(overs)
+        if (ball is None or not score.is_integer() or not wickets.is_integer()
+                or not 0 <= wickets <= 10):
+            return None
+        wickets = int(wickets)
+
+        if innings == 1:
+            if target != 0 or runs_needed != 0 or not 0 <= score <= self.max_score:
+                return None
+            return float(self.innings1[int(score), wickets, ball])
+
+        if innings != 2 or not runs_needed.is_integer() or not target.is_integer():
+            return None
+        runs = int(runs_needed)
+        offset = int(score - (target - runs_needed))
+        if offset not in (0, 1) or not 0 <= runs <= self.max_runs_needed:
+            return None
+
+        position = (target - self.target_min) / self.target_step
+        lower = int(np.floor(position))
+        if lower < 0 or lower >= self.n_targets:
+            return None
+        fraction = position - lower
+        low = int(self.innings2[lower, runs, offset, wickets, ball])
+        if low == QUANT_MISSING:
+            return None
+        if fraction == 0:
+            return low / QUANT_SCALE
+        if lower + 1 >= self.n_targets:
+            return None
+        high = int(self.innings2[lower + 1, runs, offset, wickets, ball])
+        if high == QUANT_MISSING:
+            return None
+        return (low + (high - low) * fraction) / QUANT_SCALE
+
+    def record(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+            'model_sha256': self.meta.get('model_sha256')
+        }
+
+
+class TableBackedModel:
+    """
+    Classifier wrapper that answers predict_proba from the table where it
+    can and sends only the remaining rows to the live model.
+    """
+
+    def __init__(self, model, table):
+        self.model = model
+        self.table = table
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        win = np.empty(len(X), dtype=np.float64)
+        misses = []
+        for i, row in enumerate(X):
+            value = self.table.lookup(row)
+            if value is None:
+                misses.append(i)
+            else:
+                win[i] = value
+        self.table.record(len(X) - len(misses), len(misses))
+
+        if misses:
+            win[misses] = self.model.predict_proba(X[misses])[:, 1]
+        return np.column_stack([1.0 - win, win])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def attach_win_table(model, model_path, models_dir, model_sha256=None):
+    """
+    Wrap ``model`` with the lookup table in ``models_dir``/win_table if one was
+    built from ``model_path`` (or the pickle with ``model_sha256``). Disable
+    with WIN_TABLE=off.
+    """
+    if model is None or os.environ.get('WIN_TABLE', 'on').lower() == 'off':
+        return model, None
+    table = WinProbabilityTable.load(
+        os.environ.get('WIN_TABLE_DIR', os.path.join(models_dir, TABLE_DIR_NAME)),
+        model_path, model_sha256
+    )
+    if table is None:
+        return model, None
+    print(f"📋 Win table loaded: {table.innings1.size + table.innings2.size:,} states "
+          f"(targets {table.target_min}-{table.meta['target_max']} step {table.target_step})")
+    return TableBackedModel(model, table), table
@@ -4,6 +4,7 @@ import LiveMatch from "../models/liveMatch.model.js";
 import Match from "../models/match.model.js";
 import { Player } from "../models/player.model.js";
 import { io } from "../index.js";
+import { publishBall } from "../utils/liveFeedPublisher.js";
 import {
   parseCricsheetJSON,
   mapPlayersToIds,
@@ -427,6 +428,9 @@ const startPlaybackScheduler = async (matchId) => {
       liveMatch.lastUpdated = new Date();
       await liveMatch.save();
       
+      // Live prediction feed (not awaited)
+      publishBall(matchId, liveMatch, ball);
+      
       // Broadcast via Socket.IO
       io.to(matchId).emit('ball-updated', {
         ball: ballData,
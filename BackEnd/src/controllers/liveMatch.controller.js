@@ -3,6 +3,12 @@ import LiveMatch from "../models/liveMatch.model.js";
 import Match from "../models/match.model.js";
 import { Player } from "../models/player.model.js";
 import { io } from "../index.js";
+import {
+  endLiveMatch,
+  publishBall,
+  publishInningsBreak,
+  registerLiveMatch,
+} from "../utils/liveFeedPublisher.js";
 
 /* -------------------------------------------------------
    🎬 Initialize Live Match
@@ -77,6 +83,7 @@ export const initializeLiveMatch = async (req, res) => {
 
     // Update match status to InProgress
     await Match.findByIdAndUpdate(matchId, { status: "InProgress" });
+    registerLiveMatch(matchId, liveMatch);
 
     console.log(
       `✅ Live match initialized: ${match.teamA.teamName} vs ${match.teamB.teamName}`
@@ -328,6 +335,9 @@ export const updateBall = async (req, res) => {
     liveMatch.lastUpdated = new Date();
     await liveMatch.save();
 
+    // One prediction per ball, streamed to every viewer (not awaited)
+    publishBall(matchId, liveMatch, ball);
+
     // ✅ ============= UPDATE MATCH MODEL =============
     const innings1 = liveMatch.innings[0];
     let scoreA = 0,
@@ -511,6 +521,13 @@ export const completeInnings = async (req, res) => {
 
     await liveMatch.save();
 
+    // Live prediction feed: start the chase, or close it
+    if (liveMatch.status === "completed") {
+      endLiveMatch(matchId);
+    } else {
+      publishInningsBreak(matchId, liveMatch);
+    }
+
     // Emit socket
     if (io) {
       io.to(matchId).emit("innings-complete", {
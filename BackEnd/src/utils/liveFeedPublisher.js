@@ -0,0 +1,68 @@
+// Pushes scored balls into the Python live prediction feed (ml_models/live_feed.py,
+// its own service: python ml_models/serve.py live). The feed keeps each match's
+// state, predicts once per ball and streams the result to every viewer over SSE,
+// so viewers no longer post the match to /predict-all.
+// Publishing never blocks or fails scoring: errors are logged and dropped.
+
+import { INNINGS_EVENT, compactBall, matchSnapshot } from './matchEvents.js';
+
+const LIVE_FEED_URL = process.env.LIVE_FEED_URL || 'http://localhost:5003';
+const LIVE_FEED_TOKEN = process.env.LIVE_FEED_TOKEN || '';
+const PUBLISH_TIMEOUT_MS = Number(process.env.LIVE_FEED_TIMEOUT_MS) || 2000;
+
+async function send(method, path, body) {
+  const headers = { 'Content-Type': 'application/json' };
+  if (LIVE_FEED_TOKEN) headers['X-Publish-Token'] = LIVE_FEED_TOKEN;
+
+  return fetch(`${LIVE_FEED_URL}${path}`, {
+    method,
+    headers,
+    body: body === undefined ? undefined : JSON.stringify(body),
+    signal: AbortSignal.timeout(PUBLISH_TIMEOUT_MS)
+  });
+}
+
+// Feed register body: the match's full state (matchEvents.js)
+export function liveFeedState(matchId, liveMatch) {
+  return { match_id: matchId.toString(), ...matchSnapshot(liveMatch) };
+}
+
+// (Re)register a match from its full state, e.g. at the start of an innings
+export async function registerLiveMatch(matchId, liveMatch) {
+  try {
+    const res = await send('POST', '/live/matches', liveFeedState(matchId, liveMatch));
+    if (!res.ok) console.warn(`⚠️ Live feed register failed (${res.status}) for ${matchId}`);
+  } catch (error) {
+    console.warn(`⚠️ Live feed unavailable: ${error.message}`);
+  }
+}
+
+// Ball events ({"r", "x", "t", "w"} or the innings break); `liveMatch` already
+// includes them and is used if the feed doesn't know the match
+async function publishEvents(matchId, liveMatch, events) {
+  try {
+    const res = await send('POST', `/live/matches/${matchId}/balls`, { balls: events });
+    // Feed restarted or match never registered: resync from the saved state
+    if (res.status === 404) return registerLiveMatch(matchId, liveMatch);
+    if (!res.ok) console.warn(`⚠️ Live feed ball rejected (${res.status}) for ${matchId}`);
+  } catch (error) {
+    console.warn(`⚠️ Live feed unavailable: ${error.message}`);
+  }
+}
+
+export function publishBall(matchId, liveMatch, ball) {
+  return publishEvents(matchId, liveMatch, [compactBall(ball)]);
+}
+
+// The feed's match state starts the chase itself (target = first-innings total + 1)
+export function publishInningsBreak(matchId, liveMatch) {
+  return publishEvents(matchId, liveMatch, [INNINGS_EVENT]);
+}
+
+export async function endLiveMatch(matchId) {
+  try {
+    await send('DELETE', `/live/matches/${matchId}`);
+  } catch (error) {
+    console.warn(`⚠️ Live feed unavailable: ${error.message}`);
+  }
+}
@@ -0,0 +1,68 @@
+// Compact match events for the Python side (ml_models/match_state.py).
+// The ML worker pool and the live prediction feed keep each match's state
+// and receive only the balls bowled since their last update, so what is
+// sent per ball stays the same size however long the match gets.
+
+const EXTRAS_CODES = {
+  wide: 'wd', wides: 'wd',
+  noBall: 'nb', noballs: 'nb',
+  bye: 'b', byes: 'b',
+  legBye: 'lb', legbyes: 'lb'
+};
+
+const idOf = (value) => (value?._id ?? value)?.toString();
+
+// {"r", "x", "t", "w"} with the zero/none fields left out
+export function compactBall(ball) {
+  const event = { r: ball.runs || 0 };
+  if (ball.extras) event.x = ball.extras;
+  const code = EXTRAS_CODES[ball.extrasType];
+  if (code) event.t = code;
+  if (ball.isWicket) event.w = 1;
+  return event;
+}
+
+export const INNINGS_EVENT = { e: 'innings' };
+
+// Full state of a LiveMatch document (populated or not), to (re)start a match
+export function matchSnapshot(liveMatch) {
+  const inningsNumber = liveMatch.currentInnings;
+  const current = liveMatch.innings[inningsNumber - 1] || {};
+  return {
+    innings: inningsNumber,
+    // Same as the training data: first-innings total + 1
+    target: inningsNumber === 2 ? (liveMatch.innings[0]?.score || 0) + 1 : 0,
+    total_overs: liveMatch.totalOvers || 20,
+    current_score: current.score || 0,
+    wickets_lost: current.wickets || 0,
+    balls: current.balls || 0,
+    extras: current.extras || 0,
+    team_a_batting: idOf(current.battingTeam) === idOf(liveMatch.teamA)
+  };
+}
+
+// Events that take a match from `sent` ({innings, balls}: what the receiver
+// already has) to the current document, or null if only a snapshot will do
+export function eventsSince(sent, liveMatch) {
+  if (!sent) return null;
+  const inningsNumber = liveMatch.currentInnings;
+  const current = liveMatch.innings[inningsNumber - 1]?.ballByBall || [];
+
+  if (sent.innings === inningsNumber && sent.balls <= current.length) {
+    return current.slice(sent.balls).map(compactBall);
+  }
+  // Innings break since the last update: rest of innings 1, the break, innings 2 so far
+  const first = liveMatch.innings[0]?.ballByBall || [];
+  if (sent.innings === 1 && inningsNumber === 2 && sent.balls <= first.length) {
+    return [
+      ...first.slice(sent.balls).map(compactBall),
+      INNINGS_EVENT,
+      ...current.map(compactBall)
+    ];
+  }
+  return null;
+}
+
+export function matchIdOf(liveMatch) {
+  return idOf(liveMatch.match) ?? idOf(liveMatch._id);
+}
@@ -0,0 +1,227 @@
+// Pool of long-lived `predict.py --worker` processes.
+// Each worker loads the model once and answers newline-delimited JSON
+// requests, so a prediction no longer pays Python/XGBoost startup cost.
+
+import { spawn } from 'child_process';
+import path from 'path';
+import readline from 'readline';
+import { eventsSince, matchIdOf, matchSnapshot } from './matchEvents.js';
+
+const DEFAULT_POOL_SIZE = Number(process.env.ML_WORKER_POOL_SIZE) || 2;
+const REQUEST_TIMEOUT_MS = Number(process.env.ML_WORKER_TIMEOUT_MS) || 10000;
+const RESTART_DELAY_MS = 1000;
+// Matches whose last sent position is remembered (least recently predicted dropped first)
+const MAX_TRACKED_MATCHES = 1000;
+
+class PredictionWorker {
+  constructor(pythonPath, scriptPath) {
+    this.pythonPath = pythonPath;
+    this.scriptPath = scriptPath;
+    this.pending = new Map();
+    this.ready = false;
+    this.closed = false;
+    this.start();
+  }
+
+  start() {
+    this.ready = false;
+    this.process = spawn(this.pythonPath, [this.scriptPath, '--worker'], {
+      stdio: ['pipe', 'pipe', 'pipe'],
+      shell: true  // Important for Windows!
+    });
+
+    const lines = readline.createInterface({ input: this.process.stdout });
+    lines.on('line', (line) => this.handleLine(line));
+
+    // Writes to a worker that just died surface here instead of crashing Node
+    this.process.stdin.on('error', (error) => {
+      this.failPending(error);
+    });
+
+    this.process.stderr.on('data', (data) => {
+      console.error('🐍 ML worker:', data.toString().trim());
+    });
+
+    this.process.on('error', (error) => {
+      console.error('❌ Failed to start ML worker:', error);
+      this.failPending(error);
+    });
+
+    this.process.on('close', (code) => {
+      this.ready = false;
+      this.failPending(new Error(`ML worker exited with code ${code}`));
+
+      if (!this.closed) {
+        console.warn(`⚠️ ML worker exited (code ${code}), restarting...`);
+        setTimeout(() => this.start(), RESTART_DELAY_MS);
+      }
+    });
+  }
+
+  handleLine(line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (e) {
+      // Not JSON (stray print), skip
+      return;
+    }
+
+    if (message.ready) {
+      this.ready = true;
+      const startup = message.time_to_first_prediction_s;
+      console.log(`✅ ML worker ready: ${message.model}` +
+        (startup !== undefined ? ` (first prediction after ${startup}s)` : ''));
+      return;
+    }
+
+    const request = this.pending.get(message.id);
+    if (!request) return;
+
+    clearTimeout(request.timeout);
+    this.pending.delete(message.id);
+
+    if (message.success) {
+      delete message.id;
+      request.resolve(message);
+    } else {
+      const error = new Error(message.error);
+      error.code = message.code;
+      request.reject(error);
+    }
+  }
+
+  // `payload` is {matchData} or a ball-delta message ({matchId, state?, events?})
+  send(id, payload) {
+    return new Promise((resolve, reject) => {
+      const timeout = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error('ML worker timeout'));
+      }, REQUEST_TIMEOUT_MS);
+
+      this.pending.set(id, { resolve, reject, timeout });
+      this.process.stdin.write(JSON.stringify({ id, ...payload }) + '\n');
+    });
+  }
+
+  failPending(error) {
+    for (const request of this.pending.values()) {
+      clearTimeout(request.timeout);
+      request.reject(error);
+    }
+    this.pending.clear();
+  }
+
+  stop() {
+    this.closed = true;
+    this.process.kill();
+  }
+}
+
+class PredictionWorkerPool {
+  constructor({
+    size = DEFAULT_POOL_SIZE,
+    pythonPath = 'python',
+    scriptPath = path.join(process.cwd(), 'ml_models', 'predict.py')
+  } = {}) {
+    this.size = size;
+    this.pythonPath = pythonPath;
+    this.scriptPath = scriptPath;
+    this.workers = [];
+    this.nextId = 0;
+    // matchId -> { worker, innings, balls }: how far that worker's state has got
+    this.matches = new Map();
+  }
+
+  ensureStarted() {
+    if (this.workers.length > 0) return;
+
+    console.log(`🐍 Starting ${this.size} ML worker(s): ${this.scriptPath}`);
+    for (let i = 0; i < this.size; i++) {
+      this.workers.push(new PredictionWorker(this.pythonPath, this.scriptPath));
+    }
+  }
+
+  // Least-busy worker, preferring ones that have finished loading the model.
+  // Requests written to a worker that is still loading simply wait in its stdin.
+  pickWorker() {
+    const alive = this.workers.filter((worker) => worker.process.exitCode === null);
+    const ready = alive.filter((worker) => worker.ready);
+    const candidates = ready.length > 0 ? ready : alive;
+    if (candidates.length === 0) return null;
+
+    return candidates.reduce((best, worker) =>
+      worker.pending.size < best.pending.size ? worker : best
+    );
+  }
+
+  predict(matchData) {
+    this.ensureStarted();
+
+    const worker = this.pickWorker();
+    if (!worker) {
+      return Promise.reject(new Error('No ML worker available'));
+    }
+
+    this.nextId += 1;
+    return worker.send(this.nextId, { matchData });
+  }
+
+  // Every update of a match goes to the same worker, which keeps its state
+  workerFor(matchId) {
+    if (this.workers.length === 0) return null;
+    let hash = 0;
+    for (const char of matchId) hash = (hash * 31 + char.charCodeAt(0)) >>> 0;
+    const worker = this.workers[hash % this.workers.length];
+    return worker.closed ? null : worker;
+  }
+
+  // Live match as ball deltas (ml_models/match_state.py): the state once,
+  // then only the balls bowled since the previous prediction of the match
+  async predictMatch(liveMatch) {
+    this.ensureStarted();
+
+    const matchId = matchIdOf(liveMatch);
+    const worker = this.workerFor(matchId);
+    if (!worker) {
+      throw new Error('No ML worker available');
+    }
+
+    const ballByBall = liveMatch.innings[liveMatch.currentInnings - 1]?.ballByBall || [];
+    const position = { worker, innings: liveMatch.currentInnings, balls: ballByBall.length };
+    const sent = this.matches.get(matchId);
+    const events = sent && sent.worker === worker ? eventsSince(sent, liveMatch) : null;
+
+    // Recorded before the reply so a concurrent call sends only what follows
+    this.matches.delete(matchId);
+    this.matches.set(matchId, position);
+    if (this.matches.size > MAX_TRACKED_MATCHES) {
+      this.matches.delete(this.matches.keys().next().value);
+    }
+
+    try {
+      this.nextId += 1;
+      return await worker.send(this.nextId, events
+        ? { matchId, events }
+        : { matchId, state: matchSnapshot(liveMatch) });
+    } catch (error) {
+      if (error.code !== 'unknown_match') {
+        this.matches.delete(matchId);
+        throw error;
+      }
+      // Worker restarted (or dropped the match): start it again from the saved state
+      this.nextId += 1;
+      return worker.send(this.nextId, { matchId, state: matchSnapshot(liveMatch) });
+    }
+  }
+
+  stop() {
+    this.workers.forEach((worker) => worker.stop());
+    this.workers = [];
+    this.matches.clear();
+  }
+}
+
+const predictionWorkerPool = new PredictionWorkerPool();
+
+export { PredictionWorkerPool, predictionWorkerPool };
@@ -1,13 +1,13 @@
 // src/pages/LiveMatchView.jsx
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { TrendingUp, Activity, Target, Zap, Clock, BarChart3, ArrowLeft, Award, AlertCircle } from 'lucide-react';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
 
 const BACKEND_URL = 'http://localhost:8000';
-const DUAL_MODEL_URL = 'http://localhost:5001'; // Win models (XGB + RF)
-const SCORE_MODEL_URL = 'http://localhost:5002'; // Score models (XGB + RF)
+const DUAL_MODEL_URL = 'http://localhost:5001'; // Win + score models (XGB + RF)
+const LIVE_FEED_URL = 'http://localhost:5003'; // Per-ball prediction stream (serve.py live)
 
 export default function LiveMatchView() {
   const { matchId } = useParams();
@@ -19,6 +19,9 @@ export default function LiveMatchView() {
   const [error, setError] = useState(null);
   const [predictionLoading, setPredictionLoading] = useState(false);
   const [lastPredictionTime, setLastPredictionTime] = useState(0);
+  // Latest live-feed event; while the stream is open, polling /predict-all is skipped
+  const [streamedPrediction, setStreamedPrediction] = useState(null);
+  const streamingRef = useRef(false);
 
   useEffect(() => {
     fetchLiveData();
@@ -30,6 +33,32 @@ export default function LiveMatchView() {
     return () => clearInterval(interval);
   }, [matchId]);
 
+  // Per-ball predictions pushed by the live feed (one model run per ball, shared by all viewers)
+  useEffect(() => {
+    const source = new EventSource(`${LIVE_FEED_URL}/live/matches/${matchId}/stream`);
+    source.addEventListener('prediction', (event) => {
+      streamingRef.current = true;
+      setStreamedPrediction(JSON.parse(event.data));
+    });
+    source.addEventListener('end', () => {
+      streamingRef.current = false;
+      source.close();
+    });
+    // Not registered (404) or service down: polling takes over until the page reloads
+    source.onerror = () => {
+      streamingRef.current = false;
+    };
+
+    return () => source.close();
+  }, [matchId]);
+
+  useEffect(() => {
+    if (streamedPrediction && liveData) {
+      setLastPredictionTime(Date.now());
+      setPrediction(buildDualPrediction(streamedPrediction, liveData));
+    }
+  }, [streamedPrediction, liveData]);
+
   const fetchLiveData = async () => {
     try {
       const response = await fetch(`${BACKEND_URL}/api/v1/live-matches/${matchId}`);
@@ -40,7 +69,7 @@ export default function LiveMatchView() {
         setError(null);
         
         const now = Date.now();
-        if (!prediction || now - lastPredictionTime > 30000) {
+        if (!streamingRef.current && (!prediction || now - lastPredictionTime > 30000)) {
           fetchBothModelPredictions(data.data); // CHANGED: Call dual model + score
         }
       } else {
@@ -53,7 +82,134 @@ export default function LiveMatchView() {
     }
   };
 
-  // UPDATED: Calls win prediction (5001) and score prediction (5002)
+  // Feed payload ("prediction" event or /predict-all body) -> dual prediction object
+  const buildDualPrediction = (allResponse, matchData) => {
+    const currentInnings = matchData.innings[matchData.currentInnings - 1];
+    // The live feed's own state is newer than the last /live-matches poll
+    const state = allResponse?.state;
+    const currentScore = state ? state.current_score : (currentInnings?.score || 0);
+    const currentWickets = state ? state.wickets_lost : (currentInnings?.wickets || 0);
+    const currentOvers = state ? state.overs_played : (currentInnings?.overs || 0);
+    const inningsNumber = state ? state.innings : matchData.currentInnings;
+    
+    // Determine batting team (the feed tracks it across the innings break)
+    const battingTeamId = currentInnings?.battingTeam?._id?.toString();
+    const team1Id = matchData.teamA?._id?.toString();
+    const isBattingTeamA = state?.team_a_batting ?? (battingTeamId === team1Id);
+    
+    // "win" is the /predict-both body, "score" the /predict-score-both body (or null)
+    const winResponse = allResponse ? (allResponse.success ? allResponse.win : allResponse) : null;
+    const scoreResponse = allResponse && allResponse.success ? allResponse.score : null;
+    
+    // Parse win model results with safe defaults
+    const xgboostWinObj = winResponse && winResponse.success && winResponse.models && winResponse.models.xgboost
+      ? {
+          winProbability: winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null,
+          lossProbability: winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null,
+          teamAWin: isBattingTeamA ? (winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null) : (winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null),
+          teamBWin: isBattingTeamA ? (winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null) : (winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null),
+          confidence: winResponse.models.xgboost.confidence ?? winResponse.models.xgboost.confidence_level ?? null,
+          outcome: winResponse.models.xgboost.predicted_outcome ?? winResponse.models.xgboost.outcome ?? null,
+          model: winResponse.models.xgboost.model ?? 'XGBoost',
+          accuracy: winResponse.models.xgboost.accuracy ?? null,
+          speed: winResponse.models.xgboost.speed ?? 'Faster'
+        }
+      : {
+          winProbability: 50,
+          lossProbability: 50,
+          teamAWin: 50,
+          teamBWin: 50,
+          confidence: 50,
+          outcome: 'Unknown',
+          model: 'XGBoost',
+          accuracy: null,
+          speed: 'Faster'
+        };
+
+    const rfWinObj = winResponse && winResponse.success && winResponse.models && winResponse.models.random_forest
+      ? {
+          winProbability: winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null,
+          lossProbability: winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null,
+          teamAWin: isBattingTeamA ? (winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null) : (winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null),
+          teamBWin: isBattingTeamA ? (winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null) : (winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null),
+          confidence: winResponse.models.random_forest.confidence ?? winResponse.models.random_forest.confidence_level ?? null,
+          outcome: winResponse.models.random_forest.predicted_outcome ?? winResponse.models.random_forest.outcome ?? null,
+          model: winResponse.models.random_forest.model ?? 'Random Forest',
+          accuracy: winResponse.models.random_forest.accuracy ?? null,
+          speed: winResponse.models.random_forest.speed ?? 'Moderate'
+        }
+      : {
+          winProbability: 50,
+          lossProbability: 50,
+          teamAWin: 50,
+          teamBWin: 50,
+          confidence: 50,
+          outcome: 'Unknown',
+          model: 'Random Forest',
+          accuracy: null,
+          speed: 'Moderate'
+        };
+
+    // Predicted score parsing based on confirmed API response structure you provided
+    let predictedScore = null;
+    let scoreModels = null;
+    if (scoreResponse && scoreResponse.success) {
+      // Your API returns: average_prediction, models.xgboost.predicted_score, models.random_forest.predicted_score
+      const avg = scoreResponse.average_prediction ?? null;
+      const xgbScore = scoreResponse.models?.xgboost?.predicted_score ?? scoreResponse.models?.xgboost?.predictedScore ?? null;
+      const rfScore = scoreResponse.models?.random_forest?.predicted_score ?? scoreResponse.models?.random_forest?.predictedScore ?? null;
+
+      predictedScore = avg;
+      scoreModels = {
+        xgboost: xgbScore,
+        randomForest: rfScore,
+        average: avg
+      };
+    }
+
+    // Build dual prediction object
+    const dualPrediction = {
+      xgboost: {
+        winProbability: xgboostWinObj.winProbability,
+        lossProbability: xgboostWinObj.lossProbability,
+        teamAWin: xgboostWinObj.teamAWin,
+        teamBWin: xgboostWinObj.teamBWin,
+        confidence: xgboostWinObj.confidence,
+        outcome: xgboostWinObj.outcome,
+        model: xgboostWinObj.model,
+        accuracy: xgboostWinObj.accuracy,
+        speed: xgboostWinObj.speed
+      },
+      randomForest: {
+        winProbability: rfWinObj.winProbability,
+        lossProbability: rfWinObj.lossProbability,
+        teamAWin: rfWinObj.teamAWin,
+        teamBWin: rfWinObj.teamBWin,
+        confidence: rfWinObj.confidence,
+        outcome: rfWinObj.outcome,
+        model: rfWinObj.model,
+        accuracy: rfWinObj.accuracy,
+        speed: rfWinObj.speed
+      },
+      matchContext: {
+        score: currentScore,
+        wickets: currentWickets,
+        overs: currentOvers,
+        innings: inningsNumber,
+        battingTeam: isBattingTeamA ? matchData.teamA?.teamName : matchData.teamB?.teamName,
+        teamA: matchData.teamA?.teamName,
+        teamB: matchData.teamB?.teamName
+      },
+      predictedScore: predictedScore, // average predicted score (or null)
+      scoreModels: scoreModels, // breakdown object or null
+      rawWinResponse: winResponse,
+      rawScoreResponse: scoreResponse
+    };
+    
+    return dualPrediction;
+  };
+
+  // Fallback when the live feed isn't streaming: calls /predict-all (5001) for win prediction and score prediction together
   const fetchBothModelPredictions = async (matchData) => {
     if (predictionLoading) return;
     
@@ -71,23 +227,17 @@ export default function LiveMatchView() {
       const targetScore = inningsNumber === 2 ? (matchData.innings[0]?.score || 0) : 0;
       const runsNeeded = inningsNumber === 2 ? (targetScore - currentScore + 1) : 0;
       
-      // Determine batting team
-      const battingTeamId = currentInnings?.battingTeam?._id?.toString();
-      const team1Id = matchData.teamA?._id?.toString();
-      const isBattingTeamA = battingTeamId === team1Id;
-      
       console.log('📊 Match State:', {
         score: `${currentScore}/${currentWickets}`,
         overs: currentOvers,
         innings: inningsNumber,
-        target: targetScore,
-        battingTeam: isBattingTeamA ? 'Team A' : 'Team B'
+        target: targetScore
       });
       
-      // 1) Call win-prediction dual-model endpoint (predict-both)
-      let winResponse = null;
+      // One call for win probability (both models) + projected score (innings 1 only)
+      let allResponse = null;
       try {
-        const res = await fetch(`${DUAL_MODEL_URL}/predict-both`, {
+        const res = await fetch(`${DUAL_MODEL_URL}/predict-all`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({
@@ -96,144 +246,17 @@ export default function LiveMatchView() {
             overs_played: currentOvers,
             innings: inningsNumber,
             target: targetScore,
-            runs_needed: Math.max(0, runsNeeded)
+            runs_needed: Math.max(0, runsNeeded),
+            total_overs: matchData.totalOvers || 20
           })
         });
-        winResponse = await res.json();
-        console.log('✅ Win Model Response:', winResponse);
+        allResponse = await res.json();
+        console.log('✅ Prediction Response:', allResponse);
       } catch (err) {
-        console.error('❌ Win model call failed:', err);
-        winResponse = null;
-      }
-
-      // 2) Call score-prediction endpoint (predict-score-both) only for innings 1 and when innings not complete
-      let scoreResponse = null;
-      if (inningsNumber === 1 && currentOvers < (matchData.totalOvers || 20)) {
-        try {
-          const res2 = await fetch(`${SCORE_MODEL_URL}/predict-score-both`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              current_score: currentScore,
-              wickets_lost: currentWickets,
-              overs_played: currentOvers,
-              innings: 1,
-              total_overs: matchData.totalOvers || 20
-            })
-          });
-          scoreResponse = await res2.json();
-          console.log('✅ Score Model Response:', scoreResponse);
-        } catch (err) {
-          console.error('❌ Score model call failed:', err);
-          scoreResponse = null;
-        }
+        console.error('❌ Prediction call failed:', err);
       }
 
-      // Parse win model results with safe defaults
-      const xgboostWinObj = winResponse && winResponse.success && winResponse.models && winResponse.models.xgboost
-        ? {
-            winProbability: winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null,
-            lossProbability: winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null,
-            teamAWin: isBattingTeamA ? (winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null) : (winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null),
-            teamBWin: isBattingTeamA ? (winResponse.models.xgboost.loss_probability ?? winResponse.models.xgboost.lossProbability ?? null) : (winResponse.models.xgboost.win_probability ?? winResponse.models.xgboost.winProbability ?? null),
-            confidence: winResponse.models.xgboost.confidence ?? winResponse.models.xgboost.confidence_level ?? null,
-            outcome: winResponse.models.xgboost.predicted_outcome ?? winResponse.models.xgboost.outcome ?? null,
-            model: winResponse.models.xgboost.model ?? 'XGBoost',
-            accuracy: winResponse.models.xgboost.accuracy ?? null,
-            speed: winResponse.models.xgboost.speed ?? 'Faster'
-          }
-        : {
-            winProbability: 50,
-            lossProbability: 50,
-            teamAWin: 50,
-            teamBWin: 50,
-            confidence: 50,
-            outcome: 'Unknown',
-            model: 'XGBoost',
-            accuracy: null,
-            speed: 'Faster'
-          };
-
-      const rfWinObj = winResponse && winResponse.success && winResponse.models && winResponse.models.random_forest
-        ? {
-            winProbability: winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null,
-            lossProbability: winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null,
-            teamAWin: isBattingTeamA ? (winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null) : (winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null),
-            teamBWin: isBattingTeamA ? (winResponse.models.random_forest.loss_probability ?? winResponse.models.random_forest.lossProbability ?? null) : (winResponse.models.random_forest.win_probability ?? winResponse.models.random_forest.winProbability ?? null),
-            confidence: winResponse.models.random_forest.confidence ?? winResponse.models.random_forest.confidence_level ?? null,
-            outcome: winResponse.models.random_forest.predicted_outcome ?? winResponse.models.random_forest.outcome ?? null,
-            model: winResponse.models.random_forest.model ?? 'Random Forest',
-            accuracy: winResponse.models.random_forest.accuracy ?? null,
-            speed: winResponse.models.random_forest.speed ?? 'Moderate'
-          }
-        : {
-            winProbability: 50,
-            lossProbability: 50,
-            teamAWin: 50,
-            teamBWin: 50,
-            confidence: 50,
-            outcome: 'Unknown',
-            model: 'Random Forest',
-            accuracy: null,
-            speed: 'Moderate'
-          };
-
-      // Predicted score parsing based on confirmed API response structure you provided
-      let predictedScore = null;
-      let scoreModels = null;
-      if (scoreResponse && scoreResponse.success) {
-        // Your API returns: average_prediction, models.xgboost.predicted_score, models.random_forest.predicted_score
-        const avg = scoreResponse.average_prediction ?? null;
-        const xgbScore = scoreResponse.models?.xgboost?.predicted_score ?? scoreResponse.models?.xgboost?.predictedScore ?? null;
-        const rfScore = scoreResponse.models?.random_forest?.predicted_score ?? scoreResponse.models?.random_forest?.predictedScore ?? null;
-
-        predictedScore = avg;
-        scoreModels = {
-          xgboost: xgbScore,
-          randomForest: rfScore,
-          average: avg
-        };
-      }
-
-      // Build dual prediction object
-      const dualPrediction = {
-        xgboost: {
-          winProbability: xgboostWinObj.winProbability,
-          lossProbability: xgboostWinObj.lossProbability,
-          teamAWin: xgboostWinObj.teamAWin,
-          teamBWin: xgboostWinObj.teamBWin,
-          confidence: xgboostWinObj.confidence,
-          outcome: xgboostWinObj.outcome,
-          model: xgboostWinObj.model,
-          accuracy: xgboostWinObj.accuracy,
-          speed: xgboostWinObj.speed
-        },
-        randomForest: {
-          winProbability: rfWinObj.winProbability,
-          lossProbability: rfWinObj.lossProbability,
-          teamAWin: rfWinObj.teamAWin,
-          teamBWin: rfWinObj.teamBWin,
-          confidence: rfWinObj.confidence,
-          outcome: rfWinObj.outcome,
-          model: rfWinObj.model,
-          accuracy: rfWinObj.accuracy,
-          speed: rfWinObj.speed
-        },
-        matchContext: {
-          score: currentScore,
-          wickets: currentWickets,
-          overs: currentOvers,
-          innings: inningsNumber,
-          battingTeam: isBattingTeamA ? matchData.teamA?.teamName : matchData.teamB?.teamName,
-          teamA: matchData.teamA?.teamName,
-          teamB: matchData.teamB?.teamName
-        },
-        predictedScore: predictedScore, // average predicted score (or null)
-        scoreModels: scoreModels, // breakdown object or null
-        rawWinResponse: winResponse,
-        rawScoreResponse: scoreResponse
-      };
-      
+      const dualPrediction = buildDualPrediction(allResponse, matchData);
       console.log('✅ Dual Prediction Ready:', dualPrediction);
       setPrediction(dualPrediction);
       